@@ -5,6 +5,7 @@ from agent_server.agent.ChatAgent import ChatAgent
 from agent_server.agent.ReasoningAgent import ReasoningAgent
 from agent_server.assistant import Assistant
 from agent_server.integrations.ChatHandler import ChatSession
+from agent_server.integrations.Tracer import get_tracer, text_size
 
 logger = logging.getLogger(__name__)
 
@@ -13,29 +14,37 @@ class AssistantOrchestrator(Assistant):
         logger.info("Initializing AssistantOrchestrator...")
         self.reasoning_agent = reasoning_agent
         self.chat_agent = chat_agent
+        self.tracer = get_tracer()
 
     def message_assistant(self, chat_session:ChatSession, user_message: str):
         if not user_message:
             return
 
-        try:
-            # Store the user message in the chat history
-            chat_session.store_human_context(user_message)
-            context = chat_session.get_current_chat()
-
-            task_json = self.chat_agent.process_user_message(context, chat_session)
-            print(task_json)
-            if task_json == None:
-                return
-
-            message_id = str(uuid.uuid4())
-            reasoning_result = self.reasoning_agent.process_request(task_json)
-
-            # Generate the final response to the user, filtered through the PersonalityAgent
-            response_id = str(uuid.uuid4())
-            logger.debug(f"Generated response ID for final response: {response_id}")
-            self.chat_agent.generate_final_response(
-                reasoning_result, chat_session)
-
-        except Exception as e:
-            logger.exception(f"Error processing user message {e}")
+        with self.tracer.span("assistant.turn", session_id=chat_session.session_id, **text_size("user_message", user_message)) as turn:
+            try:
+                # Store the user message in the chat history
+                chat_session.store_human_context(user_message)
+                context = chat_session.get_current_chat()
+
+                with self.tracer.span("chat_agent.process_user_message"):
+                    task_json = self.chat_agent.process_user_message(context, chat_session)
+                print(task_json)
+                turn.set_attribute("task", task_json is not None)
+                if task_json == None:
+                    return
+
+                message_id = str(uuid.uuid4())
+                with self.tracer.span("react.process_request", **text_size("task", task_json)) as react:
+                    reasoning_result = self.reasoning_agent.process_request(task_json)
+                    react.set_attributes(text_size("result", reasoning_result))
+
+                # Generate the final response to the user, filtered through the PersonalityAgent
+                response_id = str(uuid.uuid4())
+                logger.debug(f"Generated response ID for final response: {response_id}")
+                with self.tracer.span("chat_agent.generate_final_response"):
+                    self.chat_agent.generate_final_response(
+                        reasoning_result, chat_session)
+
+            except Exception as e:
+                turn.set_attribute("error", f"{type(e).__name__}: {e}")
+                logger.exception(f"Error processing user message {e}")
\ No newline at end of file
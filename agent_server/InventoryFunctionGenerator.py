@@ -1,13 +1,21 @@
 import json
 
+from agent_server.agent.ParameterExtractor import get_parameter_extractor
 from agent_server.llms.LLMInterface import LLMInterface
 
 
 class InventoryFunctionGenerator:
-    def __init__(self, text_generator: LLMInterface):
+    def __init__(self, text_generator: LLMInterface, parameter_extractor=None):
         self.text_generator = text_generator
+        self.parameter_extractor = parameter_extractor if parameter_extractor is not None \
+            else get_parameter_extractor()
 
     def generate_function_call(self, prompt: str) -> dict:
+        # Requests shaped like a registered example don't need the LLM
+        action, parameters, _ = self.parameter_extractor.match(prompt)
+        if action is not None:
+            return {"action": action, "parameters": parameters}
+
         system_message = (
             "You are chatGPT-4, a well-trained LLM used to assist humans. You must respond only with a valid JSON "
             "object representing a function call. Do not include any other text or explanation in your response."
@@ -8,8 +8,6 @@ from agent_server.llms.LLMFactory import LLMFactory, ModelType
 from agent_server.llms.LLMInterface import LLMInterface
 
 logger = logging.getLogger(__name__)
-# HEMMINGWAY BRIDGE
-# Looks like it's not generating a task request correctly anymore, check it
 
 class ChatAgent():
     def __init__(self):
@@ -59,16 +57,20 @@ class ChatAgent():
 
     def handle_conversation_tag(self, response_generator, chat_session: ChatSession):
         """
-        Handles streaming of the `[conversation]` tag, passing content to the ChatSession.
+        Handles streaming of the `[conversation]` tag, passing content to the ChatSession. The rest of the
+        response (e.g. a `[task_summary]` after the conversation) is still read and returned.
         """
         temp_buffer = ""
         in_conversation = False
+        conversation_done = False
         message_id = str(uuid.uuid4())
         whole_message = ""
 
         for chunk in response_generator:
-            temp_buffer += chunk
             whole_message += chunk
+            if conversation_done:
+                continue
+            temp_buffer += chunk
 
             # Check if the start tag `[conversation]` is present
             if not in_conversation and '[conversation]' in temp_buffer:
@@ -83,7 +85,7 @@ class ChatAgent():
                     content = content.replace('[/conversation]', '').strip()  # Ensure no extra whitespace or lingering tags
 
                     chat_session.parse_llm_stream(content + LLMInterface.END_STREAM, message_id)
-                    break  # Stop processing after the closing tag
+                    conversation_done = True  # Nothing after the closing tag is streamed
                 else:
                     # Stream intermediate content
                     chat_session.parse_llm_stream(temp_buffer, message_id)
@@ -1,12 +1,15 @@
 import json
 
 from agent_server.function.FunctionName import FunctionName
+from agent_server.llms.CachingLLM import CachingLLM, is_json
 from agent_server.llms.LLMInterface import LLMInterface
 
 
 class FunctionChooser:
     def __init__(self, llm_interface: LLMInterface):
-        self.llm_interface = llm_interface
+        # The same request always maps to the same function, so choices are served from the response cache
+        self.llm_interface = llm_interface if isinstance(llm_interface, CachingLLM) \
+            else CachingLLM(llm_interface, cache_if=is_json)
 
     def choose_function(self, user_request: str) -> str:
         """Chooses the most appropriate function based on the user's request."""
@@ -0,0 +1,110 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+
+from agent_server.function.FunctionName import FunctionName
+
+logger = logging.getLogger(__name__)
+
+_prompt_table = None
+_prompt_table_lock = threading.Lock()
+
+
+def get_function_prompt_table():
+    """
+    Process-wide prompt table, loaded on first use. With FUNCTION_PROMPTS_RELOAD_SECONDS set, a
+    background thread reloads it when a definition file changes.
+    """
+    global _prompt_table
+    with _prompt_table_lock:
+        if _prompt_table is None:
+            _prompt_table = FunctionPromptTable()
+            reload_seconds = float(os.getenv('FUNCTION_PROMPTS_RELOAD_SECONDS', '0'))
+            if reload_seconds > 0:
+                _prompt_table.watch(reload_seconds)
+        return _prompt_table
+
+
+def _load_function_definition(definition_path: str) -> str:
+    """Reads the system message content from the specified text file."""
+    try:
+        with Path(definition_path).open("r") as file:
+            return file.read()
+    except FileNotFoundError:
+        raise ValueError(f"Function definition file not found at: {definition_path}")
+
+
+def build_system_message(function_definition: str) -> str:
+    """Constructs a system message using the provided function definition."""
+    return (
+        "You are responsible for interpreting user requests and generating a JSON response based on "
+        "the provided action and parameters.\n\n" + function_definition +
+        "\nPlease generate JSON responses for queries related to retrieving container contents according to this format. "
+        "YOU WILL RESPOND WITH ONLY JSON AND NOTHING MORE."
+    )
+
+
+class FunctionPromptTable:
+    """
+    The JsonFunctionCreator system message for every FunctionName, built once from the definition
+    files. Lookups are a dict access; the filesystem is only read when loading or reloading.
+    """
+
+    def __init__(self):
+        self._table = MappingProxyType({})
+        self._mtimes = {}
+        self._stop = threading.Event()
+        self.reload()
+
+    def system_message(self, function_name: str) -> str:
+        """The system message for a function name; raises ValueError if its definition file is missing."""
+        entry = self._table[function_name]
+        if isinstance(entry, ValueError):
+            raise entry
+        return entry
+
+    def __contains__(self, function_name) -> bool:
+        return function_name in self._table
+
+    def reload(self) -> bool:
+        """Rebuild the table if any definition file changed since the last load; returns whether it did."""
+        mtimes = {function.function_name: self._mtime(function.definition_path) for function in FunctionName}
+        if mtimes == self._mtimes:
+            return False
+
+        table = {}
+        for function in FunctionName:
+            try:
+                table[function.function_name] = build_system_message(
+                    _load_function_definition(function.definition_path))
+            except ValueError as e:
+                # Kept so the error surfaces when the function is actually used, as it always has
+                table[function.function_name] = e
+        # Swapped in whole, so readers see either the old table or the new one
+        self._table = MappingProxyType(table)
+        self._mtimes = mtimes
+        logger.info(f"Loaded {len(table)} function definition prompts")
+        return True
+
+    def watch(self, interval_seconds: float):
+        """Reload in a background thread whenever a definition file's mtime changes."""
+        def poll():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.reload()
+                except OSError:
+                    logger.exception("Failed to reload function definition prompts")
+
+        threading.Thread(target=poll, name="function-prompt-reload", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
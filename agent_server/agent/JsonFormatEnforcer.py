@@ -1,4 +1,6 @@
 import json
+
+from agent_server.agent.JsonRepair import JsonRepairError, parse_json
 from agent_server.llms.LLMInterface import LLMInterface
 
 
@@ -23,18 +25,12 @@ class JsonFormatEnforcer:
         # Call the LLM and generate the JSON response
         response_json = self.llm_interface.generate_response(user_request, system_message)
 
-        # Parse and return the JSON response
+        # Return the JSON text, repairing it locally if possible and with format_json if not
         try:
-            json.loads(response_json)
-            return response_json
-        except json.JSONDecodeError:
-            # If JSON parsing fails, attempt to correct the JSON using the format_json method
-            corrected_json = self.format_json(response_json)
-            try:
-                return corrected_json
-            except json.JSONDecodeError as e:
-                # If parsing still fails, raise an exception with details
-                raise ValueError(f"Failed to parse JSON after correction: {e}")
+            return json.dumps(parse_json(response_json, "json_format_enforcer", llm_repair=self.format_json))
+        except JsonRepairError as e:
+            # If parsing still fails, raise an exception with details
+            raise ValueError(f"Failed to parse JSON after correction: {e}")
 
     def format_json(self, invalid_json: str) -> str:
         """Attempts to correct invalid JSON using the LLM."""
@@ -1,33 +1,17 @@
-import json
-from pathlib import Path
-
+from agent_server.agent.FunctionPromptTable import get_function_prompt_table
+from agent_server.agent.JsonRepair import JsonRepairError, parse_json
+from agent_server.agent.ParameterExtractor import get_parameter_extractor
 from agent_server.agent.UnknownFunctionError import UnknownFunctionError
 from agent_server.function.FunctionName import FunctionName
 from agent_server.llms.LLMInterface import LLMInterface
 
 
-def _load_function_definition(definition_path: str) -> str:
-    """Reads the system message content from the specified text file."""
-    try:
-        with Path(definition_path).open("r") as file:
-            return file.read()
-    except FileNotFoundError:
-        raise ValueError(f"Function definition file not found at: {definition_path}")
-
-
-def build_system_message(function_definition: str) -> str:
-    """Constructs a system message using the provided function definition."""
-    return (
-        "You are responsible for interpreting user requests and generating a JSON response based on "
-        "the provided action and parameters.\n\n" + function_definition +
-        "\nPlease generate JSON responses for queries related to retrieving container contents according to this format. "
-        "YOU WILL RESPOND WITH ONLY JSON AND NOTHING MORE."
-    )
-
-
 class JsonFunctionCreator:
-    def __init__(self, llm_interface: LLMInterface):
+    def __init__(self, llm_interface: LLMInterface, prompt_table=None, parameter_extractor=None):
         self.llm_interface = llm_interface
+        self.prompt_table = prompt_table if prompt_table is not None else get_function_prompt_table()
+        self.parameter_extractor = parameter_extractor if parameter_extractor is not None \
+            else get_parameter_extractor()
 
     def create_json(self, function_name: str, user_request: str) -> dict:
         """Generates JSON for a specified function based on a user request."""
@@ -35,25 +19,23 @@ class JsonFunctionCreator:
         if not FunctionName.has_value(function_name):
             raise UnknownFunctionError(f"Unknown function name: {function_name}")
 
-        # Retrieve the corresponding FunctionName Enum and load the system message
-        function_enum = FunctionName[function_name.upper()]
-        function_definition = _load_function_definition(function_enum.definition_path)
-        system_message = build_system_message(function_definition)
+        # Requests shaped like one of the function's examples don't need the LLM
+        parameters, _ = self.parameter_extractor.extract(function_name, user_request)
+        if parameters is not None:
+            return {"action": function_name, "parameters": parameters}
+
+        # Look up the prebuilt system message for the function
+        system_message = self.prompt_table.system_message(function_name)
 
         # Call the LLM and generate the JSON response
         response_json = self.llm_interface.generate_response(user_request, system_message)
 
-        # Parse and return the JSON response
+        # Parse and return the JSON response, repairing it locally if possible and with format_json if not
         try:
-            return json.loads(response_json)
-        except json.JSONDecodeError:
-            # If JSON parsing fails, attempt to correct the JSON using the format_json method
-            corrected_json = self.format_json(response_json)
-            try:
-                return json.loads(corrected_json)
-            except json.JSONDecodeError as e:
-                # If parsing still fails, raise an exception with details
-                raise ValueError(f"Failed to parse JSON after correction: {e}")
+            return parse_json(response_json, "json_function_creator", llm_repair=self.format_json)
+        except JsonRepairError as e:
+            # If parsing still fails, raise an exception with details
+            raise ValueError(f"Failed to parse JSON after correction: {e}")
 
     def format_json(self, invalid_json: str) -> str:
         """Attempts to correct invalid JSON using the LLM."""
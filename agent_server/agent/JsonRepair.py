@@ -0,0 +1,179 @@
+import json
+import re
+
+from agent_server.integrations.Metrics import get_metrics
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class JsonRepairError(ValueError):
+    """Raised when text can't be turned into JSON locally (or by the LLM fallback)."""
+    pass
+
+
+def _parse_counter():
+    return get_metrics().counter("json_parse_total", "LLM JSON outputs parsed, by caller and the strategy that worked",
+                                 ("source", "strategy"))
+
+
+def parse_json(text: str, source: str, llm_repair=None):
+    """
+    Parse JSON from LLM output, trying the local repairs in repair_json first. `llm_repair`, a callable
+    returning corrected text, is only called when none of them work. The winning strategy is counted
+    per source in json_parse_total.
+    """
+    try:
+        value, strategy = repair_json(text)
+    except JsonRepairError:
+        if llm_repair is None:
+            _parse_counter().inc(source=source, strategy="failed")
+            raise
+        try:
+            value, _ = repair_json(llm_repair(text))
+            strategy = "llm"
+        except JsonRepairError:
+            _parse_counter().inc(source=source, strategy="failed")
+            raise
+    _parse_counter().inc(source=source, strategy=strategy)
+    return value
+
+
+def repair_json(text: str):
+    """
+    Returns (value, strategy) for the first of these that parses:
+    strict      - the text as is
+    fenced      - the body of a ```json fenced block
+    extracted   - the first balanced {...} or [...], ignoring prose around it
+    cleaned     - that fragment with single quotes, Python literals and trailing commas fixed
+    closed      - as cleaned, with a truncated string, object or array closed off
+    """
+    if not isinstance(text, str):
+        raise JsonRepairError(f"Expected text, got {type(text).__name__}")
+    try:
+        return json.loads(text), "strict"
+    except json.JSONDecodeError:
+        pass
+
+    fence = _FENCE.search(text)
+    if fence:
+        text = fence.group(1)
+        try:
+            return json.loads(text), "fenced"
+        except json.JSONDecodeError:
+            pass
+
+    fragment, balanced = _extract_fragment(text)
+    if fragment is None:
+        raise JsonRepairError("No JSON object or array in text")
+    if balanced:
+        try:
+            return json.loads(fragment), "extracted"
+        except json.JSONDecodeError:
+            pass
+
+    normalized, closed = _normalize(fragment)
+    try:
+        return json.loads(normalized), "closed" if closed else "cleaned"
+    except json.JSONDecodeError as e:
+        raise JsonRepairError(f"Could not repair JSON: {e}")
+
+
+def _extract_fragment(text: str):
+    """The first {...} or [...] in text and whether it was closed; unclosed fragments run to the end."""
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        return None, False
+    start = min(starts)
+    depth = 0
+    quote = None
+    index = start
+    while index < len(text):
+        char = text[index]
+        if quote:
+            if char == "\\":
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1], True
+        index += 1
+    return text[start:], False
+
+
+def _drop_trailing(out: list, chars: str):
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] in chars:
+        del out[index]
+        return True
+    return False
+
+
+def _normalize(fragment: str):
+    """
+    One pass over a JSON-like fragment: single-quoted strings become double-quoted, Python literals
+    become JSON ones, trailing commas are dropped and anything still open at the end is closed.
+    Returns (text, whether anything had to be closed).
+    """
+    out = []
+    closers = []
+    quote = None
+    index = 0
+    while index < len(fragment):
+        char = fragment[index]
+        if quote:
+            if char == "\\" and index + 1 < len(fragment):
+                escaped = fragment[index + 1]
+                out.append("'" if escaped == "'" else char + escaped)
+                index += 2
+                continue
+            if char == quote:
+                out.append('"')
+                quote = None
+            elif char == '"':
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+        elif char in "\"'":
+            quote = char
+            out.append('"')
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing(out, ",")
+            if closers and closers[-1] == char:
+                closers.pop()
+            out.append(char)
+        elif char.isalpha():
+            end = index
+            while end < len(fragment) and (fragment[end].isalnum() or fragment[end] == "_"):
+                end += 1
+            word = fragment[index:end]
+            out.append(_PYTHON_LITERALS.get(word, word))
+            index = end
+            continue
+        else:
+            out.append(char)
+        index += 1
+
+    closed = bool(quote or closers)
+    if quote:
+        out.append('"')
+    if closers:
+        # Cut off mid-value: drop a dangling separator, or give a dangling key a null value
+        _drop_trailing(out, ",")
+        if _drop_trailing(out, ":"):
+            out.append(":null")
+        out.extend(reversed(closers))
+    return "".join(out), closed
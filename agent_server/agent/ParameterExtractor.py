@@ -0,0 +1,194 @@
+import os
+import re
+import threading
+
+from agent_server.function.functionRegistry import function_registry
+
+ARTICLES = ("a", "an", "the", "my", "some", "your")
+# Free-text slot values longer than this are more likely a misparse than an item name
+MAX_SLOT_WORDS = 4
+
+_OPTIONAL_ARTICLE = r"(?:(?:" + "|".join(ARTICLES) + r")\W+)?"
+_LIST_SEPARATOR = re.compile(r"\s*,\s*(?:and\s+)?|\s+and\s+")
+_LEADING_ARTICLE = re.compile(r"^(?:" + "|".join(ARTICLES) + r")\s+", re.IGNORECASE)
+
+_parameter_extractor = None
+_parameter_extractor_lock = threading.Lock()
+
+
+def get_parameter_extractor():
+    """Process-wide extractor over the registered functions' examples."""
+    global _parameter_extractor
+    with _parameter_extractor_lock:
+        if _parameter_extractor is None:
+            _parameter_extractor = ParameterExtractor(
+                min_confidence=float(os.getenv('PARAMETER_EXTRACTOR_MIN_CONFIDENCE', '0.8')))
+        return _parameter_extractor
+
+
+def _normalize(text: str) -> str:
+    return text.replace("’", "'").strip()
+
+
+def _literal_pattern(text: str) -> list:
+    """Regex pieces for the words of a literal stretch of an example; articles become optional."""
+    pieces = []
+    for word in re.findall(r"[\w']+", text):
+        pieces.append(_OPTIONAL_ARTICLE if word.lower() in ARTICLES else re.escape(word) + r"\W+")
+    return pieces
+
+
+def _find(query: str, value: str, start: int):
+    match = re.search(r"\b" + re.escape(value) + r"\b", query[start:], re.IGNORECASE)
+    return (start + match.start(), start + match.end()) if match else None
+
+
+class ExampleTemplate:
+    """A regex made from one registered example: its parameter values become capture slots."""
+
+    def __init__(self, function_name: str, pattern, slots: dict):
+        self.function_name = function_name
+        self.pattern = pattern
+        self.slots = slots  # group name -> (parameter name, is list)
+
+    @classmethod
+    def from_example(cls, function_name: str, example: dict):
+        """The template for an example, or None if its parameter values don't all appear in its query."""
+        query = _normalize(example.get('query', ''))
+        parameters = example.get('response', {}).get('parameters', {})
+
+        spans = []
+        for name, value in parameters.items():
+            items = value if isinstance(value, list) else [value]
+            if not items or not all(isinstance(item, str) and item for item in items):
+                return None
+            found, position = [], 0
+            for item in items:
+                span = _find(query, item, position)
+                if span is None:
+                    return None
+                found.append(span)
+                position = span[1]
+            spans.append((found[0][0], found[-1][1], name, isinstance(value, list), items))
+        spans.sort()
+        if any(current[0] < previous[1] for previous, current in zip(spans, spans[1:])):
+            return None
+
+        pieces, slots, position = [r"^\W*"], {}, 0
+        for index, (start, end, name, is_list, items) in enumerate(spans):
+            pieces += _literal_pattern(query[position:start])
+            group = f"slot{index}"
+            numeric = not is_list and items[0].isdigit()
+            pieces.append(f"(?P<{group}>\\d+)" if numeric else f"(?P<{group}>.+?)")
+            pieces.append(r"\W+" if index < len(spans) - 1 or query[end:].strip(" ?.!") else "")
+            slots[group] = (name, is_list)
+            position = end
+        tail = _literal_pattern(query[position:])
+        if tail and tail[-1].endswith(r"\W+"):
+            tail[-1] = tail[-1][:-len(r"\W+")]
+        pieces += tail + [r"\W*$"]
+        return cls(function_name, re.compile("".join(pieces), re.IGNORECASE), slots)
+
+    def match(self, query: str):
+        """(parameters, confidence) if the query fits this template, else None."""
+        match = self.pattern.match(query)
+        if match is None:
+            return None
+
+        parameters, confidence = {}, 1.0
+        for group, (name, is_list) in self.slots.items():
+            raw = match.group(group).strip()
+            if raw.isdigit():
+                parameters[name] = [raw] if is_list else raw
+                continue
+            items = [_LEADING_ARTICLE.sub("", item).strip() for item in _LIST_SEPARATOR.split(raw)] if is_list \
+                else [_LEADING_ARTICLE.sub("", raw).strip()]
+            if not all(items):
+                return None
+            confidence *= 0.95  # free text is never quite as certain as a number
+            if any(len(item.split()) > MAX_SLOT_WORDS for item in items):
+                confidence *= 0.5
+            if not is_list and re.search(r",|\band\b|\bor\b", items[0]):
+                confidence *= 0.5  # probably several values squeezed into one slot
+            parameters[name] = items if is_list else items[0]
+        return parameters, confidence
+
+
+class ParameterExtractor:
+    """
+    Fills a function call's parameters straight from the request when it closely follows one of the
+    examples registered with @register_function, so simple tool calls skip the LLM round trip.
+
+    Confidence is 1.0 for a request that fits an example exactly with only numeric values, and lower
+    for free-text values or ones that look like several values in one; below `min_confidence` the
+    caller should fall back to the LLM. Tools that aren't read-only change the inventory, so they are
+    only filled in locally at full confidence.
+    """
+
+    def __init__(self, min_confidence=0.8, registry=None):
+        self.min_confidence = min_confidence
+        self.registry = registry if registry is not None else function_registry
+        self._templates = {}
+        self._hits = {}
+        self._misses = {}
+        self._lock = threading.Lock()
+
+    def extract(self, function_name: str, request: str):
+        """(parameters, confidence) for a call to this function; parameters is None below min_confidence."""
+        parameters, confidence = self._best_match(function_name, _normalize(request))
+        hit = parameters is not None and confidence >= self._required_confidence(function_name)
+        self._count(function_name, hit)
+        return (parameters, confidence) if hit else (None, confidence)
+
+    def match(self, request: str):
+        """(function_name, parameters, confidence) for the best fitting function across the registry."""
+        request = _normalize(request)
+        candidates = sorted(((*self._best_match(name, request), name) for name in list(self.registry)),
+                            key=lambda candidate: candidate[1], reverse=True)
+        parameters, confidence, function_name = candidates[0] if candidates else (None, 0.0, None)
+        if len(candidates) > 1 and candidates[1][1] == confidence and confidence > 0:
+            confidence *= 0.5  # two functions fit equally well
+        hit = parameters is not None and confidence >= self._required_confidence(function_name)
+        self._count(function_name if hit else None, hit)
+        return (function_name, parameters, confidence) if hit else (None, None, confidence)
+
+    def stats(self):
+        with self._lock:
+            hits, misses = sum(self._hits.values()), sum(self._misses.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "functions": {name: {"hits": self._hits.get(name, 0), "misses": self._misses.get(name, 0)}
+                              for name in set(self._hits) | set(self._misses)},
+            }
+
+    def _required_confidence(self, function_name):
+        # A misread write (e.g. deleting "everything" as an item) costs more than an LLM round trip
+        dispatcher = self.registry.get(function_name, {}).get('dispatcher')
+        return self.min_confidence if dispatcher is not None and dispatcher.read_only else 1.0
+
+    def _best_match(self, function_name, request):
+        best = (None, 0.0)
+        for template in self._templates_for(function_name):
+            result = template.match(request)
+            if result is not None and result[1] > best[1]:
+                best = result
+        return best
+
+    def _templates_for(self, function_name):
+        # Built on first use, since functions register themselves when their module is imported
+        with self._lock:
+            templates = self._templates.get(function_name)
+            if templates is None:
+                examples = self.registry.get(function_name, {}).get('examples', [])
+                templates = [template for template in (ExampleTemplate.from_example(function_name, example)
+                                                       for example in examples) if template is not None]
+                self._templates[function_name] = templates
+            return templates
+
+    def _count(self, function_name, hit):
+        key = function_name or "unmatched"
+        with self._lock:
+            counts = self._hits if hit else self._misses
+            counts[key] = counts.get(key, 0) + 1
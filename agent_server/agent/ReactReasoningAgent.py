@@ -1,4 +1,7 @@
+import contextvars
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
 
@@ -7,8 +10,12 @@ from agent_server.agent.UnknownFunctionError import UnknownFunctionError
 from agent_server.function import functions
 from agent_server.function.FunctionMapper import FunctionMapper
 from agent_server.agent.JsonFormatEnforcer import JsonFormatEnforcer
+from agent_server.agent.JsonRepair import parse_json
 from agent_server.agent.JsonFunctionCreator import JsonFunctionCreator
 from agent_server.function.function_definitions import generate_json_definitions
+from agent_server.integrations.Metrics import get_metrics
+from agent_server.integrations.Tracer import get_tracer, text_size
+from agent_server.llms.CachingLLM import CachingLLM, is_json
 from agent_server.llms.LLMFactory import LLMFactory, ModelType
 
 class ReactException(Exception):
@@ -18,13 +25,14 @@ class ReactException(Exception):
 
 class ReActReasoningAgent(ReasoningAgent):
     def __init__(self):
-        self.json_function_creator = JsonFunctionCreator(LLMFactory.get_singleton(ModelType.FIREWORKS_LLAMA_3_1_8B))
+        self.json_function_creator = JsonFunctionCreator(
+            CachingLLM(LLMFactory.get_singleton(ModelType.FIREWORKS_LLAMA_3_1_8B), cache_if=is_json))
 
         # Resolve paths to prompt files
         script_dir = Path(__file__).resolve().parent
-        general_prompt_path = (script_dir / '../prompt/ReActGeneralPrompt.txt').resolve()
-        planning_prompt_path = (script_dir / '../prompt/ReActPlanningPrompt.txt').resolve()
-        observation_prompt_path = (script_dir / '../prompt/ReActObservationPrompt.txt').resolve()
+        general_prompt_path = (script_dir / '../prompt/reActGeneralPrompt.txt').resolve()
+        planning_prompt_path = (script_dir / '../prompt/reActPlanningPrompt.txt').resolve()
+        observation_prompt_path = (script_dir / '../prompt/reActObservationPrompt.txt').resolve()
 
         # Load the general system prompt
         self.general_prompt = self._load_prompt_from_file(general_prompt_path)
@@ -32,7 +40,8 @@ class ReActReasoningAgent(ReasoningAgent):
         # Load the step-specific prompts
         self.planning_prompt = self._load_prompt_from_file(planning_prompt_path)
         self.observation_prompt = self._load_prompt_from_file(observation_prompt_path)
-        self.json_format_enforcer = JsonFormatEnforcer(LLMFactory.get_singleton(ModelType.FIREWORKS_LLAMA_3_2_11B))
+        self.json_format_enforcer = JsonFormatEnforcer(
+            CachingLLM(LLMFactory.get_singleton(ModelType.FIREWORKS_LLAMA_3_2_11B), cache_if=is_json))
 
         # Load available actions
         self.available_actions = self._generate_available_actions()
@@ -42,47 +51,12 @@ class ReActReasoningAgent(ReasoningAgent):
 
         self.plan_llm = LLMFactory.get_singleton(ModelType.FIREWORKS_LLAMA_3_1_405B)
         self.observation_llm = LLMFactory.get_singleton(ModelType.FIREWORKS_LLAMA_3_1_405B)
+        self.tracer = get_tracer()
+        self.retries = get_metrics().counter("react_retries_total", "ReAct steps retried after a ReactException")
 
-    def process_request(self, user_input: str) -> str:
-        max_retries = 5
-        retry_count = 0
-
-        # Initialize the chain of reasoning with the system prompt and user input
-        chain_of_reasoning = [
-            {'step': 'system', 'content': self.general_prompt},
-            {'step': 'user_request', 'content': user_input}
-        ]
-
-        while True:
-            try:
-                # Step 1: Generate the assistant's reasoning (thought process)
-                assistant_thought = self._generate_thought(chain_of_reasoning)
-                print(assistant_thought)
-                chain_of_reasoning.append({'step': 'assistant_plan', 'content': assistant_thought})
-
-                # Step 2: Extract and perform action, if necessary
-                action, params = self._extract_action(assistant_thought)
-                if action.lower() != 'no_action':
-                    action_result = self._perform_action(action, params)
-                    chain_of_reasoning.append({'step': 'action_result', 'content': action_result})
-
-                # Step 3: Generate observation based on updated reasoning
-                observation = self._generate_observation(chain_of_reasoning, user_input)
-                print(observation)
-                chain_of_reasoning.append({'step': 'assistant_observation', 'content': observation})
-
-                # Step 4: Check if the observation contains a final answer
-                if observation.get("is_answered"):
-                    print(self._format_chain_of_reasoning(chain_of_reasoning));
-                    return observation.get("answer")
-
-            except ReactException as e:
-                chain_of_reasoning.append({'step': 'error', 'content': str(e)})
-                retry_count += 1
-                if retry_count >= max_retries:
-                    return "An error occurred: Maximum retries exceeded. Exiting."
-                else:
-                    continue
+        # Independent actions from one planning step run side by side, up to this many at once
+        self.action_executor = ThreadPoolExecutor(max_workers=int(os.getenv('REACT_MAX_PARALLEL_ACTIONS', '4')),
+                                                  thread_name_prefix='react-action')
 
     def _format_chain_of_reasoning(self, chain: list) -> str:
         """Formats the chain of reasoning for LLM inputs."""
@@ -103,7 +77,9 @@ class ReActReasoningAgent(ReasoningAgent):
         input_prompt = f"TASK----{task_request}---\n{formatted_chain}"
 
         # Generate the assistant's thought
-        assistant_thought = self.plan_llm.generate_response(input_prompt, system_message)
+        with self.tracer.span("react.generate_thought", **text_size("prompt", system_message + input_prompt)) as span:
+            assistant_thought = self.plan_llm.generate_response(input_prompt, system_message)
+            span.set_attributes(text_size("response", assistant_thought))
         return assistant_thought
 
     def _generate_observation(self, task_request: str, chain_of_reasoning: list) -> dict:
@@ -115,14 +91,17 @@ class ReActReasoningAgent(ReasoningAgent):
         input_prompt = f"TASK---{task_request}---\n{formatted_chain}"
 
         # Generate observation response and parse it
-        observation_response = self.observation_llm.generate_response(input_prompt, system_message)
         expected_format = '''
         {
           "is_answered": true or false,
           "answer": "optional answer if is_answered is true"
         }
         '''
-        observation_data = self._validate_and_parse_json(observation_response, expected_format)
+        with self.tracer.span("react.generate_observation", **text_size("prompt", system_message + input_prompt)) as span:
+            observation_response = self.observation_llm.generate_response(input_prompt, system_message)
+            span.set_attributes(text_size("response", observation_response))
+            observation_data = self._validate_and_parse_json(observation_response, expected_format)
+            span.set_attribute("is_answered", bool(observation_data.get("is_answered")))
         return observation_data
 
     def _generate_available_actions(self) -> str:
@@ -167,18 +146,17 @@ class ReActReasoningAgent(ReasoningAgent):
 
     def _validate_and_parse_json(self, json_string: str, expected_format: str = None) -> dict:
         """
-        Validates and parses a JSON string. If invalid, attempts to enforce the expected format.
+        Validates and parses a JSON string. If invalid, repairs it locally or, failing that, attempts to
+        enforce the expected format.
         """
+        def enforce_format(text):
+            with self.tracer.span("react.enforce_json_format", **text_size("input", text)):
+                return self.json_format_enforcer.create_json(expected_format, text)
+
         try:
-            return json.loads(json_string)
-        except json.JSONDecodeError:
-            if expected_format:
-                try:
-                    return json.loads(self.json_format_enforcer.create_json(expected_format, json_string))
-                except json.JSONDecodeError:
-                    raise ReactException("Error enforcing JSON format.")
-            else:
-                raise ReactException("Invalid JSON format.")
+            return parse_json(json_string, "react", llm_repair=enforce_format if expected_format else None)
+        except ValueError:  # JsonRepairError, or the enforcer giving up
+            raise ReactException("Error enforcing JSON format." if expected_format else "Invalid JSON format.")
 
     def _format_conversation(self, conversation: list) -> str:
         formatted_conversation = ""
@@ -204,41 +182,88 @@ class ReActReasoningAgent(ReasoningAgent):
             return False
 
     def _extract_action(self, assistant_response: str) -> tuple:
-        try:
-            # Attempt to extract JSON from a code block if present
-            code_block_pattern = r"```json\s*(\{.*?\})\s*```"
-            match = re.search(code_block_pattern, assistant_response, re.DOTALL)
-            action_json = match.group(1) if match else assistant_response.strip()
+        actions = self._extract_actions(assistant_response)
+        return (actions[0][0], actions[0][2]) if actions else ("no_action", None)
 
-            # Validate and parse JSON content, enforce format if needed
-            expected_format = '''
-            {
-              "action": "<action_name>",
-              "action_prompt": "<natural_language_description>"
-            }'''
-            action_data = self._validate_and_parse_json(action_json, expected_format)
-
-            action_name = action_data.get("action")
-            action_prompt = action_data.get("action_prompt", "")
-
-            if action_name.lower() == "no_action":
-                params = None
-            else:
-                try:
-                    params = self.json_function_creator.create_json(action_name, action_prompt)
-                except UnknownFunctionError as e:
-                    raise ReactException("Unknown function:" + action_name)
-
-            return action_name, params
-        except ReactException as e:
-            raise ReactException(f"Error in _extract_action: {e}")
+    def _extract_actions(self, assistant_response: str) -> list:
+        """
+        Parse a plan holding one action or a list of independent actions into
+        [(action_name, action_prompt, params)]. no_action entries are dropped, so an empty list means
+        nothing needs to be done.
+        """
+        with self.tracer.span("react.extract_action", **text_size("input", assistant_response)) as span:
+            try:
+                # Attempt to extract JSON from a code block if present
+                code_block_pattern = r"```json\s*([\[{].*?[\]}])\s*```"
+                match = re.search(code_block_pattern, assistant_response, re.DOTALL)
+                action_json = match.group(1) if match else assistant_response.strip()
+
+                # Validate and parse JSON content, enforce format if needed, keeping every action of a
+                # multi-action plan
+                if action_json.startswith('[') or '"actions"' in action_json:
+                    expected_format = '''
+                [
+                  {
+                    "action": "<action_name>",
+                    "action_prompt": "<natural_language_description>"
+                  }
+                ]'''
+                else:
+                    expected_format = '''
+                {
+                  "action": "<action_name>",
+                  "action_prompt": "<natural_language_description>"
+                }'''
+                action_data = self._validate_and_parse_json(action_json, expected_format)
+                if isinstance(action_data, dict):
+                    action_data = action_data.get("actions", [action_data])
+                if not isinstance(action_data, list):
+                    raise ReactException("Plan is neither an action nor a list of actions")
+
+                planned = [(entry.get("action"), entry.get("action_prompt", ""))
+                           for entry in action_data if isinstance(entry, dict)]
+                if not planned or any(not isinstance(action_name, str) for action_name, _ in planned):
+                    raise ReactException("Plan does not name an action")
+                planned = [(action_name, action_prompt) for action_name, action_prompt in planned
+                           if action_name.lower() != "no_action"]
+
+                params = self._run_concurrently(self._create_action_params, planned)
+                span.set_attribute("actions", [action_name for action_name, _ in planned])
+                return [(action_name, action_prompt, action_params)
+                        for (action_name, action_prompt), action_params in zip(planned, params)]
+            except ReactException as e:
+                raise ReactException(f"Error in _extract_action: {e}")
+
+    def _create_action_params(self, action_name: str, action_prompt: str) -> dict:
+        try:
+            return self.json_function_creator.create_json(action_name, action_prompt)
+        except UnknownFunctionError:
+            raise ReactException("Unknown function:" + action_name)
 
     def _perform_action(self, action: str, params: dict) -> str:
         # Execute the action and return the result
-        function_response = self.function_mapper.handle_function_call(params, None)
+        with self.tracer.span("react.perform_action", action=action, **text_size("params", params)) as span:
+            function_response = self.function_mapper.handle_function_call(params, None)
+            span.set_attributes(text_size("result", function_response))
 
         return function_response
 
+    def _perform_actions(self, actions: list) -> list:
+        """
+        Run independent actions concurrently; results come back in plan order, each labelled with the
+        action and prompt that produced it.
+        """
+        results = self._run_concurrently(self._perform_action, [(action, params) for action, _, params in actions])
+        return [{'action': action, 'action_prompt': action_prompt, 'result': result}
+                for (action, action_prompt, _), result in zip(actions, results)]
+
+    def _run_concurrently(self, func, calls: list) -> list:
+        """func(*args) for each args tuple on the action executor, in the caller's trace context."""
+        if len(calls) <= 1:
+            return [func(*args) for args in calls]
+        futures = [self.action_executor.submit(contextvars.copy_context().run, func, *args) for args in calls]
+        return [future.result() for future in futures]
+
     def _is_confident(self, assistant_observation: str) -> bool:
         try:
             # Parse the assistant's observation as JSON
@@ -287,10 +312,9 @@ class ReActReasoningAgent(ReasoningAgent):
                 assistant_thought = self._generate_thought(task_request, chain_of_reasoning)
                 chain_of_reasoning.append({'step': 'assistant_plan', 'content': assistant_thought})
 
-                # Step 2: Extract and perform action (if any)
-                action, params = self._extract_action(assistant_thought)
-                if action.lower() != 'no_action':
-                    action_result = self._perform_action(action, params)
+                # Step 2: Extract and perform the planned actions (if any), independent ones in parallel
+                actions = self._extract_actions(assistant_thought)
+                for action_result in self._perform_actions(actions):
                     chain_of_reasoning.append({'step': 'action_result', 'content': action_result})
 
                 # Step 3: Generate observation based on updated reasoning
@@ -303,6 +327,7 @@ class ReActReasoningAgent(ReasoningAgent):
 
             except ReactException as e:
                 chain_of_reasoning.append({'step': 'error', 'content': str(e)})
+                self.retries.inc()
                 retry_count += 1
                 if retry_count >= max_retries:
                     return "An error occurred: Maximum retries exceeded. Exiting."
@@ -0,0 +1,352 @@
+"""
+End-to-end latency benchmark for a full agent turn: /message_agent -> ChatAgent -> ReAct reasoning ->
+final response -> SSE delivery.
+
+N simulated users each open a session and its text stream, then send turns one after another. A turn's
+time-to-first-token is the first streamed message after the request; its time-to-final-token is when
+the last expected message of the turn completes (ends with the end-of-stream marker).
+
+Run against an already running server with --url, or pass --spawn to start the agent server with its
+LLMs pointed at the mock LLM server (scripted with BENCHMARK_TRANSCRIPT) and a stub inventory service.
+Results are written as JSON so runs can be compared across commits.
+"""
+import argparse
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+from flask import Flask, jsonify
+from werkzeug.serving import make_server
+
+from agent_server.llms.LLMInterface import LLMInterface
+from agent_server.llms.TranscriptReplayer import TranscriptReplayer
+from agent_server.mock_llm_server import create_app
+
+# One scripted turn: acknowledge, plan an inventory lookup, run it, observe, answer
+BENCHMARK_TRANSCRIPT = [
+    {"match": "The user just sent the following message",
+     "response": "[conversation]On it, let me check the inventory.[/conversation]"
+                 "[task_summary]Find where the screwdriver is[/task_summary]"},
+    {"match": "The ReAct module has returned",
+     "response": "[conversation]Your screwdriver is in container 5. Try to keep track of it.[/conversation]"},
+    {"match": "You are an inventory searching specialist",
+     "response": "The screwdriver is in container 5."},
+    {"match": "You are responsible for interpreting user requests",
+     "response": {"action": "find_location", "parameters": {"item_name": "screwdriver"}}},
+    {"match": "TASK----",
+     "response": {"action": "find_location", "action_prompt": "find the location of the screwdriver"}},
+    {"match": "TASK---",
+     "response": {"is_answered": True, "answer": "The screwdriver is in container 5."}},
+]
+
+SERVERS = {
+    "flask": "rest_server_agent_orchestrator.py",
+    "async": "rest_server_agent_orchestrator_async.py",
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(values):
+    if not values:
+        return None
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values),
+        "max": max(values),
+    }
+
+
+def create_stub_inventory_app():
+    app = Flask(__name__)
+    inventory = {"containers": [{"id": "5", "items": ["screwdriver", "hammer"]},
+                                {"id": "7", "items": ["tape measure"]}]}
+
+    @app.route('/inventory', methods=['GET'])
+    def get_inventory():
+        return jsonify(inventory)
+
+    @app.route('/inventory/<path:_>', methods=['GET', 'POST', 'DELETE'])
+    def inventory_detail(_):
+        return jsonify(inventory["containers"][0])
+
+    return app
+
+
+class SimulatedUser:
+    """One user with an open text stream, sending turns sequentially and timing their delivery."""
+
+    def __init__(self, base_url, username, messages_per_turn, timeout):
+        self.base_url = base_url
+        self.username = username
+        self.messages_per_turn = messages_per_turn
+        self.timeout = timeout
+        self.http = requests.Session()
+        self.events = queue.Queue()
+        self.session_id = None
+        self._stream = None
+        self._stream_opened = threading.Event()
+
+    def start(self):
+        """Open a session and its text stream; returns once the server has accepted the stream."""
+        response = self.http.post(f"{self.base_url}/start_session", json={"username": self.username})
+        response.raise_for_status()
+        self.session_id = response.json()["session_id"]
+        threading.Thread(target=self._read_stream, daemon=True).start()
+        if not self._stream_opened.wait(self.timeout) or self._stream is None:
+            raise ConnectionError("Text stream did not connect")
+
+    def _read_stream(self):
+        try:
+            # Opened here rather than in start(): the headers only arrive with the first chunk, which the
+            # servers send as soon as the stream is registered
+            self._stream = self.http.get(f"{self.base_url}/stream/{self.session_id}", stream=True,
+                                         timeout=(10, None))
+            self._stream_opened.set()
+            for line in self._stream.iter_lines(decode_unicode=True):
+                if line and line.startswith("data: "):
+                    payload = json.loads(line[len("data: "):])
+                    if "message" in payload:
+                        self.events.put((time.monotonic(), payload["message"]))
+        except (requests.RequestException, ValueError, AttributeError, OSError):
+            pass  # the server went away, or close() shut the response while it was being read
+        finally:
+            self._stream_opened.set()
+            self.events.put(None)
+
+    def run_turn(self, message):
+        """Send one message; returns (ttft_seconds, final_seconds)."""
+        # Replies still arriving from an earlier turn that timed out must not count toward this one
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:
+                raise ConnectionError("Text stream closed")
+
+        started = time.monotonic()
+        response = self.http.post(f"{self.base_url}/message_agent",
+                                  json={"session_id": self.session_id, "user_message": message})
+        response.raise_for_status()
+
+        first_token = None
+        completed = 0
+        buffered = ""
+        deadline = started + self.timeout
+        while completed < self.messages_per_turn:
+            event = self.events.get(timeout=max(deadline - time.monotonic(), 0.001))
+            if event is None:
+                raise ConnectionError("Text stream closed mid-turn")
+            received_at, text = event
+            if first_token is None and text.replace(LLMInterface.END_STREAM, "").strip():
+                first_token = received_at - started
+            buffered += text
+            if buffered.strip().endswith(LLMInterface.END_STREAM):
+                completed += 1
+                buffered = ""
+        return first_token if first_token is not None else received_at - started, received_at - started
+
+    def close(self):
+        """
+        End the session first: the server then ends the text stream, and closing it doesn't have to wait
+        for the reader's next chunk (up to a heartbeat interval).
+        """
+        if self.session_id is not None:
+            try:
+                self.http.delete(f"{self.base_url}/end_session", json={"session_id": self.session_id}, timeout=10)
+            except requests.RequestException:
+                pass
+        if self._stream is not None:
+            self._stream.close()
+        self.http.close()
+
+
+def run_benchmark(base_url, users=4, turns=5, message="Where is my screwdriver?", messages_per_turn=2,
+                  timeout=60.0):
+    ttfts, finals, errors = [], [], []
+    lock = threading.Lock()
+    # Every user connects before the clock starts, so session setup isn't counted as turn time
+    connected = threading.Barrier(users + 1)
+
+    def drive(index):
+        user = SimulatedUser(base_url, f"bench-user-{index}", messages_per_turn, timeout)
+        try:
+            try:
+                user.start()
+            finally:
+                connected.wait()
+            for _ in range(turns):
+                try:
+                    ttft, final = user.run_turn(message)
+                    with lock:
+                        ttfts.append(ttft)
+                        finals.append(final)
+                except (queue.Empty, requests.RequestException, ConnectionError) as e:
+                    with lock:
+                        errors.append(f"{type(e).__name__}: {e}")
+        except (requests.RequestException, ConnectionError) as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+        finally:
+            user.close()
+
+    threads = [threading.Thread(target=drive, args=(index,)) for index in range(users)]
+    for thread in threads:
+        thread.start()
+    connected.wait()
+    started = time.monotonic()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    to_ms = lambda seconds: [value * 1000 for value in seconds]
+    return {
+        "users": users,
+        "turns_per_user": turns,
+        "completed_turns": len(finals),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "elapsed_seconds": elapsed,
+        "turns_per_second": len(finals) / elapsed if elapsed else 0.0,
+        "time_to_first_token_ms": summarize(to_ms(ttfts)),
+        "time_to_final_token_ms": summarize(to_ms(finals)),
+    }
+
+
+def _serve(app):
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _log_tail(log_path, lines=20):
+    with open(log_path, errors="replace") as log:
+        return "".join(log.readlines()[-lines:])
+
+
+def _wait_for_port(port, process, log_path, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Agent server exited with code {process.returncode}, "
+                               f"last lines of {log_path}:\n{_log_tail(log_path)}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("Agent server did not start listening in time")
+
+
+def spawn_agent_server(server, mock_llm_url, inventory_url, workdir):
+    """
+    Start the agent server in a subprocess with every LLM redirected to the mock. Its output goes to
+    <server>_server.log in `workdir`.
+    """
+    agent_dir = os.path.dirname(os.path.abspath(__file__))
+    port = _free_port()
+    env = dict(os.environ,
+               LLM_MOCK_URL=mock_llm_url,
+               ORGANIZER_SERVER_URL=inventory_url,
+               REST_ADDRESS="127.0.0.1",
+               REST_PORT=str(port),
+               PYTHONPATH=os.pathsep.join(filter(None, [os.path.dirname(agent_dir), os.environ.get('PYTHONPATH')])))
+    cwd = os.path.join(workdir, "agent")
+    os.makedirs(cwd, exist_ok=True)
+    log_path = os.path.join(workdir, f"{server}_server.log")
+    with open(log_path, "wb") as log:
+        process = subprocess.Popen([sys.executable, os.path.join(agent_dir, SERVERS[server])], cwd=cwd, env=env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+    try:
+        _wait_for_port(port, process, log_path)
+    except (RuntimeError, TimeoutError):
+        process.kill()
+        process.wait()
+        raise
+    return process, f"http://127.0.0.1:{port}"
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running agent server")
+    parser.add_argument("--spawn", choices=sorted(SERVERS), help="Start this agent server against the mock LLM")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=5, help="Turns per user")
+    parser.add_argument("--message", default="Where is my screwdriver?")
+    parser.add_argument("--messages-per-turn", type=int, default=2,
+                        help="Completed streamed messages that make up one turn")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for one turn")
+    parser.add_argument("--transcript", help="JSONL transcript for the mock LLM (default: scripted turn)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--ttft-ms", type=float, default=200.0)
+    parser.add_argument("--output", default=f"agent_turn_benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    args = parser.parse_args()
+
+    if not args.url and not args.spawn:
+        parser.error("either --url or --spawn is required")
+
+    process = None
+    servers = []
+    try:
+        base_url = args.url
+        if args.spawn:
+            replayer = (TranscriptReplayer.from_file(args.transcript) if args.transcript
+                        else TranscriptReplayer(BENCHMARK_TRANSCRIPT))
+            mock_llm, mock_llm_url = _serve(create_app(replayer, tokens_per_second=args.tokens_per_second,
+                                                       ttft_ms=args.ttft_ms))
+            inventory, inventory_url = _serve(create_stub_inventory_app())
+            servers = [mock_llm, inventory]
+            process, base_url = spawn_agent_server(args.spawn, mock_llm_url, inventory_url, tempfile.mkdtemp())
+
+        results = run_benchmark(base_url, users=args.users, turns=args.turns, message=args.message,
+                                messages_per_turn=args.messages_per_turn, timeout=args.timeout)
+        results.update({
+            "commit": current_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "server": args.spawn or args.url,
+            "mock_llm": {"tokens_per_second": args.tokens_per_second, "ttft_ms": args.ttft_ms} if args.spawn else None,
+        })
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        for server in servers:
+            server.shutdown()
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
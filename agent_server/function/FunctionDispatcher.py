@@ -0,0 +1,151 @@
+import inspect
+import threading
+
+from agent_server.function.exceptions import ValidationError
+
+
+def _coerce_string(value):
+    # LLMs often emit ids as numbers ("container_id": 5); the inventory only takes strings
+    if isinstance(value, bool):
+        raise ValueError("expected a string, got a boolean")
+    if isinstance(value, (int, float)):
+        return str(value)
+    if not isinstance(value, str):
+        raise ValueError(f"expected a string, got {type(value).__name__}")
+    value = value.strip()
+    if not value:
+        raise ValueError("expected a non-empty string")
+    return value
+
+
+def _coerce_integer(value):
+    if isinstance(value, bool):
+        raise ValueError("expected an integer, got a boolean")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"expected an integer, got {value!r}")
+
+
+def _coerce_number(value):
+    if isinstance(value, bool):
+        raise ValueError("expected a number, got a boolean")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"expected a number, got {value!r}")
+
+
+def _coerce_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError(f"expected a boolean, got {value!r}")
+
+
+_SCALARS = {
+    'string': _coerce_string,
+    'integer': _coerce_integer,
+    'number': _coerce_number,
+    'boolean': _coerce_boolean,
+}
+
+
+def _compile_type(schema):
+    """A coercer for a declared parameter type: 'string', 'integer', 'number', 'boolean' or [type]."""
+    if isinstance(schema, list):
+        if len(schema) != 1:
+            raise TypeError(f"List parameter types take exactly one item type, got {schema!r}")
+        coerce_item = _compile_type(schema[0])
+
+        def coerce_list(value):
+            # A lone value where a list is expected ("items": "hammer") is a list of one
+            values = value if isinstance(value, (list, tuple)) else [value]
+            if not values:
+                raise ValueError("expected a non-empty list")
+            coerced = []
+            for index, item in enumerate(values):
+                try:
+                    coerced.append(coerce_item(item))
+                except ValueError as e:
+                    raise ValueError(f"item {index}: {e}")
+            return coerced
+        return coerce_list
+
+    if schema not in _SCALARS:
+        raise TypeError(f"Unknown parameter type: {schema!r}")
+    return _SCALARS[schema]
+
+
+def _check_signature(name, signature, declared):
+    """Raise TypeError if a call with the declared parameters (plus session_id) couldn't bind to the function."""
+    takes_any_keyword = any(param.kind is inspect.Parameter.VAR_KEYWORD for param in signature.values())
+    undeclared = [param.name for param in signature.values()
+                  if param.default is inspect.Parameter.empty and param.name != 'session_id'
+                  and param.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+                  and param.name not in declared]
+    if undeclared:
+        raise TypeError(f"'{name}' requires argument(s) {undeclared} that aren't declared parameters")
+    keyword_names = [param_name for param_name, param in signature.items()
+                     if param.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)]
+    unaccepted = [param for param in declared if param not in keyword_names and not takes_any_keyword]
+    if unaccepted:
+        raise TypeError(f"'{name}' declares parameter(s) {unaccepted} that the function doesn't accept")
+
+
+class FunctionDispatcher:
+    """
+    A registered function compiled once at registration: a coercer per declared parameter and
+    whether the function takes session_id, so a call is just validation plus the function call. The
+    declared parameters are checked against the function's signature here too, so a mismatch fails
+    at import rather than on every call.
+    Also carries the tool's execution limits, which ToolExecutor enforces, and its caching behaviour,
+    which ToolResultCache applies.
+    """
+
+    def __init__(self, name, function, parameters=None, timeout=None, max_concurrency=None, retries=0,
+                 read_only=False, cache_ttl=None, invalidates=None):
+        self.name = name
+        self.function = function
+        self.coercers = {param: _compile_type(schema) for param, schema in (parameters or {}).items()}
+        signature = inspect.signature(function).parameters
+        _check_signature(name, signature, self.coercers)
+        self.takes_session_id = 'session_id' in signature
+        self.timeout = timeout  # seconds per attempt; None means the executor's default
+        self.retries = retries
+        self.max_concurrency = max_concurrency
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.read_only = read_only
+        self.cache_ttl = cache_ttl  # seconds; None means the cache's default
+        self.invalidates = invalidates or {}
+        for tool, parameter_map in self.invalidates.items():
+            unknown = [source for source in (parameter_map or {}).values() if source not in self.coercers]
+            if unknown:
+                raise TypeError(f"'{name}' invalidates '{tool}' by undeclared parameter(s) {unknown}")
+
+    def bind(self, parameters, session_id=None) -> dict:
+        """Validated, coerced keyword arguments for the function; raises ValidationError otherwise."""
+        if not isinstance(parameters, dict):
+            raise ValidationError(f"Parameters for action '{self.name}' must be an object, "
+                                  f"got {type(parameters).__name__}")
+
+        missing = [param for param in self.coercers if param not in parameters]
+        if missing:
+            raise ValidationError(f"Missing required parameter(s) {missing} for action '{self.name}'.")
+
+        kwargs, errors = {}, []
+        for param, coerce in self.coercers.items():
+            try:
+                kwargs[param] = coerce(parameters[param])
+            except ValueError as e:
+                errors.append(f"'{param}': {e}")
+        if errors:
+            raise ValidationError(f"Invalid parameter(s) for action '{self.name}': {'; '.join(errors)}")
+
+        if self.takes_session_id:
+            kwargs['session_id'] = session_id
+        return kwargs
+
+    def __call__(self, parameters, session_id=None):
+        return self.function(**self.bind(parameters, session_id))
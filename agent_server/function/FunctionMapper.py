@@ -1,11 +1,15 @@
 # function_mapper.py
 from agent_server.FunctionResponse import FunctionResponse, Status
+from agent_server.function.ToolExecutor import get_tool_executor
+from agent_server.function.ToolResultCache import get_tool_result_cache
+from agent_server.function.exceptions import ToolTimeoutError, ValidationError
 from agent_server.function.functionRegistry import function_registry
 
 
 class FunctionMapper:
-    def __init__(self):
-        pass  # Initialization if needed
+    def __init__(self, tool_executor=None, tool_cache=None):
+        self.tool_executor = tool_executor if tool_executor is not None else get_tool_executor()
+        self.tool_cache = tool_cache if tool_cache is not None else get_tool_result_cache()
 
     def wrap_to_action_response(self, function_response, action_name):
         status = function_response.status.name if hasattr(function_response, 'status') else 'SUCCESS'
@@ -29,29 +33,25 @@ class FunctionMapper:
                 'response': f"Unknown action: {action}. Expected actions: {list(function_registry.keys())}"
             }
 
-        function_info = function_registry[action]
-        function = function_info['function']
-        required_params = function_info['parameters']
+        # Validate and coerce the parameters before anything touches the inventory
+        dispatcher = function_registry[action]['dispatcher']
+        try:
+            kwargs = dispatcher.bind(parameters, session_id)
+        except ValidationError as e:
+            return {'action_name': action, 'response': str(e)}
 
-        # Check for missing parameters
-        missing_params = [param for param in required_params if param not in parameters]
-        if missing_params:
+        # Execute the function on the tool executor, within its timeout, concurrency and retry limits,
+        # reading through the tool cache for read-only tools and invalidating it for mutating ones
+        try:
+            result = self.tool_cache.call(dispatcher, kwargs,
+                                          lambda on_settled=None: self.tool_executor.run(dispatcher, kwargs, on_settled))
+            return self.wrap_to_action_response(result, action)
+        except ToolTimeoutError as e:
             return {
                 'action_name': action,
-                'response': f"Missing required parameter(s) {missing_params} for action '{action}'."
+                'status': 'TIMEOUT',
+                'response': str(e)
             }
-
-        # Prepare arguments
-        kwargs = {param: parameters[param] for param in required_params}
-
-        # Include session_id if required by the function
-        if 'session_id' in function.__code__.co_varnames:
-            kwargs['session_id'] = session_id
-
-        # Execute the function
-        try:
-            result = function(**kwargs)
-            return self.wrap_to_action_response(result, action)
         except Exception as e:
             print(f"Error executing function '{action}': {e}")
             return {
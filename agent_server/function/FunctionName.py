@@ -23,4 +23,12 @@ class FunctionName(Enum):
 
     @classmethod
     def has_value(cls, value):
-        return value in [item.function_name for item in cls]
+        return value in _BY_FUNCTION_NAME
+
+    @classmethod
+    def from_function_name(cls, value):
+        """The member for a function name, or None."""
+        return _BY_FUNCTION_NAME.get(value)
+
+
+_BY_FUNCTION_NAME = {item.function_name: item for item in FunctionName}
@@ -0,0 +1,117 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from agent_server.function.exceptions import ToolTimeoutError
+from agent_server.integrations.Metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+_tool_executor = None
+_tool_executor_lock = threading.Lock()
+
+
+def get_tool_executor():
+    """Process-wide executor that registered functions run on."""
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is None:
+            _tool_executor = ToolExecutor(
+                max_workers=int(os.getenv('TOOL_EXECUTOR_WORKERS', '8')),
+                default_timeout=float(os.getenv('TOOL_TIMEOUT_SECONDS', '30')),
+                retry_backoff=float(os.getenv('TOOL_RETRY_BACKOFF_SECONDS', '0.5')))
+        return _tool_executor
+
+
+class ToolExecutor:
+    """
+    Runs registered functions on a thread pool so a hung tool costs the caller its timeout rather than
+    the whole ReAct loop. Each FunctionDispatcher's timeout, max_concurrency and retries apply per call.
+
+    A timed-out call can't be interrupted; it keeps its worker and concurrency slot until it returns,
+    so a tool that keeps hanging is held to max_concurrency stuck threads.
+    """
+
+    def __init__(self, max_workers=8, default_timeout=30.0, retry_backoff=0.5, metrics=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self.default_timeout = default_timeout
+        self.retry_backoff = retry_backoff
+        metrics = metrics if metrics is not None else get_metrics()
+        self.calls = metrics.counter("tool_calls_total", "Tool call attempts by action and outcome",
+                                     ("action", "outcome"))
+
+    def run(self, dispatcher, kwargs: dict, on_settled=None):
+        """
+        The function's result; raises ToolTimeoutError or the function's own error once retries run out.
+        `on_settled`, if given, is called once every attempt has returned, which for a timed-out attempt
+        can be long after run() itself has given up on it.
+        """
+        attempts = []
+        try:
+            for attempt in range(dispatcher.retries + 1):
+                try:
+                    result = self._run_once(dispatcher, kwargs, attempts)
+                    self.calls.inc(action=dispatcher.name, outcome="success")
+                    return result
+                except ToolTimeoutError:
+                    self.calls.inc(action=dispatcher.name, outcome="timeout")
+                    if attempt == dispatcher.retries:
+                        raise
+                except Exception:
+                    self.calls.inc(action=dispatcher.name, outcome="error")
+                    if attempt == dispatcher.retries:
+                        raise
+                logger.warning(f"Retrying '{dispatcher.name}' (attempt {attempt + 2} of {dispatcher.retries + 1})")
+                time.sleep(self.retry_backoff * 2 ** attempt)
+        finally:
+            if on_settled is not None:
+                self._when_done(attempts, on_settled)
+
+    @staticmethod
+    def _when_done(futures, callback):
+        """callback() once all of the futures are done (at once if there are none)."""
+        if not futures:
+            callback()
+            return
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                settled = remaining[0] == 0
+            if settled:
+                callback()
+
+        for future in futures:
+            future.add_done_callback(done)
+
+    def _run_once(self, dispatcher, kwargs, attempts):
+        timeout = dispatcher.timeout if dispatcher.timeout is not None else self.default_timeout
+        deadline = time.monotonic() + timeout
+
+        # Waiting for a concurrency slot counts against the timeout
+        slots = dispatcher.slots
+        if slots is not None and not slots.acquire(timeout=timeout):
+            raise ToolTimeoutError(f"Action '{dispatcher.name}' timed out after {timeout}s waiting for a free slot")
+        try:
+            future = self.executor.submit(contextvars.copy_context().run, dispatcher.function, **kwargs)
+        except BaseException:
+            if slots is not None:
+                slots.release()
+            raise
+        attempts.append(future)
+        if slots is not None:
+            future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            raise ToolTimeoutError(f"Action '{dispatcher.name}' timed out after {timeout}s")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from agent_server.FunctionResponse import Status
+
+_tool_result_cache = None
+_tool_result_cache_lock = threading.Lock()
+
+
+def get_tool_result_cache():
+    """Process-wide cache of read-only tool results shared by every FunctionMapper."""
+    global _tool_result_cache
+    with _tool_result_cache_lock:
+        if _tool_result_cache is None:
+            _tool_result_cache = ToolResultCache(max_entries=int(os.getenv('TOOL_CACHE_MAX_ENTRIES', '256')),
+                                                 ttl_seconds=float(os.getenv('TOOL_CACHE_TTL_SECONDS', '30')))
+        return _tool_result_cache
+
+
+class ToolResultCache:
+    """
+    Results of read-only tools keyed by (tool, arguments), in an LRU whose entries expire after the
+    tool's cache_ttl (or `ttl_seconds`). Mutating tools drop the entries named by their `invalidates`.
+
+    Each tool has a generation that invalidation bumps; a result is only stored if no invalidation of
+    its tool happened while it was being fetched, and no write to the tool was in flight, so a read
+    racing a write can't cache stale data. A write is in flight until it has really finished, which
+    for a timed-out write is when its leaked thread returns, and is invalidated again then.
+
+    Keys are the tool's bound arguments, so tools that take a session id are cached per session. The
+    inventory tools don't: there is one inventory shared by every session, and so one set of entries.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (result, expires_at)
+        self._generations = {}
+        self._writes_in_flight = {}  # read tool -> writes that invalidate it and haven't finished yet
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(tool: str, kwargs: dict) -> str:
+        return tool + "\0" + json.dumps(kwargs, sort_keys=True, default=str)
+
+    def call(self, dispatcher, kwargs: dict, fetch):
+        """
+        fetch() through the cache if the tool is read-only. A mutating tool is called as
+        fetch(on_settled), and must call on_settled() once the write has finished, even if fetch
+        has already raised (ToolExecutor.run does); its invalidations apply until then.
+        """
+        if dispatcher.read_only:
+            return self._read_through(dispatcher, kwargs, fetch)
+        if not dispatcher.invalidates:
+            return fetch(None)
+
+        with self._lock:
+            for tool in dispatcher.invalidates:
+                self._writes_in_flight[tool] = self._writes_in_flight.get(tool, 0) + 1
+        self.invalidate(dispatcher.invalidates, kwargs)
+
+        def settled():
+            # Even a failed or timed-out write may have reached the inventory
+            self.invalidate(dispatcher.invalidates, kwargs)
+            with self._lock:
+                for tool in dispatcher.invalidates:
+                    self._writes_in_flight[tool] -= 1
+                    if not self._writes_in_flight[tool]:
+                        del self._writes_in_flight[tool]
+
+        return fetch(settled)
+
+    def invalidate(self, invalidates: dict, kwargs: dict):
+        """
+        Drop entries for each read tool in `invalidates`. A mapping of the read tool's parameters to
+        the mutating tool's drops the one entry for those arguments; None drops all of the tool's entries.
+        """
+        with self._lock:
+            for tool, parameter_map in invalidates.items():
+                self._generations[tool] = self._generations.get(tool, 0) + 1
+                if parameter_map is None:
+                    prefix = tool + "\0"
+                    for key in [key for key in self._entries if key.startswith(prefix)]:
+                        del self._entries[key]
+                        self._invalidations += 1
+                else:
+                    read_kwargs = {param: kwargs[source] for param, source in parameter_map.items()}
+                    if self._entries.pop(self.key(tool, read_kwargs), None) is not None:
+                        self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+            }
+
+    def _read_through(self, dispatcher, kwargs, fetch):
+        key = self.key(dispatcher.name, kwargs)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry[0]
+                del self._entries[key]
+            self._misses += 1
+            generation = self._generations.get(dispatcher.name, 0)
+
+        result = fetch()
+
+        # Failures aren't cached, so the next call tries the inventory again
+        if getattr(result, 'status', Status.SUCCESS) != Status.SUCCESS:
+            return result
+        ttl = dispatcher.cache_ttl if dispatcher.cache_ttl is not None else self.ttl_seconds
+        with self._lock:
+            if self._generations.get(dispatcher.name, 0) == generation \
+                    and dispatcher.name not in self._writes_in_flight:
+                self._entries[key] = (result, time.time() + ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
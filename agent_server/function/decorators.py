@@ -1,14 +1,27 @@
 # decorators.py
+from agent_server.function.FunctionDispatcher import FunctionDispatcher
 from agent_server.function.functionRegistry import function_registry
 
 
-def register_function(name, parameters=None, description='', examples=None):
+def register_function(name, parameters=None, description='', examples=None, timeout=None, max_concurrency=None,
+                      retries=0, read_only=False, cache_ttl=None, invalidates=None):
+    """
+    Register a tool. `timeout` (seconds per attempt), `max_concurrency` (calls in flight at once) and
+    `retries` (extra attempts after an error or timeout) are enforced by ToolExecutor.
+
+    Results of `read_only` tools are cached per argument set for `cache_ttl` seconds. A mutating tool
+    lists the cached results it makes stale in `invalidates`: {read tool: {read parameter: own
+    parameter}} drops the matching entry, {read tool: None} drops all of that tool's entries.
+    """
     def decorator(func):
         function_registry[name] = {
             'function': func,
             'parameters': parameters,
             'description': description,
             'examples': examples or [],
+            # Validation and the session_id check are compiled here, not worked out on every call
+            'dispatcher': FunctionDispatcher(name, func, parameters, timeout, max_concurrency, retries,
+                                             read_only, cache_ttl, invalidates),
         }
         return func
     return decorator
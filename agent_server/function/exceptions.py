@@ -7,3 +7,6 @@ class UnknownActionError(FunctionMappingError):
 
 class ValidationError(FunctionMappingError):
     pass
+
+class ToolTimeoutError(FunctionMappingError):
+    pass
@@ -25,6 +25,9 @@ local_device_action = LocalDeviceAction(None)
     name='get_inventory',
     parameters={},
     description='Retrieve the entire inventory.',
+    read_only=True,
+    timeout=10,
+    retries=1,
     examples=[
         {
             'query': 'retrieve the entire inventory',
@@ -42,6 +45,10 @@ def get_inventory():
     name='find_location',
     parameters={'item_name': 'string'},
     description='Find the location of an item by name.',
+    read_only=True,
+    # Smart finding asks an LLM when there's no exact match
+    timeout=20,
+    retries=1,
     examples=[
         {
             'query': 'find the location of item named screwdriver',
@@ -51,6 +58,15 @@ def get_inventory():
                     'item_name': 'screwdriver'
                 }
             }
+        },
+        {
+            'query': 'Where is my screwdriver?',
+            'response': {
+                'action': 'find_location',
+                'parameters': {
+                    'item_name': 'screwdriver'
+                }
+            }
         }
     ]
 )
@@ -61,6 +77,9 @@ def find_location(item_name):
     name='get_container',
     parameters={'container_id': 'string'},
     description='Get details of a specific container.',
+    read_only=True,
+    timeout=10,
+    retries=1,
     examples=[
         {
             'query': "What's in container 5?",
@@ -80,6 +99,9 @@ def get_container(container_id):
     name='create_items',
     parameters={'container': 'string', 'items': ['string']},
     description='Create items in a specified container.',
+    invalidates={'get_inventory': None, 'get_container': {'container_id': 'container'}, 'find_location': None},
+    # Not retried: a create that timed out may still have been applied
+    timeout=10,
     examples=[
         {
             'query': 'add a hammer to container 5',
@@ -110,6 +132,8 @@ def create_items(container, items):
     name='delete_items',
     parameters={'container': 'string', 'items': ['string']},
     description='Delete items from a specified container.',
+    invalidates={'get_inventory': None, 'get_container': {'container_id': 'container'}, 'find_location': None},
+    timeout=10,
     examples=[
         {
             'query': 'remove a screwdriver from container 10',
@@ -154,15 +178,20 @@ def list_actions():
     return FunctionResponse(Status.SUCCESS, generate_json_definitions())
 
 @register_function(
-    name='start_session',
-    parameters={},
-    description='Start a new chat session.',
+    name='knowledge_query',
+    parameters={'query': 'string'},
+    description='Query a knowledge source for general information.',
+    # An LLM call of its own; a couple at a time is plenty
+    timeout=60,
+    max_concurrency=2,
     examples=[
         {
-            'query': 'Start a new session.',
+            'query': 'What is the main street in Denver?',
             'response': {
-                'action': 'start_session',
-                'parameters': {}
+                'action': 'knowledge_query',
+                'parameters': {
+                    'query': 'What is the main street in Denver?'
+                }
             }
         }
     ]
@@ -174,6 +203,7 @@ def knowledge_query_function(query):
     name='event_alert_action',
     parameters={'event_name': 'string', 'message': 'string'},
     description='Set an event alert with a message.',
+    timeout=5,
     examples=[
         {
             'query': 'Hey when I get home can you remind me to put in the laundry?',
@@ -0,0 +1,156 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest item to make room
+    COALESCE = "coalesce"  # Merge the new item into the newest one (text), else drop oldest
+    BLOCK = "block"  # Pause the producer until there is room, then drop oldest after block_timeout
+
+
+def default_sizeof(item):
+    """Approximate payload size in bytes of a stream item."""
+    if isinstance(item, str):
+        return len(item)
+    if isinstance(item, tuple):
+        return sum(default_sizeof(part) for part in item)
+    return getattr(item, 'nbytes', 0)
+
+
+def can_coalesce_text(newest, item):
+    return isinstance(newest, str) and isinstance(item, str)
+
+
+class BoundedBuffer:
+    """
+    Thread-safe bounded FIFO for a single stream.
+
+    Capacity is limited by item count and, optionally, total payload bytes. When a put would
+    exceed either limit the overflow policy decides what gives. Consumers can read with the
+    blocking get() (queue.Queue compatible) or await aget() from an event loop; producers are
+    always ordinary threads. None is treated as an end-of-stream sentinel and is never dropped.
+    """
+
+    def __init__(self, max_items=1000, max_bytes=None, policy=OverflowPolicy.DROP_OLDEST, block_timeout=5.0,
+                 sizeof=default_sizeof, can_coalesce=can_coalesce_text):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._sizeof = sizeof
+        self._can_coalesce = can_coalesce
+        self._items = deque()  # (item, size)
+        self._bytes = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._blocked_seconds = 0.0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._async_waiters = []  # (loop, future) pairs for consumers awaiting aget()
+
+    def put(self, item):
+        with self._lock:
+            if item is None:
+                self._items.append((None, 0))
+            else:
+                self._put_bounded(item, self._sizeof(item))
+            self._not_empty.notify()
+            self._wake_async_waiters()
+
+    def get(self, timeout=None):
+        """Blocking get; raises queue.Empty after `timeout` seconds."""
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._pop()
+
+    async def aget(self, timeout=None):
+        """Awaitable get; raises asyncio.TimeoutError after `timeout` seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._lock:
+                if self._items:
+                    return self._pop()
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def qsize(self):
+        with self._lock:
+            return len(self._items)
+
+    def stats(self):
+        """Memory accounting for this buffer."""
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes": self._bytes,
+                "max_items": self.max_items,
+                "max_bytes": self.max_bytes,
+                "policy": self.policy.value,
+                "dropped": self._dropped,
+                "coalesced": self._coalesced,
+                "blocked_seconds": round(self._blocked_seconds, 3),
+            }
+
+    def _put_bounded(self, item, size):
+        if self._has_room(size):
+            self._append(item, size)
+            return
+
+        if self.policy == OverflowPolicy.BLOCK:
+            started = time.monotonic()
+            self._not_full.wait_for(lambda: self._has_room(size), self.block_timeout)
+            self._blocked_seconds += time.monotonic() - started
+        elif self.policy == OverflowPolicy.COALESCE and self._items:
+            newest, newest_size = self._items[-1]
+            if newest is not None and self._can_coalesce(newest, item) and self._fits_bytes(size):
+                self._items[-1] = (newest + item, newest_size + size)
+                self._bytes += size
+                self._coalesced += 1
+                return
+
+        while self._items and not self._has_room(size) and self._items[0][0] is not None:
+            _, dropped_size = self._items.popleft()
+            self._bytes -= dropped_size
+            self._dropped += 1
+        self._append(item, size)
+
+    def _has_room(self, size):
+        return (not self.max_items or len(self._items) < self.max_items) and self._fits_bytes(size)
+
+    def _fits_bytes(self, size):
+        return not self.max_bytes or self._bytes + size <= self.max_bytes
+
+    def _append(self, item, size):
+        self._items.append((item, size))
+        self._bytes += size
+
+    def _pop(self):
+        item, size = self._items.popleft()
+        self._bytes -= size
+        self._not_full.notify()
+        return item
+
+    def _wake_async_waiters(self):
+        for loop, waiter in self._async_waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+        self._async_waiters.clear()
+
+
+def _resolve(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
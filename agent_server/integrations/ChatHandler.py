@@ -1,10 +1,16 @@
-import json
 import os
-
+import threading
+import time
+from collections import OrderedDict
+
+from agent_server.integrations.ChatWindow import ChatWindow
+from agent_server.integrations.Metrics import get_metrics
+from agent_server.integrations.SessionStore import SessionStore
+from agent_server.integrations.SqliteSessionStore import SqliteSessionStore
 from agent_server.integrations.StreamManager import StreamManager
 
 from typing import Final
-from datetime import datetime, timedelta
+from datetime import datetime
 from langchain.memory import ConversationBufferMemory
 from langchain_core.messages import HumanMessage, AIMessage
 from agent_server.llms.LLMInterface import LLMInterface
@@ -15,6 +21,10 @@ class ChatSession:
         self._session_id: Final[str] = session_id
         self._chat_handler = chat_handler
 
+    @property
+    def session_id(self):
+        return self._session_id
+
     def parse_llm_stream(self, data_chunk, message_id):
         if self._username not in self._chat_handler.temp_buffers:
             self._chat_handler.temp_buffers[self._username] = {}
@@ -41,79 +51,34 @@ class ChatSession:
     def finalize_message(self, message, role):
         if message:
             timestamp = datetime.utcnow().isoformat() + 'Z'
-            if self._username in self._chat_handler.memories:
-                if role == "Human":
-                    print(f"HUMAN ({timestamp}): {message}")
-                    self._chat_handler.memories[self._username].chat_memory.add_message(
-                        HumanMessage(content=message, metadata={"timestamp": timestamp})
-                    )
-                elif role == "AI":
-                    print(f"AI ({timestamp}): {message}")
-                    self._chat_handler.memories[self._username].chat_memory.add_message(
-                        AIMessage(content=message, metadata={"timestamp": timestamp})
-                    )
+            if self._chat_handler.get_memory(self._username) is not None:
+                print(f"{role.upper()} ({timestamp}): {message}")
+                self._chat_handler.append_memory(self._username, role, message, timestamp)
 
             # Add timestamp to session history
-            if self._username not in self._chat_handler.users:
-                self._chat_handler.users[self._username] = []
-
-            self._chat_handler.users[self._username].append({"role": role, "message": message, "timestamp": timestamp})
+            self._chat_handler.append_history(self._username, role, message, timestamp)
 
     def store_human_context(self, message):
-        if self._username not in self._chat_handler.users:
-            self._chat_handler.users[self._username] = []
-
         if message.strip():
             timestamp = datetime.utcnow().isoformat() + 'Z'
-            self._chat_handler.users[self._username].append({"role": "Human", "message": message, "timestamp": timestamp})
+            self._chat_handler.append_history(self._username, "Human", message, timestamp)
             self.finalize_message(message, "Human")
-            self._chat_handler.save_sessions_to_file()
         else:
             print("Ignored empty human message.")
 
     def get_context(self):
-        if self._username in self._chat_handler.memories:
-            context = self._chat_handler.memories[self._username].load_memory_variables({})
+        session_memory = self._chat_handler.get_memory(self._username)
+        if session_memory is not None:
+            context = session_memory.load_memory_variables({})
             return context.get("history", "")
         return ""
 
     def get_full_session_history(self):
-        return self._chat_handler.users.get(self._username, [])
+        return self._chat_handler.get_history(self._username)
 
     def get_current_chat(self):
-        session_memory = self._chat_handler.memories.get(self._username)
-        if not session_memory or not session_memory.chat_memory.messages:
-            return []
-
-        session_history = session_memory.chat_memory.messages
-        current_chat = [self._convert_message_to_dict(session_history[0])]
-
-        for i in range(1, len(session_history)):
-            prev_message = session_history[i - 1]
-            current_message = session_history[i]
-
-            # Extract timestamps, falling back gracefully if not present
-            prev_timestamp = self._get_message_timestamp(prev_message)
-            current_timestamp = self._get_message_timestamp(current_message)
-
-            if prev_timestamp and current_timestamp:
-                time_diff = current_timestamp - prev_timestamp
-                if time_diff <= timedelta(minutes=30):
-                    current_chat.append(self._convert_message_to_dict(current_message))
-                else:
-                    current_chat = [self._convert_message_to_dict(current_message)]
-            else:
-                # Skip messages if timestamps are missing
-                continue
-        return current_chat
-
-    def _get_message_timestamp(self, message):
-        """
-        Extracts the timestamp from a message's metadata, if available.
-        """
-        if hasattr(message, "metadata") and "timestamp" in message.metadata:
-            return datetime.fromisoformat(message.metadata["timestamp"].rstrip('Z'))
-        return None
+        return [self._convert_message_to_dict(message)
+                for message in self._chat_handler.get_current_chat_messages(self._username)]
 
     def _convert_message_to_dict(self, message):
         """
@@ -129,65 +94,125 @@ class ChatSession:
         }
 
 class ChatHandler:
-    def __init__(self, stream_manager: StreamManager, sessions_file_path='sessions.json'):
-        self.users = {}
+    def __init__(self, stream_manager: StreamManager, sessions_file_path='sessions.json', store: SessionStore = None,
+                 max_cached_users=100, chat_window_gap_minutes=30):
         self.sessions_file_path = sessions_file_path
+        if store is None:
+            # Default to SQLite next to the sessions file, importing the old JSON sessions on first run
+            store = SqliteSessionStore(os.path.splitext(sessions_file_path)[0] + '.db',
+                                       legacy_sessions_file=sessions_file_path)
+        self.store = store
+        self.max_cached_users = max_cached_users
+        self.users = OrderedDict()  # LRU cache of session histories for recently active users
         self.result_cache = {}
-        self.memories = {}  # Dictionary to hold ConversationBufferMemory instances
+        self.memories = {}  # ConversationBufferMemory instances for the users in the cache
+        self.chat_windows = {}  # ChatWindow over each cached memory, marking where the current chat starts
+        self.chat_window_gap_seconds = chat_window_gap_minutes * 60
         self.temp_buffers = {}  # Dictionary to hold temporary buffers for messages by session_id
-        self.load_sessions_from_file()
+        self.sessions = {}  # session_id -> username, for the sessions started through create_session
         self.stream_manager = stream_manager
+        self.save_latency = get_metrics().histogram("session_save_seconds", "Time to persist a session write",
+                                                    ("store", "operation"))
+        self._lock = threading.RLock()
 
     def create_session(self, username, session_id):
         self.get_or_create_user(username)
+        self._load_user(username)
+        with self._lock:
+            self.sessions[session_id] = username
         return ChatSession(username, session_id, self)
 
-    def save_sessions_to_file(self):
-        try:
-            sessions_data = {
-                "sessions": self.users,
-                "memories": {session_id: self.serialize_memory(memory) for session_id, memory in
-                             self.memories.items()}
-            }
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(self.sessions_file_path), exist_ok=True)
-            with open(self.sessions_file_path, 'w') as file:
-                json.dump(sessions_data, file)
-        except IOError as err:
-            print(f"Error saving sessions to file: {err}")
-
-    def load_sessions_from_file(self):
-        try:
-            if not os.path.exists(self.sessions_file_path):
-                # File doesn't exist, initialize and create it
-                print(f"File {self.sessions_file_path} not found. Creating a new one.")
-                self.users = {}
-                self.save_sessions_to_file()
-                return
-
-            with open(self.sessions_file_path, 'r') as file:
-                sessions_data = json.load(file)
-                self.users = sessions_data.get("sessions", {})
-                self.memories = {
-                    session_id: self.deserialize_memory(memory_data)
-                    for session_id, memory_data in sessions_data.get("memories", {}).items()
-                }
-            print("Sessions successfully loaded from file.")
-        except (IOError, json.JSONDecodeError) as err:
-            print(f"Error loading sessions from file: {err}")
+    def end_session(self, session_id):
+        """Forget a session, dropping any message it was still streaming; the user's history is kept."""
+        with self._lock:
+            username = self.sessions.pop(session_id, None)
+            if username is not None and username not in self.sessions.values():
+                self.temp_buffers.pop(username, None)
+
+    def get_history(self, username):
+        """Return the user's session history, loading it from the store if needed."""
+        with self._lock:
+            if self._load_user(username) is None:
+                return []
+            return self.users[username]
+
+    def get_memory(self, username):
+        """Return the user's ConversationBufferMemory, or None if the user is unknown."""
+        with self._lock:
+            if self._load_user(username) is None:
+                return None
+            return self.memories[username]
+
+    def append_history(self, username, role, message, timestamp):
+        """Persist an entry to a user's session history."""
+        with self._lock:
+            self._save("append_history", self.store.append_history, username, role, message, timestamp)
+            if username in self.users:
+                self.users[username].append({"role": role, "message": message, "timestamp": timestamp})
+
+    def append_memory(self, username, role, content, timestamp):
+        """Persist a message to a user's conversation memory."""
+        with self._lock:
+            self._save("append_memory", self.store.append_memory, username, role, content, timestamp)
+            if username in self.memories:
+                self.memories[username].chat_memory.add_message(self._create_message(role, content, timestamp))
+                self.chat_windows[username].add(timestamp)
+
+    def get_current_chat_messages(self, username):
+        """Return the memory messages of the user's current chat, i.e. since the last long gap."""
+        with self._lock:
+            if self._load_user(username) is None:
+                return []
+            messages = self.memories[username].chat_memory.messages
+            return [messages[index] for index in self.chat_windows[username].indices()]
 
     def get_or_create_user(self, username):
-        if username and username in self.users:
+        if username and (username in self.users or self.store.user_exists(username)):
             # If session already exists, return the existing session ID and pick up where it left off
             print(f"Resuming session: {username}")
             return username
 
-        self.users[username] = []
-        self.save_sessions_to_file()
-        self.memories[username] = ConversationBufferMemory()  # Create memory for new session
+        with self._lock:
+            self._save("create_user", self.store.create_user, username)
+            self._cache_user(username, [], ConversationBufferMemory())
         print(f"Starting new session: {username}")
         return username
 
+    def _save(self, operation, write, *args):
+        started = time.perf_counter()
+        try:
+            write(*args)
+        finally:
+            self.save_latency.observe(time.perf_counter() - started, store=type(self.store).__name__,
+                                      operation=operation)
+
+    def _load_user(self, username):
+        """Bring a user into the LRU cache, returning its history or None if the user is unknown."""
+        with self._lock:
+            if username in self.users:
+                self.users.move_to_end(username)
+                return self.users[username]
+
+            loaded = self.store.load_user(username)
+            if loaded is None:
+                return None
+            history, memory_messages = loaded
+            self._cache_user(username, history, self.deserialize_memory({"messages": memory_messages}))
+            return history
+
+    def _cache_user(self, username, history, memory):
+        self.users[username] = history
+        self.users.move_to_end(username)
+        self.memories[username] = memory
+        chat_window = ChatWindow(self.chat_window_gap_seconds)
+        for message in memory.chat_memory.messages:
+            chat_window.add(message.metadata.get("timestamp"))
+        self.chat_windows[username] = chat_window
+        while len(self.users) > self.max_cached_users:
+            evicted, _ = self.users.popitem(last=False)
+            self.memories.pop(evicted, None)
+            self.chat_windows.pop(evicted, None)
+
     def serialize_memory(self, memory):
         """Serialize a ConversationBufferMemory to a dictionary."""
         messages = [
@@ -204,12 +229,11 @@ class ChatHandler:
         """Deserialize a dictionary to a ConversationBufferMemory."""
         memory = ConversationBufferMemory()
         for msg in memory_data.get("messages", []):
-            if msg["role"] == "Human":
-                memory.chat_memory.add_message(
-                    HumanMessage(content=msg["content"], metadata={"timestamp": msg.get("timestamp")})
-                )
-            else:
-                memory.chat_memory.add_message(
-                    AIMessage(content=msg["content"], metadata={"timestamp": msg.get("timestamp")})
-                )
+            memory.chat_memory.add_message(self._create_message(msg["role"], msg["content"], msg.get("timestamp")))
         return memory
+
+    @staticmethod
+    def _create_message(role, content, timestamp):
+        if role == "Human":
+            return HumanMessage(content=content, metadata={"timestamp": timestamp})
+        return AIMessage(content=content, metadata={"timestamp": timestamp})
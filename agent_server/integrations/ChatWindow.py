@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+
+def parse_timestamp(timestamp: Optional[str]) -> Optional[float]:
+    """Convert an ISO-8601 UTC timestamp ('...Z') to epoch seconds, or None if missing/invalid."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.rstrip('Z')).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+
+
+class ChatWindow:
+    """
+    Tracks where the current chat starts within a user's memory messages.
+
+    A new chat starts whenever a message arrives more than `gap_seconds` after the previous
+    timestamped message. Timestamps are parsed once, on add, so reading the current chat only
+    touches the messages inside the window.
+    """
+
+    def __init__(self, gap_seconds: float):
+        self.gap_seconds = gap_seconds
+        self.timestamps: List[Optional[float]] = []  # Parallel to the memory's message list
+        self.start = 0
+        self._last_timestamp = None
+
+    def add(self, timestamp: Optional[str]):
+        epoch = parse_timestamp(timestamp)
+        index = len(self.timestamps)
+        self.timestamps.append(epoch)
+        if epoch is None:
+            return
+        if self._last_timestamp is not None and epoch - self._last_timestamp > self.gap_seconds:
+            self.start = index
+        self._last_timestamp = epoch
+
+    def indices(self) -> List[int]:
+        """Indices of the messages in the current chat; untimestamped messages are skipped."""
+        return [index for index in range(self.start, len(self.timestamps))
+                if index == self.start or self.timestamps[index] is not None]
@@ -0,0 +1,109 @@
+import threading
+from collections import deque
+
+from agent_server.integrations.BoundedBuffer import BoundedBuffer
+
+
+class StreamEvent:
+    """A sequence-numbered chunk of a session's text stream."""
+    __slots__ = ("seq", "data")
+
+    def __init__(self, seq: int, data: str):
+        self.seq = seq
+        self.data = data
+
+    def __add__(self, other):
+        # Coalescing two pending events keeps the later id, so a resuming client skips both
+        return StreamEvent(other.seq, self.data + other.data)
+
+    def __eq__(self, other):
+        return isinstance(other, StreamEvent) and (self.seq, self.data) == (other.seq, other.data)
+
+    def __repr__(self):
+        return f"StreamEvent({self.seq}, {self.data!r})"
+
+
+class EventStream:
+    """
+    Per-session ring buffer of sequence-numbered events with independent subscribers.
+
+    Every subscriber gets its own BoundedBuffer, so a slow reader only overflows its own buffer.
+    The last `replay_capacity` events are retained so a reconnecting client can resume after the
+    last event id it saw.
+    """
+
+    def __init__(self, replay_capacity=512, buffer_limits=None, can_coalesce=None):
+        self._events = deque(maxlen=replay_capacity)
+        self._last_seq = 0
+        self._subscribers = []
+        self._buffer_limits = buffer_limits or {}
+        self._can_coalesce = can_coalesce
+        self._lock = threading.Lock()
+        # Serializes fan-out so subscribers see events in sequence order, without holding _lock while a
+        # BLOCK-policy subscriber waits for room
+        self._fanout_lock = threading.Lock()
+
+    def publish(self, data) -> int:
+        """Append an event and fan it out; returns the event's sequence number."""
+        with self._fanout_lock:
+            with self._lock:
+                self._last_seq += 1
+                event = StreamEvent(self._last_seq, data)
+                self._events.append(event)
+                subscribers = list(self._subscribers)
+            # A subscriber added after the snapshot gets this event from the replay buffer instead
+            for subscriber in subscribers:
+                subscriber.put(event)
+            return event.seq
+
+    def subscribe(self, last_event_id=None) -> BoundedBuffer:
+        """Register a subscriber, pre-filled with retained events newer than last_event_id."""
+        buffer = BoundedBuffer(sizeof=lambda event: len(event.data), can_coalesce=self._coalescable,
+                               **self._buffer_limits)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._events:
+                    if event.seq > last_event_id:
+                        buffer.put(event)
+            self._subscribers.append(buffer)
+        return buffer
+
+    def unsubscribe(self, buffer) -> int:
+        """Remove a subscriber; returns how many remain."""
+        with self._lock:
+            if buffer in self._subscribers:
+                self._subscribers.remove(buffer)
+            return len(self._subscribers)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def close(self):
+        """Wake every subscriber with the None end-of-stream sentinel."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for subscriber in subscribers:
+            subscriber.put(None)
+
+    def stats(self):
+        with self._lock:
+            subscribers = [subscriber.stats() for subscriber in self._subscribers]
+            return {
+                "last_event_id": self._last_seq,
+                "replay": {"events": len(self._events), "bytes": sum(len(event.data) for event in self._events)},
+                "subscribers": subscribers,
+                "bytes": sum(len(event.data) for event in self._events) + sum(s["bytes"] for s in subscribers),
+            }
+
+    def _coalescable(self, newest, event):
+        return self._can_coalesce is not None and self._can_coalesce(newest.data, event.data)
+
+
+def parse_event_id(value):
+    """Parse a Last-Event-ID header or query value; anything unusable means 'no replay'."""
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,99 @@
+import json
+import threading
+
+from agent_server.integrations.SessionLog import SessionLog
+from agent_server.integrations.SessionStore import SessionStore
+
+
+class FileSessionStore(SessionStore):
+    """
+    JSON snapshot plus append-only log (the original sessions.json format).
+
+    Raw message dicts for every user are kept in memory so the snapshot can be rewritten on
+    compaction; ChatHandler still only builds langchain messages for users it actually loads.
+    """
+
+    def __init__(self, sessions_file_path, compact_every=500):
+        self.sessions_file_path = sessions_file_path
+        self.session_log = SessionLog(sessions_file_path, compact_every=compact_every)
+        self._users = {}
+        self._memories = {}
+        self._lock = threading.RLock()
+        self._load()
+
+    def user_exists(self, username):
+        return username in self._users
+
+    def create_user(self, username):
+        self._record({"type": "user", "username": username})
+
+    def load_user(self, username):
+        with self._lock:
+            if username not in self._users:
+                return None
+            return list(self._users[username]), list(self._memories.get(username, []))
+
+    def append_history(self, username, role, message, timestamp):
+        self._record({"type": "history", "username": username, "role": role, "message": message,
+                      "timestamp": timestamp})
+
+    def append_memory(self, username, role, content, timestamp):
+        self._record({"type": "memory", "username": username, "role": role, "content": content,
+                      "timestamp": timestamp})
+
+    def users(self):
+        """Iterate over (username, history, memory) for every stored user."""
+        with self._lock:
+            for username in list(self._users):
+                yield (username,) + self.load_user(username)
+
+    def compact(self):
+        """Rewrite the snapshot from the in-memory state and truncate the log."""
+        with self._lock:
+            sessions_data = {
+                "sessions": self._users,
+                "memories": {username: {"messages": messages} for username, messages in self._memories.items()}
+            }
+            self.session_log.write_snapshot(sessions_data)
+
+    def _record(self, record):
+        with self._lock:
+            self._apply_record(record)
+            if self.session_log.append(record):
+                self.compact()
+
+    def _apply_record(self, record):
+        username = record["username"]
+        if record["type"] == "user":
+            self._users[username] = []
+            self._memories[username] = []
+        elif record["type"] == "history":
+            self._users.setdefault(username, []).append(
+                {"role": record["role"], "message": record["message"], "timestamp": record["timestamp"]}
+            )
+        elif record["type"] == "memory":
+            if username in self._memories:
+                self._memories[username].append(
+                    {"role": record["role"], "content": record["content"], "timestamp": record["timestamp"]}
+                )
+
+    def _load(self):
+        try:
+            sessions_data = self.session_log.read_snapshot()
+            if sessions_data is None:
+                print(f"File {self.sessions_file_path} not found. Creating a new one.")
+                sessions_data = {}
+
+            self._users = sessions_data.get("sessions", {})
+            self._memories = {
+                username: memory_data.get("messages", [])
+                for username, memory_data in sessions_data.get("memories", {}).items()
+            }
+
+            # Replay anything logged after the snapshot was taken
+            for record in self.session_log.replay(after_seq=sessions_data.get("log_seq", 0)):
+                self._apply_record(record)
+            self.compact()
+            print("Sessions successfully loaded from file.")
+        except (IOError, json.JSONDecodeError) as err:
+            print(f"Error loading sessions from file: {err}")
@@ -0,0 +1,120 @@
+import contextvars
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the scheduler is at its queue-depth limit."""
+
+    def __init__(self, max_queue_depth):
+        self.max_queue_depth = max_queue_depth
+        super().__init__(f"Job queue is full ({max_queue_depth} pending jobs)")
+
+
+class JobScheduler:
+    """
+    Bounded worker pool that runs jobs in FIFO order per key.
+
+    Jobs sharing a key (e.g. a session_id) never run concurrently and always run in the order
+    they were submitted; jobs with different keys run in parallel on up to `workers` threads.
+    submit_limited lets a key run several of its jobs at once, still started in FIFO order.
+    Keys with pending work are served round-robin, one job per turn, so one busy key can't starve
+    the others however many jobs it may run at once.
+    Idle workers block on a condition variable rather than polling. Each job runs in a copy of the
+    submitter's context, so context variables such as the current trace span carry over.
+    """
+
+    def __init__(self, workers=4, max_queue_depth=100, name="job-scheduler"):
+        self.max_queue_depth = max_queue_depth
+        self._condition = threading.Condition()
+        self._pending = {}  # key -> deque of queued (context, func, args, kwargs)
+        self._ready = deque()  # keys with queued work and fewer running jobs than their limit
+        self._running = {}  # key -> number of its jobs currently on a worker
+        self._limits = {}  # key -> jobs it may run at once, for keys submitted with a limit above 1
+        self._depth = 0
+        self._stopped = False
+
+        self._workers = []
+        for index in range(workers):
+            worker = threading.Thread(target=self._work, name=f"{name}-{index}")
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, key, func, *args, **kwargs):
+        """Queue func(*args, **kwargs) behind any pending jobs for the same key."""
+        self.submit_limited(key, 1, func, *args, **kwargs)
+
+    def submit_limited(self, key, max_running, func, *args, **kwargs):
+        """
+        Queue func(*args, **kwargs) behind any pending jobs for the same key, allowing up to
+        `max_running` of the key's jobs to run at once.
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("JobScheduler has been shut down")
+            if self.max_queue_depth and self._depth >= self.max_queue_depth:
+                raise QueueFullError(self.max_queue_depth)
+
+            jobs = self._pending.setdefault(key, deque())
+            jobs.append((contextvars.copy_context(), func, args, kwargs))
+            self._depth += 1
+            if max_running > 1:
+                self._limits[key] = max_running
+            else:
+                self._limits.pop(key, None)
+            self._mark_ready(key)
+
+    def queue_depth(self, key=None):
+        """Number of queued (not yet running) jobs, overall or for one key."""
+        with self._condition:
+            if key is None:
+                return self._depth
+            return len(self._pending.get(key, ()))
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs; workers exit once the queued jobs have drained."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._ready and not self._stopped:
+                    self._condition.wait()
+                if not self._ready:
+                    return
+                key = self._ready.popleft()
+                context, func, args, kwargs = self._pending[key].popleft()
+                self._depth -= 1
+                self._running[key] = self._running.get(key, 0) + 1
+                # Back of the line if it may start another job, so other keys get a turn first
+                self._mark_ready(key)
+
+            try:
+                context.run(func, *args, **kwargs)
+            except Exception:
+                logger.exception(f"Job for key {key} failed")
+            finally:
+                with self._condition:
+                    self._running[key] -= 1
+                    if not self._running[key]:
+                        del self._running[key]
+                    self._mark_ready(key)
+                    if not self._pending[key] and key not in self._running:
+                        del self._pending[key]
+                        self._limits.pop(key, None)
+
+    def _mark_ready(self, key):
+        """Queue the key for a worker if it has pending jobs and room to run one; call with the lock held."""
+        if (self._pending.get(key) and self._running.get(key, 0) < self._limits.get(key, 1)
+                and key not in self._ready):
+            self._ready.append(key)
+            self._condition.notify()
@@ -0,0 +1,179 @@
+import math
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans fast cache hits through slow 405B planning calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Process-wide metrics registry rendered by the /metrics endpoint."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRegistry()
+        return _metrics
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+               for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name: str, help_text: str, label_names=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}  # label values tuple -> value
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        """(name suffix, labels, value) for every label combination seen so far."""
+        with self._lock:
+            return [("", dict(zip(self.label_names, key)), value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def value(self, **labels):
+        """(count, sum) of the observations for one label combination."""
+        with self._lock:
+            counts, total = self._values.get(self._key(labels), ([0] * len(self.buckets), 0.0))
+            return counts[-1], total
+
+    def samples(self):
+        with self._lock:
+            values = [(dict(zip(self.label_names, key)), list(counts), total)
+                      for key, (counts, total) in self._values.items()]
+        samples = []
+        for labels, counts, total in values:
+            for bound, count in zip(self.buckets, counts):
+                samples.append(("_bucket", dict(labels, le=_format_value(float(bound))), count))
+            samples.append(("_count", labels, counts[-1]))
+            samples.append(("_sum", labels, total))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms in the Prometheus text exposition format.
+
+    Metrics are created on first use and shared by name. Values that already live elsewhere
+    (cache stats, queue depths) are read at scrape time by collectors: callables returning
+    (name, type, help, [(labels, value), ...]) families.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, label_names=()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, label_names)
+
+    def gauge(self, name: str, help_text: str, label_names=()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, label_names)
+
+    def histogram(self, name: str, help_text: str, label_names=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, label_names, buckets=buckets)
+
+    def register_collector(self, name: str, collector):
+        """Add a scrape-time collector; registering the same name again replaces it."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        lines = []
+        for metric in metrics:
+            lines += self._family(metric.name, metric.type, metric.help,
+                                  [(metric.name + suffix, labels, value) for suffix, labels, value in metric.samples()])
+        for collector in collectors:
+            for name, metric_type, help_text, samples in collector():
+                lines += self._family(name, metric_type, help_text, [(name, labels, value) for labels, value in samples])
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _family(name, metric_type, help_text, samples):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        lines += [f"{sample_name}{_format_labels(labels)} {_format_value(value)}" for sample_name, labels, value in samples]
+        return lines
+
+    def _get_or_create(self, metric_class, name, help_text, label_names, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, help_text, label_names, **kwargs)
+            elif not isinstance(metric, metric_class) or metric.label_names != tuple(label_names):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
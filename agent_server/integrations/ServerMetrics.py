@@ -0,0 +1,78 @@
+from agent_server.agent.ParameterExtractor import get_parameter_extractor
+from agent_server.function.ToolResultCache import get_tool_result_cache
+from agent_server.integrations.BoundedBuffer import BoundedBuffer
+from agent_server.integrations.Metrics import get_metrics
+from agent_server.llms.HttpSessionPool import get_http_session_pool
+from agent_server.llms.ResponseCache import get_response_cache
+from agent_server.tts.AudioCache import get_audio_cache
+from agent_server.tts.OpenAITTS import get_synthesis_scheduler
+
+
+def register_server_metrics(stream_manager, user_sessions, job_scheduler, metrics=None):
+    """
+    Register the scrape-time collectors for an orchestrator server: sessions, open text streams,
+    per-session buffer depths, job queues and the shared LLM/TTS caches.
+    """
+    metrics = metrics if metrics is not None else get_metrics()
+
+    def collect_sessions():
+        text_streams = list(stream_manager.text_streams.items())
+        tts_instances = list(stream_manager.tts_instances.items())
+
+        items, buffered_bytes = [], []
+        for session_id, text_stream in text_streams:
+            stats = text_stream.stats()
+            labels = {"session_id": session_id, "stream": "text"}
+            items.append((labels, sum(subscriber["items"] for subscriber in stats["subscribers"])))
+            buffered_bytes.append((labels, stats["bytes"]))
+        for session_id, tts_instance in tts_instances:
+            audio_buffer = tts_instance.get_audio_buffer()
+            if isinstance(audio_buffer, BoundedBuffer):
+                stats = audio_buffer.stats()
+                labels = {"session_id": session_id, "stream": "audio"}
+                items.append((labels, stats["items"]))
+                buffered_bytes.append((labels, stats["bytes"]))
+
+        return [
+            ("agent_active_sessions", "gauge", "Sessions started and not yet ended", [({}, len(user_sessions))]),
+            ("agent_open_text_streams", "gauge", "Connected SSE text stream listeners",
+             [({}, sum(text_stream.subscriber_count() for _, text_stream in text_streams))]),
+            ("stream_buffer_items", "gauge", "Items queued per session stream", items),
+            ("stream_buffer_bytes", "gauge", "Bytes buffered per session stream", buffered_bytes),
+            ("job_queue_depth", "gauge", "Jobs waiting for a worker",
+             [({"scheduler": "agent"}, job_scheduler.queue_depth()),
+              ({"scheduler": "tts"}, get_synthesis_scheduler().queue_depth())]),
+        ]
+
+    def collect_caches():
+        pool = get_http_session_pool().stats()
+        responses = get_response_cache().stats()
+        audio = get_audio_cache().stats()
+        extractor = get_parameter_extractor().stats()
+        tools = get_tool_result_cache().stats()
+        return [
+            ("llm_http_requests_total", "counter", "LLM HTTP requests by host and whether a pooled connection was reused",
+             [({"host": host, "connection": result}, stats[key])
+              for host, stats in pool["hosts"].items() for result, key in (("reused", "hits"), ("new", "misses"))]),
+            ("llm_response_cache_lookups_total", "counter", "LLM response cache lookups by result",
+             [({"result": "memory_hit"}, responses["memory_hits"]), ({"result": "disk_hit"}, responses["disk_hits"]),
+              ({"result": "miss"}, responses["misses"])]),
+            ("llm_response_cache_entries", "gauge", "LLM responses held in memory", [({}, responses["entries"])]),
+            ("tts_audio_cache_lookups_total", "counter", "Synthesized audio cache lookups by result",
+             [({"result": "memory_hit"}, audio["hits"]), ({"result": "disk_hit"}, audio["disk_hits"]),
+              ({"result": "miss"}, audio["misses"])]),
+            ("tts_audio_cache_bytes", "gauge", "Synthesized audio held in memory", [({}, audio["bytes"])]),
+            ("tool_cache_lookups_total", "counter", "Read-only tool result cache lookups by result",
+             [({"result": "hit"}, tools["hits"]), ({"result": "miss"}, tools["misses"])]),
+            ("tool_cache_invalidations_total", "counter", "Cached tool results dropped by mutating tools",
+             [({}, tools["invalidations"])]),
+            ("tool_cache_entries", "gauge", "Tool results held in the cache", [({}, tools["entries"])]),
+            ("parameter_extractor_requests_total", "counter",
+             "Function calls filled without the LLM (hit) or passed on to it (miss), by function",
+             [({"function": name, "result": result}, counts[key])
+              for name, counts in extractor["functions"].items() for result, key in (("hit", "hits"), ("miss", "misses"))]),
+        ]
+
+    metrics.register_collector("sessions", collect_sessions)
+    metrics.register_collector("caches", collect_caches)
+    return metrics
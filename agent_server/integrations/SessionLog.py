@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLog:
+    """
+    Append-only JSON-lines log sitting next to a JSON snapshot file.
+
+    Every record gets a monotonically increasing `seq`. A snapshot stores the last `seq` it
+    includes, so replay can skip records that were already compacted even if the process died
+    between writing the snapshot and truncating the log. A torn final line (crash mid-write)
+    is ignored on replay.
+    """
+
+    def __init__(self, snapshot_path, compact_every=500, fsync=False):
+        self.snapshot_path = snapshot_path
+        self.log_path = snapshot_path + '.log'
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.last_seq = 0
+        self.records_since_snapshot = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def read_snapshot(self):
+        """Return the snapshot dict, or None if there is no snapshot yet."""
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path, 'r') as file:
+            snapshot = json.load(file)
+        self.last_seq = max(self.last_seq, snapshot.get("log_seq", 0))
+        return snapshot
+
+    def replay(self, after_seq=0):
+        """Yield logged records with seq greater than after_seq, in order."""
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, 'r') as file:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring torn record at {self.log_path}:{line_number}")
+                    continue
+                self.last_seq = max(self.last_seq, record.get("seq", 0))
+                if record.get("seq", 0) > after_seq:
+                    self.records_since_snapshot += 1
+                    yield record
+
+    def append(self, record: dict):
+        """Append one record; returns True when the log is due for compaction."""
+        with self._lock:
+            self.last_seq += 1
+            record = dict(record, seq=self.last_seq)
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+                self._file = open(self.log_path, 'a')
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.records_since_snapshot += 1
+            return bool(self.compact_every) and self.records_since_snapshot >= self.compact_every
+
+    def write_snapshot(self, data: dict):
+        """Atomically replace the snapshot with data, then truncate the log it supersedes."""
+        with self._lock:
+            snapshot = dict(data, log_seq=self.last_seq)
+            os.makedirs(os.path.dirname(self.snapshot_path) or '.', exist_ok=True)
+            temp_path = self.snapshot_path + '.tmp'
+            with open(temp_path, 'w') as file:
+                json.dump(snapshot, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.snapshot_path)
+
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            open(self.log_path, 'w').close()
+            self.records_since_snapshot = 0
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+
+class SessionStore(ABC):
+    """
+    Persistence backend for ChatHandler.
+
+    A user has two message lists: the session history (dicts with role, message and timestamp)
+    and the conversation memory (dicts with role, content and timestamp).
+    """
+
+    @abstractmethod
+    def user_exists(self, username: str) -> bool:
+        pass
+
+    @abstractmethod
+    def create_user(self, username: str):
+        pass
+
+    @abstractmethod
+    def load_user(self, username: str) -> Optional[Tuple[List[dict], List[dict]]]:
+        """Return (history, memory) for the user, or None if the user is unknown."""
+        pass
+
+    @abstractmethod
+    def append_history(self, username: str, role: str, message: str, timestamp: str):
+        pass
+
+    @abstractmethod
+    def append_memory(self, username: str, role: str, content: str, timestamp: str):
+        pass
+
+    def close(self):
+        pass
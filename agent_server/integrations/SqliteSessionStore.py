@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import threading
+
+from agent_server.integrations.SessionStore import SessionStore
+
+HISTORY = "history"
+MEMORY = "memory"
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    SQLite-backed session store. Messages are indexed by (username, timestamp), so loading
+    one user reads only that user's rows and appends are a single insert.
+    """
+
+    def __init__(self, db_path, legacy_sessions_file=None):
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        is_new = not os.path.exists(db_path)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                timestamp TEXT
+            );
+            CREATE INDEX IF NOT EXISTS messages_by_user_time ON messages (username, timestamp);
+        """)
+
+        if is_new and legacy_sessions_file and os.path.exists(legacy_sessions_file):
+            self._import_legacy_sessions(legacy_sessions_file)
+
+    def user_exists(self, username):
+        with self._lock:
+            row = self._connection.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone()
+        return row is not None
+
+    def create_user(self, username):
+        with self._lock:
+            self._connection.execute("INSERT OR IGNORE INTO users (username) VALUES (?)", (username,))
+
+    def load_user(self, username):
+        with self._lock:
+            if self._connection.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is None:
+                return None
+            rows = self._connection.execute(
+                "SELECT kind, role, content, timestamp FROM messages WHERE username = ? ORDER BY id", (username,)
+            ).fetchall()
+
+        history, memory = [], []
+        for kind, role, content, timestamp in rows:
+            if kind == HISTORY:
+                history.append({"role": role, "message": content, "timestamp": timestamp})
+            else:
+                memory.append({"role": role, "content": content, "timestamp": timestamp})
+        return history, memory
+
+    def append_history(self, username, role, message, timestamp):
+        self._insert(username, HISTORY, role, message, timestamp)
+
+    def append_memory(self, username, role, content, timestamp):
+        self._insert(username, MEMORY, role, content, timestamp)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _insert(self, username, kind, role, content, timestamp):
+        with self._lock:
+            self._connection.execute("INSERT OR IGNORE INTO users (username) VALUES (?)", (username,))
+            self._connection.execute(
+                "INSERT INTO messages (username, kind, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (username, kind, role, content, timestamp)
+            )
+
+    def _import_legacy_sessions(self, legacy_sessions_file):
+        """One-time import of an existing sessions.json (and its log) into a fresh database."""
+        from agent_server.integrations.FileSessionStore import FileSessionStore
+
+        legacy_store = FileSessionStore(legacy_sessions_file)
+        with self._lock:
+            self._connection.execute("BEGIN")
+            for username, history, memory in legacy_store.users():
+                self._connection.execute("INSERT OR IGNORE INTO users (username) VALUES (?)", (username,))
+                self._connection.executemany(
+                    "INSERT INTO messages (username, kind, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                    [(username, HISTORY, entry["role"], entry["message"], entry.get("timestamp")) for entry in history] +
+                    [(username, MEMORY, entry["role"], entry["content"], entry.get("timestamp")) for entry in memory]
+                )
+            self._connection.execute("COMMIT")
+        print(f"Imported sessions from {legacy_sessions_file} into {self.db_path}.")
@@ -1,42 +1,97 @@
-import queue
+import os
 
+from agent_server.integrations.BoundedBuffer import BoundedBuffer, OverflowPolicy, can_coalesce_text
+from agent_server.integrations.EventStream import EventStream
 from agent_server.tts.OpenAITTS import OpenAITTS
 
 
 class StreamManager:
     FUNCTION = "[!FUNCTION!]"
 
-    def __init__(self):
-        self.text_buffers = {}  # Dictionary to hold queues for messages by session_id
+    def __init__(self, text_max_items=1000, text_max_bytes=1024 * 1024, text_policy=OverflowPolicy.COALESCE,
+                 audio_max_items=64, audio_max_bytes=16 * 1024 * 1024, audio_policy=OverflowPolicy.BLOCK,
+                 block_timeout=5.0, replay_capacity=512):
+        # Per-session capacity limits, so a client that stops reading can't grow its buffers forever
+        self.text_limits = {"max_items": text_max_items, "max_bytes": text_max_bytes, "policy": text_policy,
+                            "block_timeout": block_timeout}
+        self.audio_limits = {"max_items": audio_max_items, "max_bytes": audio_max_bytes, "policy": audio_policy,
+                             "block_timeout": block_timeout}
+        self.replay_capacity = replay_capacity
+        self.text_streams = {}  # Dictionary to hold EventStreams for messages by session_id
         self.tts_instances = {}  # Dictionary to hold OpenAITTS instances by session_id
         self.stream_threads = {}  # Dictionary to hold streaming threads by session_id
         self.stop_events = {}  # Dictionary to hold stop events for each thread
 
+    @classmethod
+    def from_env(cls):
+        """Build a StreamManager with buffer limits taken from the environment."""
+        return cls(
+            text_max_items=int(os.getenv('TEXT_BUFFER_MAX_ITEMS', '1000')),
+            text_max_bytes=int(os.getenv('TEXT_BUFFER_MAX_BYTES', str(1024 * 1024))),
+            text_policy=OverflowPolicy(os.getenv('TEXT_OVERFLOW_POLICY', 'coalesce')),
+            audio_max_items=int(os.getenv('AUDIO_BUFFER_MAX_ITEMS', '64')),
+            audio_max_bytes=int(os.getenv('AUDIO_BUFFER_MAX_BYTES', str(16 * 1024 * 1024))),
+            audio_policy=OverflowPolicy(os.getenv('AUDIO_OVERFLOW_POLICY', 'block')),
+            block_timeout=float(os.getenv('STREAM_BLOCK_TIMEOUT', '5')),
+            replay_capacity=int(os.getenv('TEXT_REPLAY_CAPACITY', '512')),
+        )
+
     def add_to_text_buffer(self, session_id, data_chunk):
-        """Add a data chunk to the queue for a specific session."""
-        if session_id in self.text_buffers:
-            self.text_buffers[session_id].put(data_chunk)
+        """Publish a data chunk to every listener of a specific session."""
+        text_stream = self.text_streams.get(session_id)
+        if text_stream is not None:
+            text_stream.publish(data_chunk)
         if session_id in self.tts_instances:
             self.get_tts_instance(session_id).add_text_to_queue(data_chunk)
 
     def get_tts_instance(self, session_id):
         """Retrieve or create an OpenAITTS instance for the session."""
         if session_id not in self.tts_instances:
-            self.tts_instances[session_id] = OpenAITTS()
+            self.tts_instances[session_id] = OpenAITTS(audio_buffer=BoundedBuffer(**self.audio_limits))
         return self.tts_instances[session_id]
 
+    def listen_to_text_stream(self, session_id, last_event_id=None):
+        """
+        Subscribe to the session's text stream, creating it if necessary. Returns a buffer of
+        StreamEvents; with last_event_id, retained events after that id are replayed first.
+        """
+        text_stream = self.text_streams.setdefault(
+            session_id, EventStream(self.replay_capacity, self.text_limits, self._can_coalesce_text)
+        )
+        return text_stream.subscribe(last_event_id)
+
+    def stop_listening_to_text_stream(self, session_id, subscriber):
+        """Drop one subscriber; returns how many listeners the session still has."""
+        text_stream = self.text_streams.get(session_id)
+        return text_stream.unsubscribe(subscriber) if text_stream is not None else 0
 
-    def listen_to_text_stream(self, session_id):
-        """Retrieve the queue for the given session, creating it if necessary."""
-        if session_id not in self.text_buffers:
-            self.text_buffers[session_id] = queue.Queue()  # Initialize a new queue if it doesn't exist
-        return self.text_buffers[session_id]
+    def text_listener_count(self, session_id):
+        text_stream = self.text_streams.get(session_id)
+        return text_stream.subscriber_count() if text_stream is not None else 0
+
+    @staticmethod
+    def _can_coalesce_text(newest, item):
+        # Function messages are parsed by the client as a unit, so never merge them
+        return (can_coalesce_text(newest, item)
+                and not newest.startswith(StreamManager.FUNCTION) and not item.startswith(StreamManager.FUNCTION))
 
     def listen_to_audio_stream(self, session_id):
         """Return the audio buffer of the OpenAITTS instance for a given session."""
         tts_instance = self.get_tts_instance(session_id)
         return tts_instance.get_audio_buffer()
 
+    def get_memory_usage(self, session_id):
+        """Per-session accounting of what is buffered on the text and audio streams."""
+        text_stream = self.text_streams.get(session_id)
+        tts_instance = self.tts_instances.get(session_id)
+        audio_buffer = tts_instance.get_audio_buffer() if tts_instance else None
+        usage = {
+            "text": text_stream.stats() if text_stream else None,
+            "audio": audio_buffer.stats() if isinstance(audio_buffer, BoundedBuffer) else None,
+        }
+        usage["total_bytes"] = sum(stats["bytes"] for stats in usage.values() if stats)
+        return usage
+
     def unregister_listener(self, session_id, listener, audio=False):
         """Unregister a listener from a specific session's text or audio stream."""
         listeners = self.audio_listeners if audio else self.stream_listeners
@@ -60,8 +115,10 @@ class StreamManager:
 
     def cleanup_resources(self, session_id):
         """Clean up resources like queues and TTS instances if no listeners remain."""
+        # Listeners are woken with a None sentinel before the buffers are dropped
         if session_id in self.tts_instances:
-           self.tts_instances[session_id].stop()  # Stop the OpenAITTS instance
+           self.tts_instances[session_id].stop()  # Stop the OpenAITTS instance first, so the sentinel is last
+           self.tts_instances[session_id].get_audio_buffer().put(None)
            del self.tts_instances[session_id]
-        if session_id in self.text_buffers:
-           del self.text_buffers[session_id]  # Remove the text queue
+        if session_id in self.text_streams:
+           self.text_streams.pop(session_id).close()  # Wake and drop every text listener
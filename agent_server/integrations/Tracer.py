@@ -0,0 +1,165 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """Process-wide tracer; spans always go to the ring buffer and, if TRACE_FILE is set, to that file."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            exporters = [RingBufferExporter(int(os.getenv('TRACE_RING_SIZE', '2048')))]
+            if os.getenv('TRACE_FILE'):
+                exporters.append(FileSpanExporter(os.getenv('TRACE_FILE')))
+            _tracer = Tracer(exporters, enabled=os.getenv('TRACING_ENABLED', 'true').lower() == 'true')
+        return _tracer
+
+
+def text_size(prefix: str, text) -> dict:
+    """Size attributes for a prompt or response: characters, UTF-8 bytes and an estimated token count."""
+    text = text if isinstance(text, str) else json.dumps(text, default=str)
+    size = len(text.encode('utf-8'))
+    # Roughly four bytes of English text per token for the Llama and GPT tokenizers
+    return {f"{prefix}_chars": len(text), f"{prefix}_bytes": size, f"{prefix}_tokens": (size + 3) // 4}
+
+
+class Span:
+    """One timed operation within a trace. Attributes are plain JSON values."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: str = None, attributes: dict = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self.error = None
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict):
+        self.attributes.update(attributes)
+
+    def end(self):
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+
+class RingBufferExporter:
+    """Keeps the most recent finished spans in memory for inspection from inside the process."""
+
+    def __init__(self, max_spans=2048):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span.to_dict())
+
+    def spans(self, trace_id: str = None) -> list:
+        with self._lock:
+            return [span for span in self._spans if trace_id is None or span["trace_id"] == trace_id]
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class FileSpanExporter:
+    """Appends finished spans to a JSON Lines file, one span per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            with open(self.path, 'a') as file:
+                file.write(line)
+
+
+class Tracer:
+    """
+    Opens nested spans. The current span lives in a context variable, so spans opened further down
+    the call stack (or in jobs scheduled from it, see JobScheduler) become its children; a span opened
+    with no current span starts a new trace.
+    """
+
+    def __init__(self, exporters=(), enabled=True):
+        self.exporters = list(exporters)
+        self.enabled = enabled
+
+    @property
+    def ring_buffer(self):
+        return next((e for e in self.exporters if isinstance(e, RingBufferExporter)), None)
+
+    @staticmethod
+    def current_span():
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            yield _NoopSpan()
+            return
+
+        parent = _current_span.get()
+        span = Span(name, parent.trace_id if parent else uuid.uuid4().hex, parent.span_id if parent else None,
+                    attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self._export(span)
+
+    def _export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                logger.exception(f"Failed to export span {span.name}")
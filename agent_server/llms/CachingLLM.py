@@ -0,0 +1,89 @@
+import copy
+import json
+
+from agent_server.llms.LLMInterface import LLMInterface
+from agent_server.llms.MeteredLLM import MeteredLLM
+from agent_server.llms.ResponseCache import get_response_cache
+
+
+def model_identity(llm) -> str:
+    """
+    Identifies the model behind a client, and its sampling temperature where the client sets one, so
+    different models or settings never share cache entries.
+    """
+    if isinstance(llm, MeteredLLM):
+        llm = llm.llm
+    model = getattr(llm, 'model', None) or getattr(llm, 'model_name', None) or getattr(llm, 'base_url', '')
+    temperature = getattr(llm, 'temperature', None)
+    if temperature is None:
+        return f"{type(llm).__name__}:{model}"
+    return f"{type(llm).__name__}:{model}:temperature={temperature}"
+
+
+def with_temperature(llm, temperature):
+    """A copy of the client sampling at `temperature`, or the client itself if it has no such setting."""
+    if isinstance(llm, MeteredLLM):
+        inner = with_temperature(llm.llm, temperature)
+        if inner is llm.llm:
+            return llm
+        metered = copy.copy(llm)
+        metered.llm = inner
+        return metered
+    if getattr(llm, 'temperature', None) in (None, temperature):
+        return llm
+    pinned = copy.copy(llm)
+    pinned.temperature = temperature
+    return pinned
+
+
+def is_json(response: str) -> bool:
+    try:
+        json.loads(response)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+class CachingLLM(LLMInterface):
+    """
+    Serves generate_response from the response cache for repeated (model, system message, prompt)
+    triples, so a cached call never touches the network. Streaming passes straight through.
+
+    Call sites opt in by wrapping their client. `cache_if` keeps responses the caller can't use
+    (e.g. invalid JSON) out of the cache. Cached calls are made at `temperature` (0 by default), so a
+    replayed answer is one the model would give again; streams keep the client's own setting.
+    """
+
+    def __init__(self, llm: LLMInterface, cache=None, ttl_seconds=None, cache_if=None, temperature=0):
+        self.llm = llm
+        self.cached_llm = with_temperature(llm, temperature)
+        self.cache = cache if cache is not None else get_response_cache()
+        self.ttl_seconds = ttl_seconds
+        self.cache_if = cache_if
+        self.model_id = model_identity(self.cached_llm)
+
+    def generate_response(self, prompt, system_message):
+        cached = self.cache.get(self.model_id, system_message, prompt)
+        if cached is not None:
+            return cached
+        response = self.cached_llm.generate_response(prompt, system_message)
+        self._store(prompt, system_message, response)
+        return response
+
+    async def agenerate_response(self, prompt, system_message):
+        cached = self.cache.get(self.model_id, system_message, prompt)
+        if cached is not None:
+            return cached
+        response = await self.cached_llm.agenerate_response(prompt, system_message)
+        self._store(prompt, system_message, response)
+        return response
+
+    def stream_response(self, prompt, system_message):
+        return self.llm.stream_response(prompt, system_message)
+
+    def astream_response(self, prompt, system_message):
+        return self.llm.astream_response(prompt, system_message)
+
+    def _store(self, prompt, system_message, response):
+        if isinstance(response, str) and (self.cache_if is None or self.cache_if(response)):
+            self.cache.put(self.model_id, system_message, prompt, response, self.ttl_seconds)
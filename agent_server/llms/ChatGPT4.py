@@ -1,16 +1,17 @@
 import os
 import time
-import requests
 import json
 
+from agent_server.llms.HttpSessionPool import get_http_session_pool
 from agent_server.llms.LLMInterface import LLMInterface
 
 
 class ChatGPT4(LLMInterface):
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, api_url=None):
         # Use the provided API key and URL if given, otherwise check environment variables
         self.api_key = api_key or os.environ.get("API_KEY")
-        self.api_url = 'https://api.openai.com/v1/chat/completions'
+        self.api_url = api_url or 'https://api.openai.com/v1/chat/completions'
+        self.http = get_http_session_pool()
 
         # Ensure the API key and URL are available
         if not self.api_key or not self.api_url:
@@ -29,7 +30,7 @@ class ChatGPT4(LLMInterface):
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        response = requests.post(self.api_url, headers=headers, json=data)
+        response = self.http.post(self.api_url, headers=headers, json=data)
         if response.status_code != 200:
             raise Exception(f"Failed to get valid response: {response.status_code} {response.text}")
         return response.json()['choices'][0]['message']['content']
@@ -47,7 +48,7 @@ class ChatGPT4(LLMInterface):
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        response = requests.post(self.api_url, headers=headers, json=data, stream=True)
+        response = self.http.post(self.api_url, headers=headers, json=data, stream=True)
         if response.status_code != 200:
             raise Exception(f"Failed to get valid response: {response.status_code} {response.text}")
 
@@ -1,39 +1,27 @@
 import json
 
-import requests
-
 from agent_server.llms.EncryptedKeyStore import EncryptedKeyStore
+from agent_server.llms.HttpSessionPool import get_http_session_pool
 from agent_server.llms.LLMInterface import LLMInterface
 
 
 class FireworksAiRestLLM(LLMInterface):
-    def __init__(self, api_token, model="accounts/fireworks/models/llama-v3p1-8b-instruct"):
+    def __init__(self, api_token, model="accounts/fireworks/models/llama-v3p1-8b-instruct",
+                 url="https://api.fireworks.ai/inference/v1/chat/completions", temperature=0.7):
         self.api_token = api_token
         self.model = model
-        self.url = "https://api.fireworks.ai/inference/v1/chat/completions"
+        self.url = url
+        self.temperature = temperature
         self.headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json"
         }
+        self.http = get_http_session_pool()
 
     def generate_response(self, prompt, system_message):
 #        print('SYSTEM_MESSAGE:::\n' +  system_message)
 #        print('PROMPT_MESSAGE:::\n' +  prompt)
-        payload = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": 500,
-            "temperature": 0.7,
-            "top_p": 0.9,
-            "frequency_penalty": 0,
-            "presence_penalty": 0,
-            "stream": False
-        }
-
-        response = requests.post(self.url, json=payload, headers=self.headers)
+        response = self.http.post(self.url, json=self._payload(prompt, system_message, False), headers=self.headers)
         if response.status_code == 200:
             data = response.json()
             res = data["choices"][0]["message"]["content"]
@@ -42,39 +30,65 @@ class FireworksAiRestLLM(LLMInterface):
         else:
             raise Exception(f"Request failed: {response.status_code}, {response.text}")
 
-
     def stream_response(self, prompt, system_message):
-        payload = {
+        payload = self._payload(prompt, system_message, True)
+        with self.http.post(self.url, json=payload, headers=self.headers, stream=True) as response:
+            if response.status_code == 200:
+                for line in response.iter_lines():
+                    if line:
+                        content = self._parse_stream_line(line.decode("utf-8"))
+                        if content:
+                            yield content
+                        if content == self.END_STREAM:
+                            break
+            else:
+                raise Exception(f"Request failed: {response.status_code}, {response.text}")
+
+    async def agenerate_response(self, prompt, system_message):
+        payload = self._payload(prompt, system_message, False)
+        response = await self.http.async_client().post(self.url, json=payload, headers=self.headers)
+        if response.status_code == 200:
+            return response.json()["choices"][0]["message"]["content"]
+        raise Exception(f"Request failed: {response.status_code}, {response.text}")
+
+    async def astream_response(self, prompt, system_message):
+        payload = self._payload(prompt, system_message, True)
+        async with self.http.async_client().stream("POST", self.url, json=payload, headers=self.headers) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Request failed: {response.status_code}, {response.text}")
+            async for line in response.aiter_lines():
+                if line:
+                    content = self._parse_stream_line(line)
+                    if content:
+                        yield content
+                    if content == self.END_STREAM:
+                        break
+
+    def _payload(self, prompt, system_message, stream):
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": system_message},
                 {"role": "user", "content": prompt}
             ],
             "max_tokens": 500,
-            "temperature": 0.7,
+            "temperature": self.temperature,
             "top_p": 0.9,
             "frequency_penalty": 0,
             "presence_penalty": 0,
-            "stream": True
+            "stream": stream
         }
 
-        with requests.post(self.url, json=payload, headers=self.headers, stream=True) as response:
-            if response.status_code == 200:
-                for line in response.iter_lines():
-                    if line:
-                        data = line.decode("utf-8")
-                        if data == "data: [DONE]":
-                            yield self.END_STREAM
-                            break
-                        else:
-                            # Parse JSON and yield only the content
-                            json_data = json.loads(data[6:])  # Strip off "data: "
-                            if "choices" in json_data and "delta" in json_data["choices"][0]:
-                                content = json_data["choices"][0]["delta"].get("content")
-                                if content:
-                                    yield content
-            else:
-                raise Exception(f"Request failed: {response.status_code}, {response.text}")
+    def _parse_stream_line(self, data):
+        """Content of one SSE line, END_STREAM on [DONE], or None for lines without content."""
+        if data == "data: [DONE]":
+            return self.END_STREAM
+        # Parse JSON and yield only the content
+        json_data = json.loads(data[6:])  # Strip off "data: "
+        if "choices" in json_data and "delta" in json_data["choices"][0]:
+            return json_data["choices"][0]["delta"].get("content")
+        return None
 
 import sys
 
@@ -5,6 +5,7 @@ from typing import Dict
 from agent_server.llms.EncryptedKeyStore import EncryptedKeyStore
 from agent_server.llms.FireworksAiRestLLM import FireworksAiRestLLM
 from agent_server.llms.LLMInterface import LLMInterface
+from agent_server.llms.MeteredLLM import MeteredLLM
 from agent_server.llms.ChatGPT4 import ChatGPT4
 from agent_server.llms.OllamaRestLLM import OllamaLLM
 from agent_server.llms.OptiLLM import OptiLLM
@@ -30,7 +31,16 @@ class LLMFactory:
 
     @staticmethod
     def create_llm(model_type: ModelType) -> LLMInterface:
-        """Always create a new instance of the LLM."""
+        """Always create a new instance of the LLM, metered under its ModelType name."""
+        return MeteredLLM(LLMFactory.create_client(model_type), model_type.name)
+
+    @staticmethod
+    def create_client(model_type: ModelType) -> LLMInterface:
+        """The bare client for a model type."""
+        mock_url = LLMFactory.mock_url_for(model_type)
+        if mock_url:
+            return LLMFactory.create_mock_llm(model_type, mock_url)
+
         key_store = EncryptedKeyStore('keys.json.enc')
         if model_type == ModelType.CHATGPT4:
             api_key = key_store.get_api_key("CHATGPT4_API_KEY")
@@ -83,6 +93,31 @@ class LLMFactory:
         else:
             raise ValueError(f"Unsupported model type: {model_type}")
 
+    @staticmethod
+    def mock_url_for(model_type: ModelType):
+        """
+        The mock LLM server URL if this model is redirected to it: LLM_MOCK_URL redirects every model,
+        unless LLM_MOCK_MODELS lists the ModelType names to redirect.
+        """
+        mock_url = os.getenv('LLM_MOCK_URL')
+        if not mock_url:
+            return None
+        mocked_models = {name.strip().upper() for name in os.getenv('LLM_MOCK_MODELS', '').split(',') if name.strip()}
+        if mocked_models and model_type.name not in mocked_models:
+            return None
+        return mock_url.rstrip('/')
+
+    @staticmethod
+    def create_mock_llm(model_type: ModelType, mock_url: str) -> LLMInterface:
+        """The same client the real model uses, pointed at the mock LLM server; no API keys needed."""
+        if model_type == ModelType.CHATGPT4:
+            return ChatGPT4(api_key="mock", api_url=f"{mock_url}/v1/chat/completions")
+        elif model_type == ModelType.OLLAMA_QWEN:
+            return OllamaLLM(base_url=mock_url, model_name="qwen2.5:3b")
+        elif model_type in (ModelType.OPTILLM, ModelType.OPTILLM_LLAMA3p18B):
+            return OptiLLM(model_type.name, url=f"{mock_url}/v1/")
+        return FireworksAiRestLLM(api_token="mock", model=model_type.name, url=f"{mock_url}/v1/chat/completions")
+
     @staticmethod
     def get_singleton(model_type: ModelType) -> LLMInterface:
         """Get or create the singleton for the specified model type."""
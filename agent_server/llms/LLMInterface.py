@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 class LLMInterface(ABC):
@@ -9,4 +10,15 @@ class LLMInterface(ABC):
         pass
 
     def stream_response(self, prompt, system_message):
-        pass
\ No newline at end of file
+        pass
+
+    async def agenerate_response(self, prompt, system_message):
+        """Async generate; clients without a native implementation run the blocking call in a thread."""
+        return await asyncio.to_thread(self.generate_response, prompt, system_message)
+
+    async def astream_response(self, prompt, system_message):
+        """Async stream; clients without a native implementation pull each chunk in a thread."""
+        chunks = iter(await asyncio.to_thread(self.stream_response, prompt, system_message))
+        end = object()
+        while (chunk := await asyncio.to_thread(next, chunks, end)) is not end:
+            yield chunk
@@ -0,0 +1,85 @@
+import time
+
+from agent_server.integrations.Metrics import get_metrics
+from agent_server.llms.LLMInterface import LLMInterface
+
+
+class MeteredLLM(LLMInterface):
+    """
+    Counts calls and records latency per model for the /metrics endpoint. LLMFactory wraps every
+    client it creates; attributes other than the LLMInterface methods pass through to the client.
+    """
+
+    def __init__(self, llm: LLMInterface, model: str, metrics=None):
+        self.llm = llm
+        self.model_type = model
+        metrics = metrics if metrics is not None else get_metrics()
+        self.calls = metrics.counter("llm_calls_total", "LLM calls by model, method and outcome",
+                                     ("model", "method", "outcome"))
+        self.latency = metrics.histogram("llm_call_duration_seconds", "LLM call latency, to the last chunk for streams",
+                                         ("model", "method"))
+        self.first_chunk = metrics.histogram("llm_time_to_first_chunk_seconds", "Time to the first streamed chunk",
+                                             ("model", "method"))
+
+    def __getattr__(self, name):
+        if name == 'llm':
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    def generate_response(self, prompt, system_message):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = self.llm.generate_response(prompt, system_message)
+            outcome = "ok"
+            return response
+        finally:
+            self._record("generate", outcome, started)
+
+    async def agenerate_response(self, prompt, system_message):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self.llm.agenerate_response(prompt, system_message)
+            outcome = "ok"
+            return response
+        finally:
+            self._record("agenerate", outcome, started)
+
+    def stream_response(self, prompt, system_message):
+        started = time.perf_counter()
+        outcome = "error"
+        first = True
+        try:
+            for chunk in self.llm.stream_response(prompt, system_message):
+                if first:
+                    self.first_chunk.observe(time.perf_counter() - started, model=self.model_type, method="stream")
+                    first = False
+                yield chunk
+            outcome = "ok"
+        except GeneratorExit:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._record("stream", outcome, started)
+
+    async def astream_response(self, prompt, system_message):
+        started = time.perf_counter()
+        outcome = "error"
+        first = True
+        try:
+            async for chunk in self.llm.astream_response(prompt, system_message):
+                if first:
+                    self.first_chunk.observe(time.perf_counter() - started, model=self.model_type, method="astream")
+                    first = False
+                yield chunk
+            outcome = "ok"
+        except GeneratorExit:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._record("astream", outcome, started)
+
+    def _record(self, method, outcome, started):
+        self.calls.inc(model=self.model_type, method=method, outcome=outcome)
+        self.latency.observe(time.perf_counter() - started, model=self.model_type, method=method)
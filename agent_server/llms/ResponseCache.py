@@ -0,0 +1,127 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide LLM response cache shared by every CachingLLM."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', '1024')),
+                                            ttl_seconds=float(os.getenv('LLM_CACHE_TTL_SECONDS', '86400')),
+                                            db_path=os.getenv('LLM_CACHE_DB') or None)
+        return _response_cache
+
+
+class ResponseCache:
+    """
+    Cache of LLM completions keyed by (model, system message, prompt).
+
+    Entries live in an in-memory LRU and, if `db_path` is set, in a SQLite table so they survive
+    restarts. Every entry expires `ttl_seconds` after it was written unless a TTL is given per put.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=86400.0, db_path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (response, expires_at)
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+        self._connection = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def key(model: str, system_message: str, prompt: str) -> str:
+        identity = "\0".join((model, system_message or "", prompt or ""))
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def get(self, model: str, system_message: str, prompt: str):
+        """Return the cached response, or None if absent or expired."""
+        key = self.key(model, system_message, prompt)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self._memory_hits += 1
+                    return entry[0]
+                del self._entries[key]
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT response, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    self._store(key, row[0], row[1])
+                    self._disk_hits += 1
+                    return row[0]
+
+            self._misses += 1
+            return None
+
+    def put(self, model: str, system_message: str, prompt: str, response: str, ttl_seconds=None):
+        key = self.key(model, system_message, prompt)
+        expires_at = time.time() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._store(key, response, expires_at)
+            if self._connection is not None:
+                self._connection.execute("INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                                         (key, response, expires_at))
+
+    def invalidate(self, model: str, system_message: str, prompt: str):
+        key = self.key(model, system_message, prompt)
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def purge_expired(self):
+        """Drop expired rows from the disk tier; memory entries are dropped lazily on lookup."""
+        if self._connection is not None:
+            with self._lock:
+                self._connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+
+    def stats(self):
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+
+    def _store(self, key, response, expires_at):
+        self._entries.pop(key, None)
+        self._entries[key] = (response, expires_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
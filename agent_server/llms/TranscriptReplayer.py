@@ -0,0 +1,60 @@
+import json
+import threading
+
+DEFAULT_RESPONSE = "This is a mock response."
+
+
+class TranscriptReplayer:
+    """
+    Scripted LLM responses replayed from a recorded JSONL transcript.
+
+    A record's response text is its first "response", "completion", "content" or "body" field.
+    Records with a "prompt" (and optionally "system_message") answer exactly that request; records
+    with a "match" answer any request whose prompt or system message contains that text, first
+    match wins. Every other request gets the remaining records in order, wrapping around, so a run
+    is reproducible.
+    """
+
+    RESPONSE_FIELDS = ("response", "completion", "content", "body")
+
+    def __init__(self, records=(), default_response=DEFAULT_RESPONSE):
+        self.default_response = default_response
+        self._by_request = {}
+        self._rules = []  # (substring, response)
+        self._sequence = []
+        self._next = 0
+        self._lock = threading.Lock()
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, 'r') as file:
+            return cls((json.loads(line) for line in file if line.strip()), **kwargs)
+
+    def add(self, record: dict):
+        response = next((record[field] for field in self.RESPONSE_FIELDS if field in record), None)
+        if response is None:
+            return
+        if not isinstance(response, str):
+            response = json.dumps(response)
+        if "prompt" in record:
+            self._by_request[(record.get("system_message"), record["prompt"])] = response
+        elif "match" in record:
+            self._rules.append((record["match"], response))
+        else:
+            self._sequence.append(response)
+
+    def respond(self, prompt: str, system_message: str = None) -> str:
+        for key in ((system_message, prompt), (None, prompt)):
+            if key in self._by_request:
+                return self._by_request[key]
+        for substring, response in self._rules:
+            if substring in prompt or substring in (system_message or ""):
+                return response
+        with self._lock:
+            if not self._sequence:
+                return self.default_response
+            response = self._sequence[self._next % len(self._sequence)]
+            self._next += 1
+            return response
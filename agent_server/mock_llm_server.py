@@ -0,0 +1,179 @@
+"""
+Local stand-in for the OpenAI-compatible and Ollama-compatible LLM APIs, for offline load testing.
+
+Responses come from a TranscriptReplayer and are streamed at a fixed token rate after a fixed
+time-to-first-token; a configurable fraction of requests fail. Point the agent server at it with
+LLM_MOCK_URL=http://<host>:<port>.
+"""
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+
+from flask import Flask, Response, jsonify, request
+
+from agent_server.llms.TranscriptReplayer import TranscriptReplayer
+
+
+def tokenize(text: str) -> list:
+    """Split text into word-sized tokens, keeping trailing whitespace so chunks join back exactly."""
+    return re.findall(r'\s*\S+\s*', text) or [text]
+
+
+def create_app(replayer=None, tokens_per_second=50.0, ttft_ms=200.0, error_rate=0.0, error_status=500, seed=0):
+    app = Flask(__name__)
+    replayer = replayer or TranscriptReplayer()
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    stats = {"requests": 0, "errors": 0, "streams": 0}
+    stats_lock = threading.Lock()
+
+    def count(name):
+        with stats_lock:
+            stats[name] += 1
+
+    def injected_error():
+        with rng_lock:
+            failed = rng.random() < error_rate
+        if failed:
+            count("errors")
+            return jsonify({"error": {"message": "Injected mock failure", "type": "mock_error"}}), error_status
+        return None
+
+    def timed_tokens(text):
+        time.sleep(ttft_ms / 1000)
+        for index, token in enumerate(tokenize(text)):
+            if index and tokens_per_second > 0:
+                time.sleep(1 / tokens_per_second)
+            yield token
+
+    def generation_seconds(text):
+        """How long a non-streaming request takes: first token plus the rest at the token rate."""
+        remaining = len(tokenize(text)) - 1
+        return ttft_ms / 1000 + (remaining / tokens_per_second if tokens_per_second > 0 else 0)
+
+    def chat_messages(payload):
+        messages = payload.get("messages", [])
+        system_message = next((m["content"] for m in messages if m.get("role") == "system"), None)
+        prompt = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        return prompt, system_message
+
+    def completion_text(prompt, system_message, stream):
+        count("requests")
+        if stream:
+            count("streams")
+        return replayer.respond(prompt, system_message)
+
+    @app.route('/v1/chat/completions', methods=['POST'])
+    @app.route('/chat/completions', methods=['POST'])
+    @app.route('/inference/v1/chat/completions', methods=['POST'])
+    def chat_completions():
+        payload = request.get_json(force=True)
+        error = injected_error()
+        if error:
+            return error
+        prompt, system_message = chat_messages(payload)
+        stream = bool(payload.get("stream"))
+        text = completion_text(prompt, system_message, stream)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        model = payload.get("model", "mock")
+
+        if not stream:
+            time.sleep(generation_seconds(text))
+            return jsonify({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+            })
+
+        def generate():
+            for token in timed_tokens(text):
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                         "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return Response(generate(), mimetype='text/event-stream')
+
+    @app.route('/api/generate', methods=['POST'])
+    def ollama_generate():
+        payload = request.get_json(force=True)
+        error = injected_error()
+        if error:
+            return error
+        stream = payload.get("stream", True)
+        text = completion_text(payload.get("prompt", ""), payload.get("system"), stream)
+        model = payload.get("model", "mock")
+
+        if not stream:
+            time.sleep(generation_seconds(text))
+            return jsonify({"model": model, "response": text, "done": True})
+
+        def generate():
+            for token in timed_tokens(text):
+                yield json.dumps({"model": model, "response": token, "done": False}) + "\n"
+            yield json.dumps({"model": model, "response": "", "done": True}) + "\n"
+
+        return Response(generate(), mimetype='application/x-ndjson')
+
+    @app.route('/generate', methods=['POST'])
+    def rest_generate():
+        payload = request.get_json(force=True)
+        error = injected_error()
+        if error:
+            return error
+        text = completion_text(payload.get("prompt", ""), payload.get("system_message"), False)
+        time.sleep(generation_seconds(text))
+        return jsonify({"response": text})
+
+    @app.route('/stream', methods=['POST'])
+    def rest_stream():
+        """
+        The SSE stream used by RestLLM, OllamaLLM and LlamaCppRestLLM. Each chunk carries the token in
+        every shape those clients read, so one endpoint serves all three.
+        """
+        payload = request.get_json(force=True)
+        error = injected_error()
+        if error:
+            return error
+        if "messages" in payload:
+            prompt, system_message = chat_messages(payload)
+        else:
+            prompt, system_message = payload.get("prompt", ""), payload.get("system_message", payload.get("system"))
+        text = completion_text(prompt, system_message, True)
+
+        def generate():
+            for token in timed_tokens(text):
+                chunk = {"response": token,
+                         "choices": [{"delta": {"content": token}, "message": {"content": token}}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return Response(generate(), mimetype='text/event-stream')
+
+    @app.route('/mock/stats', methods=['GET'])
+    def mock_stats():
+        with stats_lock:
+            return jsonify(dict(stats))
+
+    return app
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    transcript = os.getenv('MOCK_LLM_TRANSCRIPT')
+    app = create_app(replayer=TranscriptReplayer.from_file(transcript) if transcript else None,
+                     tokens_per_second=float(os.getenv('MOCK_LLM_TOKENS_PER_SECOND', '50')),
+                     ttft_ms=float(os.getenv('MOCK_LLM_TTFT_MS', '200')),
+                     error_rate=float(os.getenv('MOCK_LLM_ERROR_RATE', '0')),
+                     error_status=int(os.getenv('MOCK_LLM_ERROR_STATUS', '500')),
+                     seed=int(os.getenv('MOCK_LLM_SEED', '0')))
+    app.run(host=os.getenv('MOCK_LLM_ADDRESS', '127.0.0.1'), port=int(os.getenv('MOCK_LLM_PORT', '8090')),
+            threaded=True, use_reloader=False)
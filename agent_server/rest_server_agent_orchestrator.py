@@ -2,7 +2,7 @@ import logging
 import os
 import json
 import queue
-from threading import Thread
+from threading import Thread, Timer, current_thread
 
 from agent_server.AssistantOrchestrator import AssistantOrchestrator
 from agent_server.agent.ChatAgent import ChatAgent
@@ -12,13 +12,19 @@ from assistant import Assistant
 from integrations.ChatHandler import ChatHandler
 from flask import Flask, request, jsonify, Response
 
+from agent_server.integrations.EventStream import parse_event_id
+from agent_server.integrations.JobScheduler import JobScheduler, QueueFullError
+from agent_server.integrations.Metrics import CONTENT_TYPE
+from agent_server.integrations.ServerMetrics import register_server_metrics
 from agent_server.integrations.StreamManager import StreamManager
+from agent_server.integrations.Tracer import get_tracer
 
 app = Flask(__name__)
 
 sessions_file_path = '../orchestration/sessions.json'
-stream_manager = StreamManager()
-chat_handler = ChatHandler(stream_manager, sessions_file_path)
+stream_manager = StreamManager.from_env()
+chat_handler = ChatHandler(stream_manager, sessions_file_path,
+                           chat_window_gap_minutes=float(os.getenv('CHAT_WINDOW_GAP_MINUTES', '30')))
 #assistant: Assistant = LLMAssistant(chat_handler, stream_manager)
 reasoning_agent = ReActReasoningAgent()
 chat_agent = ChatAgent()
@@ -29,47 +35,83 @@ user_sessions = {}
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 HEARTBEAT_INTERVAL = 60
+# How long a session's streams are kept after its last listener disconnects, so clients can resume
+RECONNECT_GRACE_PERIOD = float(os.getenv('RECONNECT_GRACE_PERIOD', '120'))
 
 # Read BYPASS_LLM flag from the environment
 BYPASS_LLM = os.getenv('BYPASS_LLM', 'false').lower() == 'true'
 
+# Agent turns run on a bounded worker pool, one at a time per session
+job_scheduler = JobScheduler(workers=int(os.getenv('AGENT_WORKERS', '4')),
+                             max_queue_depth=int(os.getenv('AGENT_MAX_QUEUE_DEPTH', '100')),
+                             name='agent-worker')
 
-def stream_text_in_thread(session_id):
-    text_queue = stream_manager.listen_to_text_stream(session_id)
+metrics = register_server_metrics(stream_manager, user_sessions, job_scheduler)
+open_audio_streams = metrics.gauge("agent_open_audio_streams", "Connected audio stream listeners")
+
+
+def stream_text_in_thread(session_id, last_event_id=None):
+    text_queue = stream_manager.listen_to_text_stream(session_id, last_event_id)
 
     def generate():
         try:
+            # A comment first, so the client gets the response headers now rather than with the first event
+            yield ": connected\n\n"
             while session_id in active_threads:  # Continue streaming as long as the session is active
                 try:
-                    text_chunk = text_queue.get(timeout=HEARTBEAT_INTERVAL)
-                    if text_chunk.startswith(StreamManager.FUNCTION):
-                        yield f"data: {json.dumps({'function': text_chunk.replace(StreamManager.FUNCTION, '')})}\n\n"
-                    else:
-                        yield f"data: {json.dumps({'message': text_chunk})}\n\n"
+                    event = text_queue.get(timeout=HEARTBEAT_INTERVAL)
+                    if event is None:
+                        break
+                    yield format_text_event(event)
                 except queue.Empty:
                     yield f"data: {json.dumps({'heartbeat': 'keep-alive'})}\n\n"
         finally:
-            clean_up_resources(session_id)
+            release_text_stream(session_id, text_queue)
 
     return Response(generate(), mimetype='text/event-stream')
 
 
+def format_text_event(event):
+    if event.data.startswith(StreamManager.FUNCTION):
+        payload = {'function': event.data.replace(StreamManager.FUNCTION, '')}
+    else:
+        payload = {'message': event.data}
+    return f"id: {event.seq}\ndata: {json.dumps(payload)}\n\n"
+
+
+def release_text_stream(session_id, text_queue):
+    """Detach one listener; once none are left, clean up unless a client reconnects in time."""
+    if stream_manager.stop_listening_to_text_stream(session_id, text_queue) == 0:
+        timer = Timer(RECONNECT_GRACE_PERIOD, clean_up_if_abandoned, args=(session_id,))
+        timer.daemon = True
+        timer.start()
+
+
+def clean_up_if_abandoned(session_id):
+    if session_id in active_threads and stream_manager.text_listener_count(session_id) == 0:
+        clean_up_resources(session_id)
+
+
 @app.route('/streamaudio/<session_id>')
 def stream_audio(session_id):
     audio_buffer = stream_manager.listen_to_audio_stream(session_id)
 
     def generate_audio():
-        while session_id in active_threads:
-            try:
-                audio_chunk = audio_buffer.get(timeout=HEARTBEAT_INTERVAL)
-            except queue.Empty:
-                continue
-
-            if audio_chunk is None:
-                break
-            samples, sample_rate = audio_chunk
-            audio_bytes = samples.tobytes()
-            yield audio_bytes
+        open_audio_streams.inc()
+        try:
+            while session_id in active_threads:
+                try:
+                    audio_chunk = audio_buffer.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    continue
+
+                if audio_chunk is None:
+                    break
+                samples, sample_rate = audio_chunk
+                audio_bytes = samples.tobytes()
+                yield audio_bytes
+        finally:
+            open_audio_streams.dec()
 
     def stream_audio_thread():
         return Response(generate_audio(), mimetype='audio/raw')
@@ -98,12 +140,28 @@ def start_session():
 
 @app.route('/stream/<session_id>')
 def stream_text(session_id):
-    stream_thread = Thread(target=stream_text_in_thread, args=(session_id,))
-    stream_thread.start()
+    active_threads[session_id] = current_thread()
+    # EventSource sends Last-Event-ID on reconnect; plain clients can pass it as a query parameter
+    last_event_id = parse_event_id(request.headers.get('Last-Event-ID', request.args.get('last_event_id')))
+
+    return stream_text_in_thread(session_id, last_event_id)
 
-    active_threads[session_id] = stream_thread
 
-    return stream_text_in_thread(session_id)
+@app.route('/stream_stats/<session_id>')
+def stream_stats(session_id):
+    return jsonify(stream_manager.get_memory_usage(session_id))
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+
+@app.route('/traces')
+def traces():
+    """Recently finished spans from the in-process ring buffer, optionally for one trace_id."""
+    ring_buffer = get_tracer().ring_buffer
+    return jsonify(ring_buffer.spans(request.args.get('trace_id')) if ring_buffer else [])
 
 
 @app.route('/end_session', methods=['DELETE'])
@@ -143,7 +201,10 @@ def message_agent():
         return jsonify({"status": "Message received, canned response sent"}), 202
     else:
         chat_session = chat_handler.create_session(user_sessions.get(session_id), session_id)
-        assistant.message_assistant(chat_session, user_message)
+        try:
+            job_scheduler.submit(session_id, assistant.message_assistant, chat_session, user_message)
+        except QueueFullError:
+            return jsonify({"error": "Server is busy, try again later"}), 429
         return jsonify({"status": "Message received, processing started"}), 202
 
 
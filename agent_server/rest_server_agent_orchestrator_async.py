@@ -0,0 +1,239 @@
+"""
+ASGI variant of rest_server_agent_orchestrator.
+
+Exposes the same routes, but SSE and audio streams are async generators on a single event
+loop, so idle connections don't each pin an OS thread. The agent pipeline itself is still
+synchronous and runs on the shared agent JobScheduler.
+
+Run with:
+    python rest_server_agent_orchestrator_async.py
+or any ASGI server, e.g.:
+    hypercorn agent_server.rest_server_agent_orchestrator_async:app
+"""
+import asyncio
+import json
+import logging
+import os
+
+from quart import Quart, request, jsonify, Response
+
+from agent_server.AssistantOrchestrator import AssistantOrchestrator
+from agent_server.agent.ChatAgent import ChatAgent
+from agent_server.agent.ReactReasoningAgent import ReActReasoningAgent
+from agent_server.assistant import Assistant
+from agent_server.integrations.ChatHandler import ChatHandler
+from agent_server.integrations.EventStream import parse_event_id
+from agent_server.integrations.JobScheduler import JobScheduler, QueueFullError
+from agent_server.integrations.Metrics import CONTENT_TYPE
+from agent_server.integrations.ServerMetrics import register_server_metrics
+from agent_server.integrations.StreamManager import StreamManager
+from agent_server.integrations.Tracer import get_tracer
+
+app = Quart(__name__)
+
+sessions_file_path = '../orchestration/sessions.json'
+stream_manager = StreamManager.from_env()
+chat_handler = ChatHandler(stream_manager, sessions_file_path,
+                           chat_window_gap_minutes=float(os.getenv('CHAT_WINDOW_GAP_MINUTES', '30')))
+reasoning_agent = ReActReasoningAgent()
+chat_agent = ChatAgent()
+assistant: Assistant = AssistantOrchestrator(reasoning_agent, chat_agent)
+active_streams = set()
+user_sessions = {}
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+HEARTBEAT_INTERVAL = 60
+# How long a session's streams are kept after its last listener disconnects, so clients can resume
+RECONNECT_GRACE_PERIOD = float(os.getenv('RECONNECT_GRACE_PERIOD', '120'))
+
+# Read BYPASS_LLM flag from the environment
+BYPASS_LLM = os.getenv('BYPASS_LLM', 'false').lower() == 'true'
+
+# Agent turns run on a bounded worker pool, one at a time per session
+job_scheduler = JobScheduler(workers=int(os.getenv('AGENT_WORKERS', '4')),
+                             max_queue_depth=int(os.getenv('AGENT_MAX_QUEUE_DEPTH', '100')),
+                             name='agent-worker')
+
+metrics = register_server_metrics(stream_manager, user_sessions, job_scheduler)
+open_audio_streams = metrics.gauge("agent_open_audio_streams", "Connected audio stream listeners")
+
+
+async def run_blocking(func, *args):
+    """Run blocking work (file I/O, LLM calls, thread joins) off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def streaming_response(body, mimetype):
+    response = Response(body, mimetype=mimetype)
+    response.timeout = None  # Streams live as long as the session, not RESPONSE_TIMEOUT
+    return response
+
+
+@app.route('/stream/<session_id>')
+async def stream_text(session_id):
+    # EventSource sends Last-Event-ID on reconnect; plain clients can pass it as a query parameter
+    last_event_id = parse_event_id(request.headers.get('Last-Event-ID', request.args.get('last_event_id')))
+    text_queue = stream_manager.listen_to_text_stream(session_id, last_event_id)
+    active_streams.add(session_id)
+
+    async def generate():
+        try:
+            # A comment first, so the client gets the response headers now rather than with the first event
+            yield b": connected\n\n"
+            while session_id in active_streams:
+                try:
+                    event = await text_queue.aget(timeout=HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield f"data: {json.dumps({'heartbeat': 'keep-alive'})}\n\n".encode()
+                    continue
+
+                if event is None:
+                    break
+                yield format_text_event(event).encode()
+        finally:
+            release_text_stream(session_id, text_queue)
+
+    return streaming_response(generate(), 'text/event-stream')
+
+
+def format_text_event(event):
+    if event.data.startswith(StreamManager.FUNCTION):
+        payload = {'function': event.data.replace(StreamManager.FUNCTION, '')}
+    else:
+        payload = {'message': event.data}
+    return f"id: {event.seq}\ndata: {json.dumps(payload)}\n\n"
+
+
+def release_text_stream(session_id, text_queue):
+    """Detach one listener; once none are left, clean up unless a client reconnects in time."""
+    if stream_manager.stop_listening_to_text_stream(session_id, text_queue) == 0:
+        loop = asyncio.get_running_loop()
+        loop.call_later(RECONNECT_GRACE_PERIOD,
+                        lambda: loop.run_in_executor(None, clean_up_if_abandoned, session_id))
+
+
+def clean_up_if_abandoned(session_id):
+    if session_id in active_streams and stream_manager.text_listener_count(session_id) == 0:
+        clean_up_resources(session_id)
+
+
+@app.route('/streamaudio/<session_id>')
+async def stream_audio(session_id):
+    audio_buffer = stream_manager.listen_to_audio_stream(session_id)
+
+    async def generate_audio():
+        open_audio_streams.inc()
+        try:
+            while session_id in active_streams:
+                try:
+                    audio_chunk = await audio_buffer.aget(timeout=HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    continue
+
+                if audio_chunk is None:
+                    break
+                samples, sample_rate = audio_chunk
+                yield samples.tobytes()
+        finally:
+            open_audio_streams.dec()
+
+    return streaming_response(generate_audio(), 'audio/raw')
+
+
+@app.route('/start_session', methods=['POST'])
+async def start_session():
+    data = await request.get_json()
+    username = data.get('username')
+
+    if not username:
+        return jsonify({"error": "Username is required"}), 400
+
+    session_id = os.urandom(16).hex()
+    await run_blocking(chat_handler.get_or_create_user, username)
+    user_sessions[session_id] = username
+
+    return jsonify({"session_id": session_id, "heartbeat_interval": HEARTBEAT_INTERVAL})
+
+
+@app.route('/stream_stats/<session_id>')
+async def stream_stats(session_id):
+    return jsonify(stream_manager.get_memory_usage(session_id))
+
+
+@app.route('/metrics')
+async def metrics_endpoint():
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+
+@app.route('/traces')
+async def traces():
+    """Recently finished spans from the in-process ring buffer, optionally for one trace_id."""
+    ring_buffer = get_tracer().ring_buffer
+    return jsonify(ring_buffer.spans(request.args.get('trace_id')) if ring_buffer else [])
+
+
+@app.route('/end_session', methods=['DELETE'])
+async def end_session():
+    data = await request.get_json()
+    session_id = data.get('session_id')
+
+    if not session_id or session_id not in user_sessions:
+        return jsonify({"error": "Invalid or missing session_id"}), 400
+
+    await run_blocking(chat_handler.end_session, session_id)
+    await run_blocking(clean_up_resources, session_id)
+    user_sessions.pop(session_id, None)
+
+    return '', 200
+
+
+def clean_up_resources(session_id):
+    if session_id in active_streams:
+        logger.info("Cleaning up resource for session: " + session_id)
+        active_streams.discard(session_id)
+    stream_manager.end_streams(session_id)
+    user_sessions.pop(session_id, None)
+
+
+@app.route('/message_agent', methods=['POST'])
+async def message_agent():
+    data = await request.get_json()
+    session_id = data.get('session_id')
+    user_message = data.get('user_message', '')
+
+    if not session_id or session_id not in user_sessions:
+        return jsonify({"error": "Invalid or missing session_id"}), 400
+
+    if await run_blocking(handle_bypass_llm, session_id, user_message):
+        return jsonify({"status": "Message received, canned response sent"}), 202
+
+    chat_session = await run_blocking(chat_handler.create_session, user_sessions.get(session_id), session_id)
+    try:
+        job_scheduler.submit(session_id, assistant.message_assistant, chat_session, user_message)
+    except QueueFullError:
+        return jsonify({"error": "Server is busy, try again later"}), 429
+    return jsonify({"status": "Message received, processing started"}), 202
+
+
+def handle_bypass_llm(session_id, user_message):
+    if BYPASS_LLM:
+        logger.info(f"BYPASS_LLM is enabled. Logging message: {user_message}")
+        current_directory = os.path.dirname(os.path.abspath(__file__))
+        canned_response_file = os.path.join(current_directory, 'dev', 'canned_response.txt')
+        try:
+            with open(canned_response_file, 'r') as file:
+                canned_response = file.read().strip()
+        except FileNotFoundError:
+            logger.error("Canned response file not found")
+            return True
+
+        # Send the canned response to the text stream
+        stream_manager.add_to_text_buffer(session_id, canned_response)
+        return True
+
+    return False
+
+
+if __name__ == '__main__':
+    app.run(host=os.environ['REST_ADDRESS'], port=int(os.environ['REST_PORT']), use_reloader=False)
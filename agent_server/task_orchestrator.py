@@ -8,13 +8,15 @@ from agent_server.integrations.InventoryRestClient import InventoryClient
 from agent_server.integrations.KnowledgeQuery import KnowledgeQuery
 from agent_server.integrations.SmartFindingInventoryClient import SmartFindingInventoryClient
 from agent_server.integrations.local_device_action import LocalDeviceAction
+from agent_server.llms.CachingLLM import CachingLLM, is_json
 from agent_server.llms.LLMFactory import LLMFactory, ModelType
 from agent_server.llms.LLMInterface import LLMInterface
 
 class TaskOrchestrator:
     def __init__(self, llm_interface: LLMInterface):
-        self.sequencer = Sequencer(LLMFactory.create_llm(ModelType.FIREWORKS_LLAMA_3_2_11B))
-        self.json_function_creator = JsonFunctionCreator(LLMFactory.create_llm(ModelType.FIREWORKS_LLAMA_3_1_8B))
+        self.sequencer = Sequencer(CachingLLM(LLMFactory.create_llm(ModelType.FIREWORKS_LLAMA_3_2_11B), cache_if=is_json))
+        self.json_function_creator = JsonFunctionCreator(
+            CachingLLM(LLMFactory.create_llm(ModelType.FIREWORKS_LLAMA_3_1_8B), cache_if=is_json))
 
         self.chat_handler = None
         rest_inventory_client = InventoryClient(os.environ.get("ORGANIZER_SERVER_URL"))
@@ -0,0 +1,75 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agent_server.llms.FireworksAiRestLLM import FireworksAiRestLLM
+from agent_server.llms.HttpSessionPool import get_http_session_pool
+from agent_server.llms.LLMInterface import LLMInterface
+from agent_server.llms.OllamaRestLLM import OllamaLLM
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if request.get("stream"):
+            chunks = [{"choices": [{"delta": {"content": word}}]} for word in ("Hello", " there")]
+            body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+            content_type = "text/event-stream"
+        else:
+            body = json.dumps({"response": f"echo: {request['prompt']}"})
+            content_type = "application/json"
+        body = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BlockingLLM(LLMInterface):
+    def generate_response(self, prompt, system_message):
+        return prompt.upper()
+
+    def stream_response(self, prompt, system_message):
+        yield from prompt.split()
+
+
+class TestAsyncLLM(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    async def asyncTearDown(self):
+        await get_http_session_pool().aclose()
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_agenerate_response(self):
+        llm = OllamaLLM(self.url, "model")
+
+        self.assertEqual(await llm.agenerate_response("hi", "system"), "echo: hi")
+
+    async def test_astream_response_yields_chunks_then_end_marker(self):
+        llm = FireworksAiRestLLM("token")
+        llm.url = self.url
+
+        chunks = [chunk async for chunk in llm.astream_response("hi", "system")]
+
+        self.assertEqual(chunks, ["Hello", " there", LLMInterface.END_STREAM])
+
+    async def test_blocking_clients_fall_back_to_threads(self):
+        llm = BlockingLLM()
+
+        self.assertEqual(await llm.agenerate_response("hi", "system"), "HI")
+        self.assertEqual([chunk async for chunk in llm.astream_response("a b", "system")], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from agent_server.integrations.ChatHandler import ChatHandler
+from agent_server.integrations.JobScheduler import JobScheduler
+
+# The server builds its agents and session store at import time: keep LLM clients off real keys, skip
+# loading the ReAct prompts, and put the store under a temporary directory
+_work_dir = tempfile.mkdtemp()
+os.makedirs(os.path.join(_work_dir, 'server'))
+_cwd = os.getcwd()
+os.chdir(os.path.join(_work_dir, 'server'))
+try:
+    with mock.patch.dict(os.environ, {"LLM_MOCK_URL": "http://127.0.0.1:9"}):
+        from agent_server.agent.ReactReasoningAgent import ReActReasoningAgent
+        with mock.patch.object(ReActReasoningAgent, "__init__", return_value=None):
+            from agent_server import rest_server_agent_orchestrator_async as server
+finally:
+    os.chdir(_cwd)
+
+
+class BlockingAssistant:
+    """Holds each turn until released, so queued turns pile up in the scheduler."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.messages = []
+
+    def message_assistant(self, chat_session, user_message):
+        self.messages.append((chat_session.session_id, user_message))
+        self.release.wait(5)
+
+
+class TestAsyncOrchestratorServer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.assistant = BlockingAssistant()
+        self.job_scheduler = JobScheduler(workers=1, max_queue_depth=1, name="test-agent-worker")
+        self.chat_handler = ChatHandler(server.stream_manager, os.path.join(tempfile.mkdtemp(), 'sessions.json'))
+        patches = [
+            mock.patch.object(server, "assistant", self.assistant),
+            mock.patch.object(server, "job_scheduler", self.job_scheduler),
+            mock.patch.object(server, "chat_handler", self.chat_handler),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = server.app.test_client()
+
+    def tearDown(self):
+        self.assistant.release.set()
+        self.job_scheduler.shutdown()
+
+    async def start_session(self, username="alan"):
+        response = await self.client.post('/start_session', json={"username": username})
+        self.assertEqual(response.status_code, 200)
+        return (await response.get_json())["session_id"]
+
+    async def test_start_session(self):
+        response = await self.client.post('/start_session', json={"username": "alan"})
+        body = await response.get_json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(server.user_sessions[body["session_id"]], "alan")
+        self.assertEqual(body["heartbeat_interval"], server.HEARTBEAT_INTERVAL)
+        self.assertEqual((await self.client.post('/start_session', json={})).status_code, 400)
+
+    async def test_stream_resumes_after_last_event_id(self):
+        session_id = await self.start_session()
+        first_listener = server.stream_manager.listen_to_text_stream(session_id)
+        for chunk in ("one", "two", "three"):
+            server.stream_manager.add_to_text_buffer(session_id, chunk)
+        server.stream_manager.stop_listening_to_text_stream(session_id, first_listener)
+
+        async with self.client.request(f'/stream/{session_id}', headers={"Last-Event-ID": "1"}) as connection:
+            received = b""
+            while received.count(b"\n\n") < 3:
+                received += await connection.receive()
+            await connection.disconnect()
+
+        events = [event for event in received.decode().split("\n\n") if event]
+        self.assertEqual(events, [": connected",
+                                  f"id: 2\ndata: {json.dumps({'message': 'two'})}",
+                                  f"id: 3\ndata: {json.dumps({'message': 'three'})}"])
+        server.clean_up_resources(session_id)
+
+    async def test_message_agent_accepts_until_the_queue_is_full(self):
+        session_id = await self.start_session()
+
+        def send(message):
+            return self.client.post('/message_agent', json={"session_id": session_id, "user_message": message})
+
+        self.assertEqual((await send("first")).status_code, 202)
+        deadline = time.monotonic() + 5
+        while not self.assistant.messages and time.monotonic() < deadline:
+            time.sleep(0.01)  # wait for "first" to leave the queue and start running
+        self.assertEqual((await send("second")).status_code, 202)  # queued
+        busy = await send("third")
+
+        self.assertEqual(busy.status_code, 429)
+        self.assertEqual(await busy.get_json(), {"error": "Server is busy, try again later"})
+        self.assertEqual((await self.client.post('/message_agent', json={"session_id": "unknown"})).status_code, 400)
+
+    async def test_end_session_ends_the_chat_session(self):
+        session_id = await self.start_session()
+        await self.client.post('/message_agent', json={"session_id": session_id, "user_message": "hi"})
+        self.assertIn(session_id, self.chat_handler.sessions)
+
+        response = await self.client.delete('/end_session', json={"session_id": session_id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(session_id, self.chat_handler.sessions)
+        self.assertNotIn(session_id, server.user_sessions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import json
+import queue
+import tempfile
+import threading
+import time
+import unittest
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import make_server
+
+from agent_server.benchmark_agent_turn import BENCHMARK_TRANSCRIPT, SERVERS, SimulatedUser, _serve, \
+    create_stub_inventory_app, percentile, run_benchmark, spawn_agent_server
+from agent_server.llms.TranscriptReplayer import TranscriptReplayer
+from agent_server.mock_llm_server import create_app
+
+
+def create_fake_agent_app(reply_delay=0.01):
+    """Speaks the agent server's session/SSE protocol, answering each message with two streamed replies."""
+    app = Flask(__name__)
+    streams = {}
+
+    @app.route('/start_session', methods=['POST'])
+    def start_session():
+        session_id = f"session-{len(streams)}"
+        streams[session_id] = queue.Queue()
+        return jsonify({"session_id": session_id})
+
+    @app.route('/stream/<session_id>')
+    def stream(session_id):
+        def generate():
+            yield ": connected\n\n"
+            seq = 0
+            while True:
+                try:
+                    message = streams[session_id].get(timeout=1)
+                except queue.Empty:
+                    yield f"data: {json.dumps({'heartbeat': 'keep-alive'})}\n\n"
+                    continue
+                if message is None:
+                    break
+                seq += 1
+                yield f"id: {seq}\ndata: {json.dumps({'message': message})}\n\n"
+
+        return Response(generate(), mimetype='text/event-stream')
+
+    @app.route('/message_agent', methods=['POST'])
+    def message_agent():
+        session_id = request.json["session_id"]
+
+        def reply():
+            for text in ("On it", ", checking.[DONE]", "Found it in container 5.", "[DONE]"):
+                time.sleep(reply_delay)
+                streams[session_id].put(text)
+
+        threading.Thread(target=reply, daemon=True).start()
+        return jsonify({"status": "Message received, processing started"}), 202
+
+    @app.route('/end_session', methods=['DELETE'])
+    def end_session():
+        streams[request.json["session_id"]].put(None)
+        return '', 200
+
+    return app
+
+
+class TestAgentTurnBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.server = make_server("127.0.0.1", 0, create_fake_agent_app(), threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def test_reports_latency_percentiles_for_every_turn(self):
+        results = run_benchmark(self.url, users=3, turns=2, timeout=10)
+
+        self.assertEqual(results["completed_turns"], 6)
+        self.assertEqual(results["errors"], 0)
+        self.assertGreater(results["turns_per_second"], 0)
+        ttft, final = results["time_to_first_token_ms"], results["time_to_final_token_ms"]
+        self.assertLessEqual(ttft["p50"], ttft["p95"])
+        self.assertLessEqual(ttft["p95"], ttft["p99"])
+        self.assertLess(ttft["p50"], final["p50"])
+        self.assertGreaterEqual(final["p50"], 40)  # four replies, 10ms apart
+        json.dumps(results)
+
+    def test_turn_times_out_when_the_reply_never_completes(self):
+        results = run_benchmark(self.url, users=1, turns=1, messages_per_turn=3, timeout=0.5)
+
+        self.assertEqual(results["completed_turns"], 0)
+        self.assertEqual(results["errors"], 1)
+        self.assertIsNone(results["time_to_final_token_ms"])
+
+
+class TestSimulatedUser(unittest.TestCase):
+    def setUp(self):
+        self.server = make_server("127.0.0.1", 0, create_fake_agent_app(reply_delay=0.05), threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.user = SimulatedUser(f"http://127.0.0.1:{self.server.server_port}", "alan", 2, timeout=0.07)
+        self.user.start()
+
+    def tearDown(self):
+        self.user.close()
+        self.server.shutdown()
+
+    def test_late_replies_from_a_timed_out_turn_are_not_counted(self):
+        with self.assertRaises(queue.Empty):
+            self.user.run_turn("first")
+        time.sleep(0.3)  # the rest of the first turn's replies arrive
+
+        self.user.timeout = 10
+        ttft, final = self.user.run_turn("second")
+
+        self.assertGreaterEqual(ttft, 0.05)
+        self.assertGreaterEqual(final, 0.2)
+
+    def test_close_ends_the_event_stream(self):
+        self.user.close()
+
+        self.assertIsNone(self.user.events.get(timeout=2))
+
+
+class TestSpawnedAgentServer(unittest.TestCase):
+    """The real agent servers, with their LLMs on the mock LLM server, complete a turn end to end."""
+
+    def setUp(self):
+        replayer = TranscriptReplayer(BENCHMARK_TRANSCRIPT)
+        self.mock_llm, self.mock_llm_url = _serve(create_app(replayer, tokens_per_second=1000, ttft_ms=0))
+        self.inventory, self.inventory_url = _serve(create_stub_inventory_app())
+
+    def tearDown(self):
+        self.mock_llm.shutdown()
+        self.inventory.shutdown()
+
+    def test_one_turn_on_each_server(self):
+        for server in sorted(SERVERS):
+            with self.subTest(server=server):
+                process, url = spawn_agent_server(server, self.mock_llm_url, self.inventory_url, tempfile.mkdtemp())
+                try:
+                    results = run_benchmark(url, users=1, turns=1, timeout=30)
+                finally:
+                    process.terminate()
+                    process.wait(timeout=10)
+
+                self.assertEqual((results["completed_turns"], results["errors"]), (1, 0), results["error_samples"])
+                self.assertLess(results["elapsed_seconds"], 10)  # no wait for the first heartbeat
+
+
+class TestPercentile(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+
+
+class TestBenchmarkTranscript(unittest.TestCase):
+    def test_match_rules_route_each_agent_step(self):
+        replayer = TranscriptReplayer(BENCHMARK_TRANSCRIPT)
+
+        plan = replayer.respond("TASK----find my screwdriver----\n", "You are a planner")
+        observation = replayer.respond("TASK---find my screwdriver---\n", "You are a planner")
+        function_call = replayer.respond("find the screwdriver", "You are responsible for interpreting user requests "
+                                                                 "and generating a JSON response")
+
+        self.assertEqual(json.loads(plan)["action"], "find_location")
+        self.assertTrue(json.loads(observation)["is_answered"])
+        self.assertEqual(json.loads(function_call)["parameters"], {"item_name": "screwdriver"})
+        self.assertIn("[task_summary]",
+                      replayer.respond("The user just sent the following message: where is it?", "Sevro"))
+
+    def test_exact_prompts_take_precedence_over_match_rules(self):
+        replayer = TranscriptReplayer([{"match": "hello", "response": "rule"},
+                                       {"prompt": "hello there", "response": "exact"},
+                                       {"response": "sequence"}])
+
+        self.assertEqual(replayer.respond("hello there"), "exact")
+        self.assertEqual(replayer.respond("well hello"), "rule")
+        self.assertEqual(replayer.respond("goodbye"), "sequence")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import queue
+import threading
+import time
+import unittest
+
+from agent_server.integrations.BoundedBuffer import BoundedBuffer, OverflowPolicy
+
+
+class TestBoundedBuffer(unittest.TestCase):
+    def test_drop_oldest_keeps_newest_items(self):
+        buffer = BoundedBuffer(max_items=2, policy=OverflowPolicy.DROP_OLDEST)
+        for chunk in ("a", "b", "c"):
+            buffer.put(chunk)
+
+        self.assertEqual([buffer.get(timeout=0), buffer.get(timeout=0)], ["b", "c"])
+        self.assertEqual(buffer.stats()["dropped"], 1)
+
+    def test_coalesce_merges_text_into_newest_item(self):
+        buffer = BoundedBuffer(max_items=2, policy=OverflowPolicy.COALESCE)
+        for chunk in ("Hello", " wor", "ld"):
+            buffer.put(chunk)
+
+        self.assertEqual([buffer.get(timeout=0), buffer.get(timeout=0)], ["Hello", " world"])
+        self.assertEqual(buffer.stats()["coalesced"], 1)
+
+    def test_max_bytes_is_enforced(self):
+        buffer = BoundedBuffer(max_items=100, max_bytes=10, policy=OverflowPolicy.DROP_OLDEST)
+        for chunk in ("12345", "67890", "abcde"):
+            buffer.put(chunk)
+
+        self.assertEqual(buffer.stats()["bytes"], 10)
+        self.assertEqual(buffer.get(timeout=0), "67890")
+
+    def test_block_pauses_producer_until_consumer_reads(self):
+        buffer = BoundedBuffer(max_items=1, policy=OverflowPolicy.BLOCK, block_timeout=2)
+        buffer.put("first")
+        consumer = threading.Timer(0.05, buffer.get)
+        consumer.start()
+
+        started = time.monotonic()
+        buffer.put("second")
+
+        self.assertGreater(time.monotonic() - started, 0.03)
+        self.assertEqual(buffer.get(timeout=0), "second")
+        self.assertEqual(buffer.stats()["dropped"], 0)
+
+    def test_sentinel_is_never_dropped(self):
+        buffer = BoundedBuffer(max_items=1, policy=OverflowPolicy.DROP_OLDEST)
+        buffer.put(None)
+        buffer.put("late chunk")
+
+        self.assertIsNone(buffer.get(timeout=0))
+
+    def test_get_raises_empty_on_timeout(self):
+        with self.assertRaises(queue.Empty):
+            BoundedBuffer().get(timeout=0.01)
+
+
+class TestBoundedBufferAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_aget_receives_items_from_worker_thread(self):
+        buffer = BoundedBuffer()
+        threading.Timer(0.01, buffer.put, args=("Hello",)).start()
+
+        self.assertEqual(await buffer.aget(timeout=1), "Hello")
+
+    async def test_aget_times_out_when_idle(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            await BoundedBuffer().aget(timeout=0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
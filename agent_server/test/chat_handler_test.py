@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import unittest
+
+from agent_server.integrations.ChatHandler import ChatHandler
+from agent_server.integrations.FileSessionStore import FileSessionStore
+
+
+def memory_contents(chat_handler, username):
+    return [message.content for message in chat_handler.get_memory(username).chat_memory.messages]
+
+
+class TestChatHandlerFileStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sessions_file_path = os.path.join(self.temp_dir.name, 'sessions.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_handler(self, **kwargs):
+        return ChatHandler(None, self.sessions_file_path, store=FileSessionStore(self.sessions_file_path, **kwargs))
+
+    def test_messages_are_appended_to_log_not_snapshot(self):
+        chat_handler = self._create_handler()
+        chat_session = chat_handler.create_session("alan", "session")
+        snapshot_size = os.path.getsize(self.sessions_file_path)
+
+        chat_session.store_human_context("what's in container 5?")
+
+        self.assertEqual(os.path.getsize(self.sessions_file_path), snapshot_size)
+        with open(chat_handler.store.session_log.log_path) as log_file:
+            record_types = [json.loads(line)["type"] for line in log_file]
+        self.assertEqual(record_types, ["user", "history", "memory", "history"])
+
+    def test_log_is_replayed_on_restart(self):
+        chat_session = self._create_handler().create_session("alan", "session")
+        chat_session.store_human_context("hello")
+        chat_session.finalize_message("hi there", "AI")
+
+        restarted = self._create_handler()
+
+        self.assertEqual(memory_contents(restarted, "alan"), ["hello", "hi there"])
+        self.assertEqual(len(restarted.get_history("alan")), 3)
+
+    def test_torn_trailing_record_is_ignored(self):
+        chat_handler = self._create_handler()
+        chat_handler.create_session("alan", "session").store_human_context("hello")
+        with open(chat_handler.store.session_log.log_path, 'a') as log_file:
+            log_file.write('{"type": "memory", "username": "al')
+
+        restarted = self._create_handler()
+
+        self.assertEqual(memory_contents(restarted, "alan"), ["hello"])
+
+    def test_compaction_truncates_log_without_duplicating_records(self):
+        chat_handler = self._create_handler(compact_every=3)
+        chat_session = chat_handler.create_session("alan", "session")
+        for message in ("one", "two", "three"):
+            chat_session.store_human_context(message)
+
+        restarted = self._create_handler()
+
+        self.assertEqual(memory_contents(restarted, "alan"), ["one", "two", "three"])
+        self.assertEqual(os.path.getsize(restarted.store.session_log.log_path), 0)
+
+
+class TestChatHandlerSqliteStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sessions_file_path = os.path.join(self.temp_dir.name, 'sessions.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_users_are_loaded_lazily(self):
+        ChatHandler(None, self.sessions_file_path).create_session("alan", "session").store_human_context("hello")
+
+        restarted = ChatHandler(None, self.sessions_file_path)
+
+        self.assertEqual(len(restarted.users), 0)
+        restarted.create_session("alan", "session")
+        self.assertIn("alan", restarted.users)
+        self.assertEqual(memory_contents(restarted, "alan"), ["hello"])
+
+    def test_least_recently_used_users_are_evicted(self):
+        chat_handler = ChatHandler(None, self.sessions_file_path, max_cached_users=2)
+        for username in ("a", "b", "c"):
+            chat_handler.create_session(username, username).store_human_context(f"hi from {username}")
+
+        self.assertEqual(list(chat_handler.users), ["b", "c"])
+        self.assertNotIn("a", chat_handler.memories)
+        self.assertEqual(memory_contents(chat_handler, "a"), ["hi from a"])
+        self.assertEqual(list(chat_handler.users), ["c", "a"])
+
+    def test_legacy_sessions_file_is_imported(self):
+        legacy_handler = ChatHandler(None, self.sessions_file_path, store=FileSessionStore(self.sessions_file_path))
+        legacy_handler.create_session("alan", "session").store_human_context("hello")
+
+        chat_handler = ChatHandler(None, self.sessions_file_path)
+
+        self.assertEqual(memory_contents(chat_handler, "alan"), ["hello"])
+        self.assertEqual(len(chat_handler.get_history("alan")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
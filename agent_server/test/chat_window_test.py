@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from agent_server.integrations.ChatHandler import ChatHandler
+from agent_server.integrations.ChatWindow import ChatWindow
+
+
+class TestChatWindow(unittest.TestCase):
+    def test_window_restarts_after_gap(self):
+        chat_window = ChatWindow(gap_seconds=30 * 60)
+        for timestamp in ("2024-01-01T10:00:00Z", "2024-01-01T10:20:00Z",
+                          "2024-01-01T11:00:00Z", "2024-01-01T11:05:00Z"):
+            chat_window.add(timestamp)
+
+        self.assertEqual(chat_window.indices(), [2, 3])
+
+    def test_messages_without_timestamps_are_skipped(self):
+        chat_window = ChatWindow(gap_seconds=30 * 60)
+        for timestamp in ("2024-01-01T10:00:00Z", None, "2024-01-01T10:10:00Z"):
+            chat_window.add(timestamp)
+
+        self.assertEqual(chat_window.indices(), [0, 2])
+
+
+class TestCurrentChat(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sessions_file_path = os.path.join(self.temp_dir.name, 'sessions.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_current_chat_uses_configured_gap(self):
+        chat_handler = ChatHandler(None, self.sessions_file_path, chat_window_gap_minutes=5)
+        chat_session = chat_handler.create_session("alan", "session")
+        chat_handler.append_memory("alan", "Human", "old question", "2024-01-01T10:00:00Z")
+        chat_handler.append_memory("alan", "AI", "old answer", "2024-01-01T10:01:00Z")
+        chat_handler.append_memory("alan", "Human", "new question", "2024-01-01T10:10:00Z")
+
+        self.assertEqual(chat_session.get_current_chat(),
+                         [{"role": "Human", "message": "new question", "timestamp": "2024-01-01T10:10:00Z"}])
+
+    def test_window_is_rebuilt_when_user_is_reloaded(self):
+        chat_handler = ChatHandler(None, self.sessions_file_path, chat_window_gap_minutes=5)
+        chat_handler.create_session("alan", "session")
+        chat_handler.append_memory("alan", "Human", "old question", "2024-01-01T10:00:00Z")
+        chat_handler.append_memory("alan", "Human", "new question", "2024-01-01T10:10:00Z")
+
+        restarted = ChatHandler(None, self.sessions_file_path, chat_window_gap_minutes=5)
+        chat_session = restarted.create_session("alan", "session")
+
+        self.assertEqual([entry["message"] for entry in chat_session.get_current_chat()], ["new question"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from agent_server.FunctionResponse import FunctionResponse, Status
+from agent_server.function.FunctionDispatcher import FunctionDispatcher
+from agent_server.function.FunctionMapper import FunctionMapper
+from agent_server.function.ToolExecutor import ToolExecutor
+from agent_server.function.ToolResultCache import ToolResultCache
+from agent_server.function.decorators import register_function
+from agent_server.function.exceptions import ToolTimeoutError, ValidationError
+from agent_server.function.functionRegistry import function_registry
+from agent_server.integrations.Metrics import MetricsRegistry
+
+# functions.py builds its LLM clients at import time; point them at an unused mock URL instead of real keys
+with mock.patch.dict(os.environ, {"LLM_MOCK_URL": "http://127.0.0.1:9"}):
+    from agent_server.function import functions
+
+
+class TestFunctionMapper(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        @register_function(name='test_create_items', parameters={'container': 'string', 'items': ['string']})
+        def create_items(container, items):
+            self.calls.append((container, items))
+            return f"Added {len(items)} item(s) to container {container}"
+
+        @register_function(name='test_event_alert', parameters={'message': 'string'})
+        def event_alert(message, session_id):
+            self.calls.append((message, session_id))
+            return "Alert set"
+
+        self.mapper = FunctionMapper()
+
+    def tearDown(self):
+        function_registry.pop('test_create_items', None)
+        function_registry.pop('test_event_alert', None)
+
+    def test_valid_call_is_coerced_and_dispatched(self):
+        result = self.mapper.handle_function_call(
+            {'action': 'test_create_items', 'parameters': {'container': 5, 'items': ' hammer '}}, "session-1")
+
+        self.assertEqual(result, {'action_name': 'test_create_items', 'status': 'SUCCESS',
+                                  'value': "Added 1 item(s) to container 5"})
+        self.assertEqual(self.calls, [("5", ["hammer"])])
+
+    def test_session_id_is_passed_only_to_functions_that_take_it(self):
+        self.mapper.handle_function_call({'action': 'test_event_alert', 'parameters': {'message': 'laundry'}}, "s-2")
+        self.assertEqual(self.calls, [("laundry", "s-2")])
+        self.assertTrue(function_registry['test_event_alert']['dispatcher'].takes_session_id)
+        self.assertFalse(function_registry['test_create_items']['dispatcher'].takes_session_id)
+
+    def test_malformed_parameters_are_rejected_before_the_call(self):
+        cases = [
+            ({'container': '5'}, "Missing required parameter(s) ['items'] for action 'test_create_items'."),
+            ({'container': {'id': 5}, 'items': ['hammer']}, "'container': expected a string, got dict"),
+            ({'container': '5', 'items': ['hammer', None]}, "'items': item 1: expected a string, got NoneType"),
+            ({'container': ' ', 'items': []}, "'container': expected a non-empty string; 'items': expected a non-empty list"),
+            (None, "Parameters for action 'test_create_items' must be an object, got NoneType"),
+        ]
+        for parameters, message in cases:
+            with self.subTest(parameters=parameters):
+                result = self.mapper.handle_function_call(
+                    {'action': 'test_create_items', 'parameters': parameters}, "session-1")
+                self.assertEqual(result['action_name'], 'test_create_items')
+                self.assertIn(message, result['response'])
+        self.assertEqual(self.calls, [])
+
+    def test_unknown_and_missing_actions(self):
+        self.assertEqual(self.mapper.handle_function_call({'parameters': {}}, "s")['action_name'], None)
+        self.assertIn("Unknown action: nope", self.mapper.handle_function_call({'action': 'nope'}, "s")['response'])
+
+
+class TestFunctionDispatcher(unittest.TestCase):
+    def test_schema_is_checked_at_registration(self):
+        with self.assertRaises(TypeError):
+            FunctionDispatcher('bad', lambda when: when, {'when': 'date'})
+
+    def test_parameters_are_checked_against_the_signature(self):
+        with self.assertRaisesRegex(TypeError, r"requires argument\(s\) \['query'\]"):
+            FunctionDispatcher('undeclared', lambda query: query, {})
+        with self.assertRaisesRegex(TypeError, r"declares parameter\(s\) \['items'\]"):
+            FunctionDispatcher('unaccepted', lambda container: container, {'container': 'string', 'items': ['string']})
+
+        # session_id is passed by the mapper, defaults needn't be declared, and **kwargs accepts anything
+        FunctionDispatcher('session', lambda message, session_id: message, {'message': 'string'})
+        FunctionDispatcher('defaults', lambda container, limit=10: container, {'container': 'string'})
+        FunctionDispatcher('kwargs', lambda **kwargs: kwargs, {'container': 'string'})
+
+    def test_scalar_types(self):
+        dispatcher = FunctionDispatcher('typed', lambda count, ratio, enabled: (count, ratio, enabled),
+                                        {'count': 'integer', 'ratio': 'number', 'enabled': 'boolean'})
+        self.assertEqual(dispatcher({'count': '3', 'ratio': 1, 'enabled': 'True'}), (3, 1.0, True))
+        with self.assertRaises(ValidationError):
+            dispatcher({'count': 'three', 'ratio': 1, 'enabled': True})
+
+
+class TestToolExecutor(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+        self.executor = ToolExecutor(max_workers=4, default_timeout=5, retry_backoff=0, metrics=self.metrics)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown()
+
+    def outcomes(self, action):
+        calls = self.metrics.counter("tool_calls_total", "", ("action", "outcome"))
+        return {outcome: calls.value(action=action, outcome=outcome) for outcome in ("success", "error", "timeout")}
+
+    def test_hung_tool_returns_a_timeout_result(self):
+        function_registry['test_hangs'] = {'dispatcher': FunctionDispatcher(
+            'test_hangs', lambda: self.release.wait(), {}, timeout=0.1)}
+        try:
+            started = time.monotonic()
+            result = FunctionMapper(self.executor).handle_function_call({'action': 'test_hangs'}, "s")
+        finally:
+            function_registry.pop('test_hangs')
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(result, {'action_name': 'test_hangs', 'status': 'TIMEOUT',
+                                  'response': "Action 'test_hangs' timed out after 0.1s"})
+        self.assertEqual(self.outcomes('test_hangs')['timeout'], 1)
+
+    def test_concurrency_is_limited_per_tool(self):
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def tool():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        dispatcher = FunctionDispatcher('test_limited', tool, {}, max_concurrency=2)
+        callers = [threading.Thread(target=self.executor.run, args=(dispatcher, {})) for _ in range(4)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(self.outcomes('test_limited')['success'], 4)
+
+    def test_waiting_for_a_slot_counts_against_the_timeout(self):
+        dispatcher = FunctionDispatcher('test_busy', lambda: self.release.wait(), {}, timeout=0.1, max_concurrency=1)
+        with self.assertRaises(ToolTimeoutError):
+            self.executor.run(dispatcher, {})
+        with self.assertRaisesRegex(ToolTimeoutError, "waiting for a free slot"):
+            self.executor.run(dispatcher, {})
+
+        self.release.set()
+        time.sleep(0.05)
+        self.assertTrue(self.executor.run(dispatcher, {}))
+
+    def test_errors_are_retried(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("inventory server unavailable")
+            return "ok"
+
+        self.assertEqual(self.executor.run(FunctionDispatcher('test_flaky', flaky, {}, retries=2), {}), "ok")
+        self.assertEqual(self.outcomes('test_flaky'), {"success": 1, "error": 2, "timeout": 0})
+
+        attempts.clear()
+        with self.assertRaises(ConnectionError):
+            self.executor.run(FunctionDispatcher('test_no_retry', flaky, {}), {})
+        self.assertEqual(len(attempts), 1)
+
+    def test_knowledge_query_is_dispatched_with_its_limits(self):
+        dispatcher = function_registry['knowledge_query']['dispatcher']
+        answer = FunctionResponse(Status.SUCCESS, "Broadway")
+        with mock.patch.object(functions.knowledge_query_service, 'query', return_value=answer) as query:
+            result = FunctionMapper(self.executor, ToolResultCache()).handle_function_call(
+                {'action': 'knowledge_query', 'parameters': {'query': "What is the main street in Denver?"}}, "s")
+
+        query.assert_called_once_with("What is the main street in Denver?")
+        self.assertEqual(result, {'action_name': 'knowledge_query', 'status': 'SUCCESS', 'value': "Broadway"})
+        self.assertEqual(self.outcomes('knowledge_query')['success'], 1)
+        self.assertEqual((dispatcher.timeout, dispatcher.max_concurrency), (60, 2))
+        self.assertNotIn('start_session', function_registry)
+
+
+if __name__ == '__main__':
+    unittest.main()
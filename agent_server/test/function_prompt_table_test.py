@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from agent_server.agent.FunctionPromptTable import FunctionPromptTable, build_system_message
+from agent_server.agent.JsonFunctionCreator import JsonFunctionCreator
+from agent_server.agent.UnknownFunctionError import UnknownFunctionError
+from agent_server.function import FunctionName as function_name_module
+from agent_server.function.FunctionName import DEFINITIONS_DIR, FunctionName
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.system_messages = []
+
+    def generate_response(self, prompt, system_message):
+        self.system_messages.append(system_message)
+        return '{"action": "get_container", "parameters": {"container_id": "5"}}'
+
+
+class TestFunctionPromptTable(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for name in os.listdir(DEFINITIONS_DIR):
+            shutil.copy(os.path.join(DEFINITIONS_DIR, name), self.temp_dir)
+        self.definitions_dir = mock.patch.object(function_name_module, "DEFINITIONS_DIR", self.temp_dir)
+        self.definitions_dir.start()
+
+    def tearDown(self):
+        self.definitions_dir.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def _definition(self, name):
+        with open(os.path.join(self.temp_dir, f"{name}.txt")) as file:
+            return file.read()
+
+    def test_every_function_has_a_prebuilt_prompt(self):
+        table = FunctionPromptTable()
+        for function in FunctionName:
+            self.assertEqual(table.system_message(function.function_name),
+                             build_system_message(self._definition(function.function_name)))
+
+    def test_creating_a_call_does_not_touch_the_filesystem(self):
+        llm = RecordingLLM()
+        creator = JsonFunctionCreator(llm, FunctionPromptTable())
+
+        with mock.patch("builtins.open", side_effect=AssertionError("read a file")), \
+                mock.patch("os.stat", side_effect=AssertionError("stat a file")):
+            result = creator.create_json("get_container", "show me what I keep in box number 5")
+
+        self.assertEqual(result["parameters"], {"container_id": "5"})
+        self.assertIn(self._definition("get_container"), llm.system_messages[0])
+
+    def test_reload_picks_up_changed_definitions_only(self):
+        table = FunctionPromptTable()
+        self.assertFalse(table.reload())
+
+        path = os.path.join(self.temp_dir, "get_container.txt")
+        with open(path, "a") as file:
+            file.write("\nAlways include the container_id.")
+        future = time.time() + 10
+        os.utime(path, (future, future))
+
+        self.assertTrue(table.reload())
+        self.assertIn("Always include the container_id.", table.system_message("get_container"))
+
+    def test_missing_definition_fails_only_when_used(self):
+        os.remove(os.path.join(self.temp_dir, "knowledge_query.txt"))
+        table = FunctionPromptTable()
+
+        self.assertIn("get_container", table)
+        with self.assertRaises(ValueError):
+            table.system_message("knowledge_query")
+
+    def test_unknown_functions_are_rejected(self):
+        creator = JsonFunctionCreator(RecordingLLM(), FunctionPromptTable())
+        with self.assertRaises(UnknownFunctionError):
+            creator.create_json("launch_rocket", "now")
+        self.assertIs(FunctionName.from_function_name("find_location"), FunctionName.FIND_LOCATION)
+        self.assertIsNone(FunctionName.from_function_name("FIND_LOCATION"))
+
+
+if __name__ == '__main__':
+    unittest.main()
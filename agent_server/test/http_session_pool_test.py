@@ -0,0 +1,61 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agent_server.llms.HttpSessionPool import HttpSessionPool
+from agent_server.llms.RestLLM import RestLLM
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"response": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_is_reused_across_requests(self):
+        pool = HttpSessionPool()
+        for _ in range(3):
+            pool.post(f"{self.url}/generate", json={}).raise_for_status()
+
+        stats = pool.stats()
+        self.assertEqual((stats["requests"], stats["hits"], stats["misses"]), (3, 2, 1))
+        pool.close()
+
+    def test_keep_alive_can_be_disabled(self):
+        pool = HttpSessionPool(keep_alive=False)
+        for _ in range(2):
+            pool.post(f"{self.url}/generate", json={}).raise_for_status()
+
+        self.assertEqual(pool.stats()["misses"], 2)
+        pool.close()
+
+    def test_llm_clients_share_the_process_pool(self):
+        first, second = RestLLM(self.url), RestLLM(self.url)
+
+        self.assertIs(first.http, second.http)
+        self.assertEqual(first.generate_response("prompt", "system"), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import threading
+import time
+import unittest
+
+from agent_server.integrations.JobScheduler import JobScheduler, QueueFullError
+
+
+class TestJobScheduler(unittest.TestCase):
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_jobs_for_same_key_run_in_order(self):
+        self.scheduler = JobScheduler(workers=4, max_queue_depth=0)
+        results = []
+        done = threading.Event()
+
+        for index in range(20):
+            self.scheduler.submit("session", lambda i=index: (time.sleep(0.001), results.append(i)))
+        self.scheduler.submit("session", done.set)
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(results, list(range(20)))
+
+    def test_different_keys_run_concurrently(self):
+        self.scheduler = JobScheduler(workers=2, max_queue_depth=0)
+        barrier = threading.Barrier(2, timeout=2)
+        passed = []
+
+        for key in ("a", "b"):
+            self.scheduler.submit(key, lambda: passed.append(barrier.wait()))
+
+        self.scheduler.shutdown()
+        self.assertEqual(len(passed), 2)
+
+    def test_submit_raises_when_queue_is_full(self):
+        self.scheduler = JobScheduler(workers=1, max_queue_depth=2)
+        release = threading.Event()
+        started = threading.Event()
+
+        self.scheduler.submit("a", lambda: (started.set(), release.wait(2)))
+        self.assertTrue(started.wait(2))
+        self.scheduler.submit("a", lambda: None)
+        self.scheduler.submit("b", lambda: None)
+
+        with self.assertRaises(QueueFullError):
+            self.scheduler.submit("c", lambda: None)
+        self.assertEqual(self.scheduler.queue_depth(), 2)
+
+        release.set()
+
+    def test_failing_job_does_not_stop_worker(self):
+        self.scheduler = JobScheduler(workers=1, max_queue_depth=0)
+        done = threading.Event()
+
+        self.scheduler.submit("session", lambda: 1 / 0)
+        self.scheduler.submit("session", done.set)
+
+        self.assertTrue(done.wait(2))
+
+    def test_limited_key_runs_jobs_concurrently_up_to_its_limit(self):
+        self.scheduler = JobScheduler(workers=4, max_queue_depth=0)
+        running, peak, lock = [0], [0], threading.Lock()
+        started = []
+
+        def job(index):
+            with lock:
+                started.append(index)
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        for index in range(6):
+            self.scheduler.submit_limited("session", 2, job, index)
+        self.scheduler.shutdown()
+
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(started, list(range(6)))
+
+    def test_round_robin_is_per_key_not_per_running_job(self):
+        self.scheduler = JobScheduler(workers=1, max_queue_depth=0)
+        release = threading.Event()
+        order = []
+
+        self.scheduler.submit("blocker", release.wait, 2)
+        for index in range(3):
+            self.scheduler.submit_limited("lookahead", 3, order.append, f"lookahead-{index}")
+        for index in range(3):
+            self.scheduler.submit("plain", order.append, f"plain-{index}")
+        release.set()
+        self.scheduler.shutdown()
+
+        self.assertEqual(order, ["lookahead-0", "plain-0", "lookahead-1", "plain-1", "lookahead-2", "plain-2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+from agent_server.agent.JsonFormatEnforcer import JsonFormatEnforcer
+from agent_server.agent.JsonFunctionCreator import JsonFunctionCreator
+from agent_server.agent.JsonRepair import JsonRepairError, parse_json, repair_json
+from agent_server.integrations.Metrics import get_metrics
+
+
+class RecordingLLM:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def generate_response(self, prompt, system_message):
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+def parse_count(source, strategy):
+    return get_metrics().counter("json_parse_total", "", ("source", "strategy")).value(source=source, strategy=strategy)
+
+
+class TestRepairJson(unittest.TestCase):
+    def test_common_llm_mistakes_are_repaired_locally(self):
+        cases = [
+            ('{"action": "find_location"}', {"action": "find_location"}, "strict"),
+            ('```json\n{"action": "find_location"}\n```', {"action": "find_location"}, "fenced"),
+            ('Here is the JSON you asked for:\n{"is_answered": true} Let me know!', {"is_answered": True}, "extracted"),
+            ("{'action': 'get_container', 'parameters': {'container_id': '5',},}",
+             {"action": "get_container", "parameters": {"container_id": "5"}}, "cleaned"),
+            ('{"is_answered": True, "answer": None}', {"is_answered": True, "answer": None}, "cleaned"),
+            ('{"action": "find_location", "parameters": {"item_name": "screw',
+             {"action": "find_location", "parameters": {"item_name": "screw"}}, "closed"),
+            ('[{"action": "get_container"}, {"action": "get_inventory"},',
+             [{"action": "get_container"}, {"action": "get_inventory"}], "closed"),
+        ]
+        for text, expected, strategy in cases:
+            with self.subTest(text=text):
+                self.assertEqual(repair_json(text), (expected, strategy))
+
+    def test_quotes_inside_strings_survive(self):
+        value, _ = repair_json("{'answer': 'It\\'s in the \"red\" bin', 'note': \"don't move it\"}")
+        self.assertEqual(value, {"answer": "It's in the \"red\" bin", "note": "don't move it"})
+
+    def test_text_without_json_is_rejected(self):
+        with self.assertRaises(JsonRepairError):
+            repair_json("I could not find the screwdriver.")
+        with self.assertRaises(JsonRepairError):
+            repair_json('{action: find_location}')
+
+
+class TestParseJson(unittest.TestCase):
+    def test_llm_repair_is_only_a_last_resort(self):
+        calls = []
+
+        def llm_repair(text):
+            calls.append(text)
+            return '{"fixed": true}'
+
+        self.assertEqual(parse_json('```json\n{"a": 1,}\n```', "test_source", llm_repair), {"a": 1})
+        self.assertEqual(calls, [])
+        self.assertEqual(parse_json("{unquoted: keys}", "test_source", llm_repair), {"fixed": True})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(parse_count("test_source", "cleaned"), 1)
+        self.assertEqual(parse_count("test_source", "llm"), 1)
+
+    def test_failures_are_counted(self):
+        with self.assertRaises(JsonRepairError):
+            parse_json("nothing here", "failing_source")
+        self.assertEqual(parse_count("failing_source", "failed"), 1)
+
+
+class TestCallersUseLocalRepair(unittest.TestCase):
+    def test_function_creator_skips_the_format_call(self):
+        llm = RecordingLLM('Sure:\n```json\n{"action": "get_inventory", "parameters": {},}\n```')
+        self.assertEqual(JsonFunctionCreator(llm).create_json("get_inventory", "show me everything"),
+                         {"action": "get_inventory", "parameters": {}})
+        self.assertEqual(len(llm.prompts), 1)
+
+    def test_format_enforcer_returns_valid_json_text(self):
+        llm = RecordingLLM("{'is_answered': False}")
+        self.assertEqual(JsonFormatEnforcer(llm).create_json('{"is_answered": bool}', "not answered yet"),
+                         '{"is_answered": false}')
+        self.assertEqual(len(llm.prompts), 1)
+
+    def test_format_enforcer_falls_back_to_the_llm(self):
+        llm = RecordingLLM("The answer is not known", '{"is_answered": false}')
+        self.assertEqual(JsonFormatEnforcer(llm).create_json('{"is_answered": bool}', "not answered yet"),
+                         '{"is_answered": false}')
+        self.assertEqual(len(llm.prompts), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from agent_server.integrations.ChatHandler import ChatHandler
+from agent_server.integrations.FileSessionStore import FileSessionStore
+from agent_server.integrations.JobScheduler import JobScheduler
+from agent_server.integrations.Metrics import MetricsRegistry
+from agent_server.integrations.ServerMetrics import register_server_metrics
+from agent_server.integrations.StreamManager import StreamManager
+from agent_server.llms.CachingLLM import model_identity
+from agent_server.llms.LLMInterface import LLMInterface
+from agent_server.llms.MeteredLLM import MeteredLLM
+
+
+class FakeLLM(LLMInterface):
+    model = "fake-model"
+
+    def generate_response(self, prompt, system_message):
+        if prompt == "fail":
+            raise ConnectionError("down")
+        return "ok"
+
+    def stream_response(self, prompt, system_message):
+        yield "Hello"
+        yield LLMInterface.END_STREAM
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_renders_prometheus_text_format(self):
+        metrics = MetricsRegistry()
+        metrics.counter("llm_calls_total", "LLM calls", ("model",)).inc(model="FIREWORKS")
+        metrics.gauge("agent_open_audio_streams", "Audio listeners").inc()
+        latency = metrics.histogram("tts_synthesis_seconds", "TTS latency", ("source",), buckets=(0.1, 1.0))
+        latency.observe(0.05, source="api")
+        latency.observe(0.5, source="api")
+
+        lines = metrics.render().splitlines()
+
+        self.assertIn("# TYPE llm_calls_total counter", lines)
+        self.assertIn('llm_calls_total{model="FIREWORKS"} 1', lines)
+        self.assertIn("agent_open_audio_streams 1", lines)
+        self.assertIn('tts_synthesis_seconds_bucket{source="api",le="0.1"} 1', lines)
+        self.assertIn('tts_synthesis_seconds_bucket{source="api",le="1"} 2', lines)
+        self.assertIn('tts_synthesis_seconds_bucket{source="api",le="+Inf"} 2', lines)
+        self.assertIn('tts_synthesis_seconds_count{source="api"} 2', lines)
+        self.assertIn('tts_synthesis_seconds_sum{source="api"} 0.55', lines)
+
+    def test_metrics_are_shared_by_name(self):
+        metrics = MetricsRegistry()
+        self.assertIs(metrics.counter("react_retries_total", "Retries"), metrics.counter("react_retries_total", "Retries"))
+        with self.assertRaises(ValueError):
+            metrics.gauge("react_retries_total", "Retries")
+
+    def test_label_values_are_escaped(self):
+        metrics = MetricsRegistry()
+        metrics.counter("events_total", "Events", ("name",)).inc(name='say "hi"\n')
+        self.assertIn('events_total{name="say \\"hi\\"\\n"} 1', metrics.render())
+
+
+class TestMeteredLLM(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsRegistry()
+        self.llm = MeteredLLM(FakeLLM(), "FIREWORKS_LLAMA_3_1_405B", metrics=self.metrics)
+        self.calls = self.metrics.counter("llm_calls_total", "", ("model", "method", "outcome"))
+        self.latency = self.metrics.histogram("llm_call_duration_seconds", "", ("model", "method"))
+
+    def test_counts_calls_and_failures_per_model(self):
+        self.llm.generate_response("hi", "system")
+        with self.assertRaises(ConnectionError):
+            self.llm.generate_response("fail", "system")
+
+        model = "FIREWORKS_LLAMA_3_1_405B"
+        self.assertEqual(self.calls.value(model=model, method="generate", outcome="ok"), 1)
+        self.assertEqual(self.calls.value(model=model, method="generate", outcome="error"), 1)
+        self.assertEqual(self.latency.value(model=model, method="generate")[0], 2)
+
+    def test_streams_are_timed_to_the_last_chunk(self):
+        self.assertEqual(list(self.llm.stream_response("hi", "system")), ["Hello", LLMInterface.END_STREAM])
+        partial = self.llm.stream_response("hi", "system")
+        next(partial)
+        partial.close()
+
+        model = "FIREWORKS_LLAMA_3_1_405B"
+        self.assertEqual(self.calls.value(model=model, method="stream", outcome="ok"), 1)
+        self.assertEqual(self.calls.value(model=model, method="stream", outcome="cancelled"), 1)
+        first_chunk = self.metrics.histogram("llm_time_to_first_chunk_seconds", "", ("model", "method"))
+        self.assertEqual(first_chunk.value(model=model, method="stream")[0], 2)
+
+    def test_async_calls_are_metered(self):
+        self.assertEqual(asyncio.run(self.llm.agenerate_response("hi", "system")), "ok")
+        self.assertEqual(self.calls.value(model="FIREWORKS_LLAMA_3_1_405B", method="agenerate", outcome="ok"), 1)
+
+    def test_wrapper_is_transparent_to_callers(self):
+        self.assertEqual(self.llm.model, "fake-model")
+        self.assertEqual(model_identity(self.llm), model_identity(FakeLLM()))
+
+
+class TestServerMetrics(unittest.TestCase):
+    def test_collects_sessions_streams_and_queue_depths(self):
+        metrics = MetricsRegistry()
+        stream_manager = StreamManager()
+        stream_manager.listen_to_text_stream("abc")
+        stream_manager.add_to_text_buffer("abc", "Hello")
+        scheduler = JobScheduler(workers=1, name="metrics-test")
+        try:
+            register_server_metrics(stream_manager, {"abc": "alan"}, scheduler, metrics=metrics)
+            lines = metrics.render().splitlines()
+        finally:
+            scheduler.shutdown()
+
+        self.assertIn("agent_active_sessions 1", lines)
+        self.assertIn("agent_open_text_streams 1", lines)
+        self.assertIn('stream_buffer_items{session_id="abc",stream="text"} 1', lines)
+        self.assertIn('job_queue_depth{scheduler="agent"} 0', lines)
+        self.assertIn("# TYPE llm_response_cache_lookups_total counter", lines)
+
+    def test_session_writes_are_timed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sessions.json')
+            chat_handler = ChatHandler(None, path, store=FileSessionStore(path))
+            chat_handler.create_session("alan", "session").store_human_context("where is my drill?")
+
+            count, _ = chat_handler.save_latency.value(store="FileSessionStore", operation="append_history")
+        self.assertGreaterEqual(count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
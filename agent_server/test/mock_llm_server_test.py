@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from werkzeug.serving import make_server
+
+from agent_server.llms.LLMFactory import LLMFactory, ModelType
+from agent_server.llms.LLMInterface import LLMInterface
+from agent_server.llms.TranscriptReplayer import TranscriptReplayer
+from agent_server.mock_llm_server import create_app
+
+
+class MockServerTestCase(unittest.TestCase):
+    transcript = [
+        {"prompt": "ping", "response": "pong"},
+        {"response": "First scripted reply."},
+        {"response": {"action": "none"}},
+    ]
+    app_options = {}
+
+    def setUp(self):
+        options = dict(tokens_per_second=0, ttft_ms=0)
+        options.update(self.app_options)
+        self.server = make_server("127.0.0.1", 0, create_app(TranscriptReplayer(self.transcript), **options),
+                                  threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.env = mock.patch.dict(os.environ, {"LLM_MOCK_URL": self.url})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.server.shutdown()
+
+
+class TestMockLLMServer(MockServerTestCase):
+    def test_factory_points_models_at_the_mock(self):
+        llm = LLMFactory.create_llm(ModelType.FIREWORKS_LLAMA_3_1_405B)
+
+        self.assertEqual(llm.generate_response("ping", "system"), "pong")
+        self.assertEqual(llm.generate_response("anything", "system"), "First scripted reply.")
+        self.assertEqual(llm.generate_response("anything", "system"), '{"action": "none"}')
+
+    def test_streamed_tokens_join_back_to_the_response(self):
+        llm = LLMFactory.create_llm(ModelType.FIREWORKS_LLAMA_3_1_8B)
+
+        chunks = list(llm.stream_response("anything", "system"))
+
+        self.assertEqual(chunks[-1], LLMInterface.END_STREAM)
+        self.assertEqual("".join(chunks[:-1]), "First scripted reply.")
+        self.assertGreater(len(chunks), 2)
+
+    def test_ollama_and_openai_sdk_clients(self):
+        self.assertEqual(LLMFactory.create_llm(ModelType.OLLAMA_QWEN).generate_response("ping", "system"), "pong")
+        self.assertEqual(LLMFactory.create_llm(ModelType.OPTILLM).generate_response("ping", "system"), "pong")
+
+    def test_only_listed_models_are_redirected(self):
+        with mock.patch.dict(os.environ, {"LLM_MOCK_MODELS": "OLLAMA_QWEN"}):
+            self.assertIsNotNone(LLMFactory.mock_url_for(ModelType.OLLAMA_QWEN))
+            self.assertIsNone(LLMFactory.mock_url_for(ModelType.CHATGPT4))
+
+
+class TestMockLLMServerTiming(MockServerTestCase):
+    app_options = {"tokens_per_second": 100, "ttft_ms": 50}
+
+    def test_time_to_first_token_and_token_rate(self):
+        llm = LLMFactory.create_llm(ModelType.FIREWORKS_LLAMA_3_1_8B)
+
+        started = time.monotonic()
+        chunks = llm.stream_response("anything", "system")
+        next(chunks)
+        first_token = time.monotonic() - started
+        list(chunks)
+        total = time.monotonic() - started
+
+        self.assertGreaterEqual(first_token, 0.05)
+        self.assertGreaterEqual(total, 0.05 + 2 / 100)
+
+
+class TestMockLLMServerErrors(MockServerTestCase):
+    app_options = {"error_rate": 1.0, "error_status": 503}
+
+    def test_injected_errors_reach_the_client(self):
+        with self.assertRaisesRegex(Exception, "503"):
+            LLMFactory.create_llm(ModelType.FIREWORKS_LLAMA_3_1_8B).generate_response("ping", "system")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,277 @@
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from agent_server.tts.AudioCache import AudioCache
+from agent_server.tts.OpenAITTS import OpenAITTS
+from agent_server.tts.OrderedAudioSink import OrderedAudioSink
+
+
+class FakeOpenAITTS(OpenAITTS):
+    """OpenAITTS with the network call replaced by a short sleep that echoes the sentence."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("stream_pcm", False)
+        kwargs.setdefault("audio_cache", AudioCache(max_entries=0))
+        super().__init__(**kwargs)
+
+    def play_audio_stream(self, text: str):
+        time.sleep(0.01)
+        return np.frombuffer(text.encode(), dtype=np.uint8), 24000
+
+
+class SlowFirstOpenAITTS(FakeOpenAITTS):
+    """Earlier sentences take longer, and concurrent synthesis is counted."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def play_audio_stream(self, text: str):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.1 / int(text.strip(" .")))
+        with self.lock:
+            self.in_flight -= 1
+        return np.frombuffer(text.encode(), dtype=np.uint8), 24000
+
+
+class FakePcmResponse:
+    """Stands in for the streamed speech response, delivering PCM in unevenly sized chunks."""
+
+    def __init__(self, pcm: bytes, chunk_sizes):
+        self.pcm = pcm
+        self.chunk_sizes = chunk_sizes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def iter_bytes(self, chunk_size=None):
+        offset = 0
+        for size in self.chunk_sizes:
+            yield self.pcm[offset:offset + size]
+            offset += size
+
+
+def fake_speech_client(response):
+    create = lambda **kwargs: response
+    streaming = SimpleNamespace(create=create)
+    return SimpleNamespace(audio=SimpleNamespace(speech=SimpleNamespace(with_streaming_response=streaming)))
+
+
+class StalledBuffer:
+    """An audio buffer whose first put blocks until released, like a listener that stopped reading."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.items = []
+
+    def put(self, item):
+        self.entered.set()
+        self.release.wait(2)
+        self.items.append(item)
+
+
+def drain(audio_buffer, count):
+    return [audio_buffer.get(timeout=2)[0].tobytes().decode() for _ in range(count)]
+
+
+class TestOpenAITTS(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("API_KEY", "test-key")
+
+    def test_sentences_are_split_and_kept_in_order(self):
+        tts = FakeOpenAITTS()
+        for fragment in ("Hello", " there.", " How", " are you?", " Fine!"):
+            tts.add_text_to_queue(fragment)
+
+        self.assertEqual(drain(tts.get_audio_buffer(), 3), ["Hello there.", " How are you?", " Fine!"])
+
+    def test_lookahead_synthesizes_concurrently_in_order(self):
+        tts = SlowFirstOpenAITTS(lookahead=2)
+        for index in range(1, 7):
+            tts.add_text_to_queue(f" {index}.")
+
+        self.assertEqual(drain(tts.get_audio_buffer(), 6), [f" {index}." for index in range(1, 7)])
+        self.assertGreater(tts.max_in_flight, 1)
+        self.assertLessEqual(tts.max_in_flight, 3)
+
+    def test_sessions_do_not_start_threads(self):
+        threads_before = threading.active_count()
+
+        sessions = [FakeOpenAITTS() for _ in range(20)]
+        for index, tts in enumerate(sessions):
+            tts.add_text_to_queue(f"Session {index}.")
+
+        for index, tts in enumerate(sessions):
+            self.assertEqual(drain(tts.get_audio_buffer(), 1), [f"Session {index}."])
+        self.assertLessEqual(threading.active_count() - threads_before, int(os.getenv('TTS_WORKERS', '4')))
+
+    def test_stop_skips_pending_sentences(self):
+        tts = FakeOpenAITTS()
+        tts.stop()
+        tts.add_text_to_queue("Too late.")
+
+        with self.assertRaises(queue.Empty):
+            tts.get_audio_buffer().get(timeout=0.1)
+
+    def test_pcm_stream_is_emitted_in_fixed_size_frames(self):
+        samples = np.arange(1000, dtype=np.int16)
+        tts = OpenAITTS(stream_pcm=True, frame_ms=10, audio_cache=AudioCache())  # 240 samples per frame
+        tts.client = fake_speech_client(FakePcmResponse(samples.tobytes() + b"\x01", [333, 901, 767]))
+
+        tts.add_text_to_queue("Hello.")
+
+        frames = [tts.get_audio_buffer().get(timeout=2) for _ in range(5)]
+        self.assertEqual([len(frame) for frame, _ in frames], [240, 240, 240, 240, 40])
+        self.assertEqual({sample_rate for _, sample_rate in frames}, {24000})
+        np.testing.assert_array_equal(np.concatenate([frame for frame, _ in frames]), samples)
+
+    def test_repeated_sentence_is_served_from_cache(self):
+        samples = np.arange(480, dtype=np.int16)
+        audio_cache = AudioCache()
+        tts = OpenAITTS(stream_pcm=True, frame_ms=10, audio_cache=audio_cache)
+        tts.client = fake_speech_client(FakePcmResponse(samples.tobytes(), [samples.nbytes]))
+        tts.synthesize_sentence(0, "Event put on stream.")
+
+        repeat = OpenAITTS(stream_pcm=True, frame_ms=10, audio_cache=audio_cache)
+        repeat.client = None  # Any network call would fail
+        repeat.add_text_to_queue("Event  put on stream. ")
+
+        frames = [repeat.get_audio_buffer().get(timeout=2) for _ in range(2)]
+        np.testing.assert_array_equal(np.concatenate([frame for frame, _ in frames]), samples)
+        self.assertEqual(audio_cache.stats()["hits"], 1)
+
+
+class TestAudioCache(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        audio_cache = AudioCache(max_entries=2)
+        for text in ("one", "two"):
+            audio_cache.put(text, "alloy", "tts-1", 24000, np.zeros(10, dtype=np.int16))
+        audio_cache.get("one", "alloy", "tts-1", 24000)
+        audio_cache.put("three", "alloy", "tts-1", 24000, np.zeros(10, dtype=np.int16))
+
+        self.assertIsNotNone(audio_cache.get("one", "alloy", "tts-1", 24000))
+        self.assertIsNone(audio_cache.get("two", "alloy", "tts-1", 24000))
+        self.assertEqual(audio_cache.stats()["bytes"], 40)
+
+    def test_voice_is_part_of_the_key(self):
+        audio_cache = AudioCache()
+        audio_cache.put("Hello.", "alloy", "tts-1", 24000, np.zeros(10, dtype=np.int16))
+
+        self.assertIsNone(audio_cache.get("Hello.", "nova", "tts-1", 24000))
+
+    def test_disk_tier_survives_a_new_cache(self):
+        samples = np.arange(100, dtype=np.int16)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            AudioCache(cache_dir=cache_dir).put("Hello.", "alloy", "tts-1", 24000, samples)
+
+            reloaded = AudioCache(cache_dir=cache_dir)
+            np.testing.assert_array_equal(reloaded.get("Hello.", "alloy", "tts-1", 24000), samples)
+            self.assertEqual(reloaded.stats()["disk_hits"], 1)
+
+    def test_disk_tier_is_capped_least_recently_used_first(self):
+        samples = np.zeros(50, dtype=np.int16)  # 100 bytes per file
+        with tempfile.TemporaryDirectory() as cache_dir:
+            audio_cache = AudioCache(max_entries=0, cache_dir=cache_dir, max_disk_bytes=250)
+            for text in ("one", "two"):
+                audio_cache.put(text, "alloy", "tts-1", 24000, samples)
+            audio_cache.get("one", "alloy", "tts-1", 24000)
+            audio_cache.put("three", "alloy", "tts-1", 24000, samples)
+
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            self.assertEqual(audio_cache.stats()["disk_bytes"], 200)
+            self.assertIsNone(audio_cache.get("two", "alloy", "tts-1", 24000))
+            self.assertIsNotNone(audio_cache.get("one", "alloy", "tts-1", 24000))
+
+            # A restart with a smaller cap trims what is already on disk, oldest use first
+            past = time.time() - 60
+            os.utime(os.path.join(cache_dir, f"{AudioCache.key('three', 'alloy', 'tts-1', 24000)}.pcm"), (past, past))
+            reloaded = AudioCache(max_entries=0, cache_dir=cache_dir, max_disk_bytes=150)
+            self.assertEqual(reloaded.stats()["disk_bytes"], 100)
+            self.assertIsNotNone(reloaded.get("one", "alloy", "tts-1", 24000))
+            self.assertIsNone(reloaded.get("three", "alloy", "tts-1", 24000))
+
+
+class TestOrderedAudioSink(unittest.TestCase):
+    def test_chunks_are_released_in_sentence_order(self):
+        audio_buffer = queue.Queue()
+        sink = OrderedAudioSink(audio_buffer)
+
+        sink.emit(1, "b1")
+        sink.emit(0, "a1")
+        sink.emit(1, "b2")
+        sink.finish(1)
+        sink.emit(0, "a2")
+        sink.finish(0)
+        sink.finish(2)
+        sink.emit(3, "d1")
+
+        self.assertEqual([audio_buffer.get_nowait() for _ in range(5)], ["a1", "a2", "b1", "b2", "d1"])
+
+    def test_stalled_listener_only_holds_up_the_delivering_thread(self):
+        audio_buffer = StalledBuffer()
+        sink = OrderedAudioSink(audio_buffer)
+        head = threading.Thread(target=sink.emit, args=(0, "a1"))
+        head.start()
+        self.assertTrue(audio_buffer.entered.wait(1))
+
+        started = time.monotonic()
+        sink.emit(1, "b1")
+        sink.emit(0, "a2")
+        sink.finish(0)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        audio_buffer.release.set()
+        head.join(1)
+        self.assertEqual(audio_buffer.items, ["a1", "a2", "b1"])
+
+    def test_held_chunks_are_capped(self):
+        audio_buffer = queue.Queue()
+        sink = OrderedAudioSink(audio_buffer, max_pending=2)
+        for chunk in ("b1", "b2", "b3"):
+            sink.emit(1, chunk)
+        sink.finish(0)
+
+        self.assertEqual([audio_buffer.get_nowait() for _ in range(2)], ["b1", "b2"])
+        self.assertEqual(sink.stats(), {"pending": 0, "outbox": 0, "dropped": 1})
+
+    def test_nothing_is_delivered_after_close(self):
+        audio_buffer = StalledBuffer()
+        sink = OrderedAudioSink(audio_buffer)
+        head = threading.Thread(target=sink.emit, args=(0, "a1"))
+        head.start()
+        self.assertTrue(audio_buffer.entered.wait(1))
+        sink.emit(0, "a2")
+        sink.emit(1, "b1")
+
+        closer = threading.Thread(target=sink.close)
+        closer.start()
+        closer.join(0.1)
+        self.assertTrue(closer.is_alive())  # waits for the put in progress
+        audio_buffer.release.set()
+        closer.join(1)
+        audio_buffer.put(None)
+        sink.finish(0)
+        sink.emit(1, "b2")
+        head.join(1)
+
+        self.assertEqual(audio_buffer.items, ["a1", None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import unittest
+from unittest import mock
+
+from agent_server.agent.JsonFunctionCreator import JsonFunctionCreator
+from agent_server.agent.ParameterExtractor import ParameterExtractor
+
+# functions.py builds its LLM clients at import time; point them at an unused mock URL instead of real keys
+with mock.patch.dict(os.environ, {"LLM_MOCK_URL": "http://127.0.0.1:9"}):
+    from agent_server.InventoryFunctionGenerator import InventoryFunctionGenerator
+    from agent_server.function.functionRegistry import function_registry
+    import agent_server.function.functions  # noqa: F401 - registers the functions and their examples
+
+
+class RecordingLLM:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def generate_response(self, prompt, system_message):
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+class TestParameterExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = ParameterExtractor(min_confidence=0.8, registry=function_registry)
+
+    def test_requests_shaped_like_the_examples_are_filled_locally(self):
+        cases = [
+            ("get_container", "what's in container 5", {"container_id": "5"}),
+            ("get_container", "What’s in container 12?", {"container_id": "12"}),
+            ("find_location", "where is my screwdriver", {"item_name": "screwdriver"}),
+            ("find_location", "Where is the socket wrench?", {"item_name": "socket wrench"}),
+            ("get_inventory", "Retrieve the entire inventory.", {}),
+        ]
+        for function_name, request, expected in cases:
+            with self.subTest(request=request):
+                parameters, confidence = self.extractor.extract(function_name, request)
+                self.assertEqual(parameters, expected)
+                self.assertGreaterEqual(confidence, 0.8)
+
+    def test_writes_fall_back_unless_fully_confident(self):
+        cases = [
+            ("create_items", "add a hammer to container 5"),
+            ("create_items", "in container 7 add a drill, wood glue and a fan"),
+            ("delete_items", "remove the phone from container 6"),
+            ("delete_items", "remove everything from container 10"),
+        ]
+        for function_name, request in cases:
+            with self.subTest(request=request):
+                parameters, confidence = self.extractor.extract(function_name, request)
+                self.assertIsNone(parameters)
+                self.assertLess(confidence, 1.0)
+
+    def test_numeric_slots_are_fully_confident(self):
+        self.assertEqual(self.extractor.extract("get_container", "what's in container 5")[1], 1.0)
+
+    def test_unfamiliar_or_ambiguous_requests_fall_back(self):
+        cases = [
+            ("get_container", "what's in the big blue container"),
+            ("find_location", "where is my screwdriver and the hammer"),
+            ("find_location", "where is the thing I used to fix the sink last week"),
+            ("create_items", "put a hammer in container 5"),
+            ("event_alert_action", "remind me to put in the laundry when I get home"),
+            ("no_such_function", "what's in container 5"),
+        ]
+        for function_name, request in cases:
+            with self.subTest(request=request):
+                parameters, confidence = self.extractor.extract(function_name, request)
+                self.assertIsNone(parameters)
+                self.assertLess(confidence, 0.8)
+
+    def test_match_picks_the_function(self):
+        self.assertEqual(self.extractor.match("where is my screwdriver"),
+                         ("find_location", {"item_name": "screwdriver"}, 1.0 * 0.95))
+        self.assertEqual(self.extractor.match("remove everything from container 10")[:2], (None, None))
+        self.assertEqual(self.extractor.match("tell me a joke")[:2], (None, None))
+
+    def test_hits_and_misses_are_counted(self):
+        self.extractor.extract("get_container", "what's in container 5")
+        self.extractor.extract("get_container", "what's in the garage")
+        self.extractor.match("tell me a joke")
+
+        stats = self.extractor.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertEqual(stats["functions"]["get_container"], {"hits": 1, "misses": 1})
+        self.assertEqual(stats["functions"]["unmatched"], {"hits": 0, "misses": 1})
+
+
+class TestCallersSkipTheLLM(unittest.TestCase):
+    def setUp(self):
+        self.extractor = ParameterExtractor(min_confidence=0.8, registry=function_registry)
+
+    def test_function_creator(self):
+        llm = RecordingLLM('{"action": "find_location", "parameters": {"item_name": "hammer"}}')
+        creator = JsonFunctionCreator(llm, parameter_extractor=self.extractor)
+
+        self.assertEqual(creator.create_json("get_container", "what's in container 5"),
+                         {"action": "get_container", "parameters": {"container_id": "5"}})
+        self.assertEqual(llm.prompts, [])
+        self.assertEqual(creator.create_json("find_location", "which bin did I leave the hammer in"),
+                         {"action": "find_location", "parameters": {"item_name": "hammer"}})
+        self.assertEqual(len(llm.prompts), 1)
+
+    def test_function_creator_leaves_writes_to_the_llm(self):
+        llm = RecordingLLM('{"action": "delete_items", "parameters": {"container": "10", "items": []}}')
+        creator = JsonFunctionCreator(llm, parameter_extractor=self.extractor)
+
+        self.assertEqual(creator.create_json("delete_items", "remove everything from container 10"),
+                         {"action": "delete_items", "parameters": {"container": "10", "items": []}})
+        self.assertEqual(llm.prompts, ["remove everything from container 10"])
+
+    def test_inventory_function_generator(self):
+        llm = RecordingLLM('{"action": "get_inventory", "parameters": {}}',
+                           '{"action": "create_items", "parameters": {"container": "5", "items": ["hammer"]}}')
+        generator = InventoryFunctionGenerator(llm, parameter_extractor=self.extractor)
+
+        self.assertEqual(generator.generate_function_call("what's in container 5"),
+                         {"action": "get_container", "parameters": {"container_id": "5"}})
+        self.assertEqual(llm.prompts, [])
+        self.assertEqual(generator.generate_function_call("show me everything I own"),
+                         {"action": "get_inventory", "parameters": {}})
+        self.assertEqual(generator.generate_function_call("add a hammer to container 5"),
+                         {"action": "create_items", "parameters": {"container": "5", "items": ["hammer"]}})
+        self.assertEqual(len(llm.prompts), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
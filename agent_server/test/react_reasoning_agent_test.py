@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from agent_server.integrations.Metrics import MetricsRegistry
+from agent_server.integrations.Tracer import RingBufferExporter, Tracer
+
+# functions.py builds its LLM clients at import time; point them at an unused mock URL instead of real keys
+with mock.patch.dict(os.environ, {"LLM_MOCK_URL": "http://127.0.0.1:9"}):
+    from agent_server.agent.ReactReasoningAgent import ReActReasoningAgent, ReactException
+
+
+class ScriptedLLM:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def generate_response(self, prompt, system_message):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+class FakeFunctionCreator:
+    def create_json(self, action_name, action_prompt):
+        return {"action": action_name, "parameters": {"container_id": action_prompt.split()[-1]}}
+
+
+class SlowFunctionMapper:
+    """Takes `delay` seconds per call and records the most calls it saw running at once."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def handle_function_call(self, params, session_id):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return {"action_name": params["action"], "response": f"container {params['parameters']['container_id']}: tape"}
+
+
+def create_agent(plan_llm, observation_llm, function_mapper, max_parallel_actions=4):
+    agent = ReActReasoningAgent.__new__(ReActReasoningAgent)
+    agent.general_prompt = "general"
+    agent.planning_prompt = "planning"
+    agent.observation_prompt = "observation"
+    agent.available_actions = "actions"
+    agent.plan_llm = plan_llm
+    agent.observation_llm = observation_llm
+    agent.json_function_creator = FakeFunctionCreator()
+    agent.json_format_enforcer = None
+    agent.function_mapper = function_mapper
+    agent.ring = RingBufferExporter()
+    agent.tracer = Tracer([agent.ring])
+    agent.retries = MetricsRegistry().counter("react_retries_total", "")
+    agent.action_executor = ThreadPoolExecutor(max_workers=max_parallel_actions)
+    return agent
+
+
+class TestParallelActions(unittest.TestCase):
+    def test_independent_actions_run_in_one_planning_step(self):
+        plan = json.dumps([{"action": "get_container", "action_prompt": f"look in container {n}"} for n in (3, 5, 9)])
+        plan_llm = ScriptedLLM(plan)
+        observation_llm = ScriptedLLM(json.dumps({"is_answered": True, "answer": "Tape everywhere"}))
+        function_mapper = SlowFunctionMapper(delay=0.2)
+        agent = create_agent(plan_llm, observation_llm, function_mapper)
+
+        started = time.monotonic()
+        answer = agent.process_request("what's in containers 3, 5 and 9")
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(answer, "Tape everywhere")
+        self.assertEqual((plan_llm.calls, observation_llm.calls), (1, 1))
+        self.assertEqual(function_mapper.peak, 3)
+        self.assertLess(elapsed, 0.5)
+
+    def test_results_are_merged_in_plan_order(self):
+        plan = json.dumps({"actions": [{"action": "get_container", "action_prompt": f"container {n}"} for n in (9, 3)]})
+        agent = create_agent(ScriptedLLM(), ScriptedLLM(), SlowFunctionMapper(delay=0))
+
+        results = agent._perform_actions(agent._extract_actions(plan))
+
+        self.assertEqual([result["result"]["response"] for result in results],
+                         ["container 9: tape", "container 3: tape"])
+        self.assertEqual([(result["action"], result["action_prompt"]) for result in results],
+                         [("get_container", "container 9"), ("get_container", "container 3")])
+
+    def test_executor_bounds_concurrency(self):
+        function_mapper = SlowFunctionMapper(delay=0.05)
+        agent = create_agent(ScriptedLLM(), ScriptedLLM(), function_mapper, max_parallel_actions=2)
+        actions = [("get_container", f"container {n}", {"action": "get_container", "parameters": {"container_id": n}})
+                   for n in range(5)]
+
+        self.assertEqual(len(agent._perform_actions(actions)), 5)
+        self.assertEqual(function_mapper.peak, 2)
+
+    def test_action_spans_join_the_turn_trace(self):
+        agent = create_agent(ScriptedLLM(), ScriptedLLM(), SlowFunctionMapper(delay=0))
+        actions = [("get_container", f"container {n}", {"action": "get_container", "parameters": {"container_id": n}})
+                   for n in (1, 2)]
+
+        with agent.tracer.span("turn") as turn:
+            agent._perform_actions(actions)
+
+        spans = [span for span in agent.ring.spans(turn.trace_id) if span["name"] == "react.perform_action"]
+        self.assertEqual(len(spans), 2)
+        self.assertTrue(all(span["parent_id"] == turn.span_id for span in spans))
+
+    def test_single_actions_and_no_action_still_work(self):
+        agent = create_agent(ScriptedLLM(), ScriptedLLM(), SlowFunctionMapper(delay=0))
+
+        single = agent._extract_actions('```json\n{"action": "get_container", "action_prompt": "container 4"}\n```')
+        nothing = agent._extract_actions('{"action": "no_action", "action_prompt": "already answered"}')
+
+        self.assertEqual(single, [("get_container", "container 4",
+                                   {"action": "get_container", "parameters": {"container_id": "4"}})])
+        self.assertEqual(nothing, [])
+        self.assertEqual(agent._extract_action('{"action": "no_action"}'), ("no_action", None))
+        with self.assertRaises(ReactException):
+            agent._extract_actions('[{"action_prompt": "missing the action"}]')
+
+    def test_multi_action_plans_are_repaired_as_lists(self):
+        agent = create_agent(ScriptedLLM(), ScriptedLLM(), SlowFunctionMapper(delay=0))
+        agent.json_format_enforcer = mock.Mock()
+        agent.json_format_enforcer.create_json.return_value = json.dumps(
+            [{"action": "get_container", "action_prompt": f"container {n}"} for n in (3, 5)])
+
+        actions = agent._extract_actions('[get_container: container 3; get_container: container 5]')
+
+        self.assertEqual([action_prompt for _, action_prompt, _ in actions], ["container 3", "container 5"])
+        expected_format = agent.json_format_enforcer.create_json.call_args.args[0]
+        self.assertIsInstance(json.loads(expected_format.replace("<action_name>", "a")
+                                         .replace("<natural_language_description>", "b")), list)
+
+
+if __name__ == '__main__':
+    unittest.main()
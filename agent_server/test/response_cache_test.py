@@ -0,0 +1,143 @@
+import os
+import tempfile
+import time
+import unittest
+
+from agent_server.agent.FunctionChooser import FunctionChooser
+from agent_server.integrations.Metrics import MetricsRegistry
+from agent_server.llms.CachingLLM import CachingLLM, is_json
+from agent_server.llms.LLMInterface import LLMInterface
+from agent_server.llms.MeteredLLM import MeteredLLM
+from agent_server.llms.ResponseCache import ResponseCache
+
+
+class CountingLLM(LLMInterface):
+    def __init__(self, response='{"chosen_function": "none"}'):
+        self.model = "counting-model"
+        self.response = response
+        self.calls = 0
+        self.temperatures = []
+
+    def generate_response(self, prompt, system_message):
+        self.calls += 1
+        self.temperatures.append(getattr(self, "temperature", None))
+        return self.response
+
+    def stream_response(self, prompt, system_message):
+        self.temperatures.append(getattr(self, "temperature", None))
+        yield self.response
+
+
+class SamplingLLM(CountingLLM):
+    """A client with a sampling temperature, like FireworksAiRestLLM."""
+
+    def __init__(self, temperature=0.7):
+        super().__init__()
+        self.temperature = temperature
+
+    async def agenerate_response(self, prompt, system_message):
+        return self.generate_response(prompt, system_message)
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("model", "system", "one", "1")
+        cache.put("model", "system", "two", "2")
+        cache.get("model", "system", "one")
+        cache.put("model", "system", "three", "3")
+
+        self.assertEqual(cache.get("model", "system", "one"), "1")
+        self.assertIsNone(cache.get("model", "system", "two"))
+
+    def test_entries_expire_after_ttl(self):
+        cache = ResponseCache(ttl_seconds=0.01)
+        cache.put("model", "system", "prompt", "response")
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("model", "system", "prompt"))
+
+    def test_sqlite_tier_survives_a_new_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "responses.db")
+            cache = ResponseCache(db_path=db_path)
+            cache.put("model", "system", "prompt", "response")
+            cache.close()
+
+            reloaded = ResponseCache(db_path=db_path)
+            self.assertEqual(reloaded.get("model", "system", "prompt"), "response")
+            self.assertEqual(reloaded.stats()["disk_hits"], 1)
+            reloaded.close()
+
+
+class TestCachingLLM(unittest.TestCase):
+    def test_repeated_call_skips_the_llm(self):
+        llm = CountingLLM()
+        caching_llm = CachingLLM(llm, cache=ResponseCache())
+
+        for _ in range(3):
+            self.assertEqual(caching_llm.generate_response("prompt", "system"), llm.response)
+
+        self.assertEqual(llm.calls, 1)
+        self.assertAlmostEqual(caching_llm.cache.stats()["hit_rate"], 2 / 3)
+
+    def test_rejected_responses_are_not_cached(self):
+        llm = CountingLLM(response="not json")
+        caching_llm = CachingLLM(llm, cache=ResponseCache(), cache_if=is_json)
+
+        caching_llm.generate_response("prompt", "system")
+        caching_llm.generate_response("prompt", "system")
+
+        self.assertEqual(llm.calls, 2)
+
+    def test_models_do_not_share_entries(self):
+        cache = ResponseCache()
+        first, second = CountingLLM(), CountingLLM()
+        second.model = "other-model"
+
+        CachingLLM(first, cache=cache).generate_response("prompt", "system")
+        CachingLLM(second, cache=cache).generate_response("prompt", "system")
+
+        self.assertEqual((first.calls, second.calls), (1, 1))
+
+    def test_cached_calls_are_made_at_temperature_zero(self):
+        llm = SamplingLLM()
+        caching_llm = CachingLLM(MeteredLLM(llm, "sampling", metrics=MetricsRegistry()), cache=ResponseCache())
+
+        caching_llm.generate_response("prompt", "system")
+        list(caching_llm.stream_response("prompt", "system"))
+
+        self.assertEqual(llm.temperatures, [0, 0.7])
+        self.assertEqual(llm.temperature, 0.7)  # the shared client is left as it was
+
+    def test_temperature_is_part_of_the_key(self):
+        cache = ResponseCache()
+        deterministic, sampled = SamplingLLM(), SamplingLLM()
+
+        CachingLLM(deterministic, cache=cache).generate_response("prompt", "system")
+        CachingLLM(sampled, cache=cache, temperature=0.7).generate_response("prompt", "system")
+
+        self.assertEqual(sampled.calls, 1)
+
+    def test_function_chooser_caches_its_choices(self):
+        llm = CountingLLM('{"chosen_function": "none"}')
+        chooser = FunctionChooser(CachingLLM(llm, cache=ResponseCache()))
+
+        self.assertEqual([chooser.choose_function("hello") for _ in range(2)], ["none", "none"])
+        self.assertEqual(llm.calls, 1)
+        self.assertIsInstance(FunctionChooser(CountingLLM()).llm_interface, CachingLLM)
+
+
+class TestCachingLLMAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_agenerate_response_uses_the_cache(self):
+        llm = CountingLLM()
+        caching_llm = CachingLLM(llm, cache=ResponseCache())
+
+        await caching_llm.agenerate_response("prompt", "system")
+        await caching_llm.agenerate_response("prompt", "system")
+
+        self.assertEqual(llm.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
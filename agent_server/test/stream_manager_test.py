@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest
+
+from agent_server.integrations.BoundedBuffer import OverflowPolicy
+from agent_server.integrations.EventStream import EventStream, StreamEvent
+from agent_server.integrations.StreamManager import StreamManager
+
+
+class TestStreamManager(unittest.TestCase):
+    def setUp(self):
+        self.stream_manager = StreamManager()
+
+    def test_every_listener_receives_every_event(self):
+        first = self.stream_manager.listen_to_text_stream("session")
+        second = self.stream_manager.listen_to_text_stream("session")
+
+        self.stream_manager.add_to_text_buffer("session", "Hello")
+
+        self.assertEqual(first.get(timeout=0), StreamEvent(1, "Hello"))
+        self.assertEqual(second.get(timeout=0), StreamEvent(1, "Hello"))
+
+    def test_reconnect_replays_events_after_last_event_id(self):
+        listener = self.stream_manager.listen_to_text_stream("session")
+        for chunk in ("one", "two", "three"):
+            self.stream_manager.add_to_text_buffer("session", chunk)
+        listener.get(timeout=0)
+        self.stream_manager.stop_listening_to_text_stream("session", listener)
+
+        resumed = self.stream_manager.listen_to_text_stream("session", last_event_id=1)
+
+        self.assertEqual([resumed.get(timeout=0).data, resumed.get(timeout=0).data], ["two", "three"])
+        self.assertEqual(resumed.qsize(), 0)
+
+    def test_replay_is_limited_to_capacity(self):
+        stream_manager = StreamManager(replay_capacity=2)
+        stream_manager.listen_to_text_stream("session")
+        for chunk in ("one", "two", "three"):
+            stream_manager.add_to_text_buffer("session", chunk)
+
+        resumed = stream_manager.listen_to_text_stream("session", last_event_id=0)
+
+        self.assertEqual(resumed.get(timeout=0), StreamEvent(2, "two"))
+
+    def test_slow_listener_only_overflows_its_own_buffer(self):
+        stream_manager = StreamManager(text_max_items=1)
+        slow = stream_manager.listen_to_text_stream("session")
+        fast = stream_manager.listen_to_text_stream("session")
+
+        stream_manager.add_to_text_buffer("session", "Hello")
+        self.assertEqual(fast.get(timeout=0).data, "Hello")
+        stream_manager.add_to_text_buffer("session", " world")
+
+        self.assertEqual(slow.get(timeout=0), StreamEvent(2, "Hello world"))
+        self.assertEqual(fast.get(timeout=0), StreamEvent(2, " world"))
+
+    def test_function_messages_are_not_coalesced(self):
+        stream_manager = StreamManager(text_max_items=1)
+        listener = stream_manager.listen_to_text_stream("session")
+        stream_manager.add_to_text_buffer("session", "Hello")
+        stream_manager.add_to_text_buffer("session", StreamManager.FUNCTION + "{}")
+
+        self.assertEqual(listener.get(timeout=0).data, StreamManager.FUNCTION + "{}")
+        self.assertEqual(stream_manager.get_memory_usage("session")["text"]["subscribers"][0]["dropped"], 1)
+
+    def test_end_streams_wakes_listeners(self):
+        listener = self.stream_manager.listen_to_text_stream("session")
+
+        self.stream_manager.end_streams("session")
+
+        self.assertIsNone(listener.get(timeout=1))
+        self.assertEqual(self.stream_manager.text_listener_count("session"), 0)
+
+
+class TestEventStream(unittest.TestCase):
+    def test_stalled_blocking_subscriber_does_not_hold_the_stream_lock(self):
+        stream = EventStream(buffer_limits={"max_items": 1, "policy": OverflowPolicy.BLOCK, "block_timeout": 1})
+        stalled = stream.subscribe()
+        stream.publish("fills the buffer")
+        publisher = threading.Thread(target=stream.publish, args=("waits for room",))
+        publisher.start()
+        time.sleep(0.05)
+
+        started = time.monotonic()
+        resumed = stream.subscribe(last_event_id=1)
+        stats = stream.stats()
+        elapsed = time.monotonic() - started
+        publisher.join()
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(stats["replay"]["events"], 2)
+        self.assertEqual(resumed.get(timeout=0).seq, 2)
+        self.assertEqual(stalled.get(timeout=0).seq, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
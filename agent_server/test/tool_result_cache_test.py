@@ -0,0 +1,156 @@
+import threading
+import time
+import unittest
+
+from agent_server.FunctionResponse import FunctionResponse, Status
+from agent_server.function.FunctionDispatcher import FunctionDispatcher
+from agent_server.function.FunctionMapper import FunctionMapper
+from agent_server.function.ToolExecutor import ToolExecutor
+from agent_server.function.ToolResultCache import ToolResultCache
+from agent_server.function.functionRegistry import function_registry
+from agent_server.integrations.Metrics import MetricsRegistry
+
+INVALIDATES = {'test_get_inventory': None, 'test_get_container': {'container_id': 'container'}}
+
+
+class FakeInventory:
+    def __init__(self):
+        self.containers = {"5": ["hammer"], "7": ["tape"]}
+        self.requests = []
+        self.fail = False
+
+    def get_inventory(self):
+        self.requests.append(("get_inventory",))
+        return FunctionResponse(Status.SUCCESS, dict(self.containers))
+
+    def get_container(self, container_id):
+        self.requests.append(("get_container", container_id))
+        if self.fail:
+            return FunctionResponse(Status.FAILURE, "inventory server unavailable")
+        return FunctionResponse(Status.SUCCESS, list(self.containers.get(container_id, [])))
+
+    def create_items(self, container, items):
+        self.requests.append(("create_items", container))
+        self.containers.setdefault(container, []).extend(items)
+        return FunctionResponse(Status.SUCCESS, "Action completed successfully")
+
+
+class TestToolResultCache(unittest.TestCase):
+    def setUp(self):
+        self.inventory = FakeInventory()
+        self.cache = ToolResultCache(ttl_seconds=60)
+        self.executor = ToolExecutor(metrics=MetricsRegistry())
+        self.mapper = FunctionMapper(self.executor, self.cache)
+        tools = [
+            FunctionDispatcher('test_get_inventory', self.inventory.get_inventory, {}, read_only=True),
+            FunctionDispatcher('test_get_container', self.inventory.get_container, {'container_id': 'string'},
+                               read_only=True),
+            FunctionDispatcher('test_create_items', self.inventory.create_items,
+                               {'container': 'string', 'items': ['string']}, invalidates=INVALIDATES),
+        ]
+        for dispatcher in tools:
+            function_registry[dispatcher.name] = {'dispatcher': dispatcher}
+
+    def tearDown(self):
+        for name in ('test_get_inventory', 'test_get_container', 'test_create_items'):
+            function_registry.pop(name)
+        self.executor.shutdown()
+
+    def call(self, action, **parameters):
+        return self.mapper.handle_function_call({'action': action, 'parameters': parameters}, "session")['value']
+
+    def test_reads_are_served_from_the_cache_per_argument_set(self):
+        self.assertEqual(self.call('test_get_container', container_id='5'), ["hammer"])
+        self.assertEqual(self.call('test_get_container', container_id=5), ["hammer"])
+        self.assertEqual(self.call('test_get_container', container_id='7'), ["tape"])
+        self.call('test_get_inventory')
+        self.call('test_get_inventory')
+
+        self.assertEqual(self.inventory.requests,
+                         [("get_container", "5"), ("get_container", "7"), ("get_inventory",)])
+        self.assertEqual(self.cache.stats(), {"entries": 3, "hits": 2, "misses": 3, "invalidations": 0})
+
+    def test_writes_invalidate_the_container_and_the_inventory(self):
+        self.call('test_get_container', container_id='5')
+        self.call('test_get_container', container_id='7')
+        self.call('test_get_inventory')
+
+        self.call('test_create_items', container='5', items=['drill'])
+
+        self.assertEqual(self.call('test_get_container', container_id='5'), ["hammer", "drill"])
+        self.assertEqual(self.call('test_get_inventory')["5"], ["hammer", "drill"])
+        self.call('test_get_container', container_id='7')
+        self.assertEqual(self.inventory.requests.count(("get_container", "5")), 2)
+        self.assertEqual(self.inventory.requests.count(("get_container", "7")), 1)
+        self.assertEqual(self.inventory.requests.count(("get_inventory",)), 2)
+
+    def test_failures_are_not_cached(self):
+        self.inventory.fail = True
+        self.call('test_get_container', container_id='5')
+        self.inventory.fail = False
+
+        self.assertEqual(self.call('test_get_container', container_id='5'), ["hammer"])
+        self.assertEqual(len(self.inventory.requests), 2)
+
+    def test_entries_expire_after_the_tool_ttl(self):
+        dispatcher = FunctionDispatcher('test_short_lived', lambda: time.monotonic(), {}, read_only=True,
+                                        cache_ttl=0.01)
+        first = self.cache.call(dispatcher, {}, dispatcher.function)
+        self.assertEqual(self.cache.call(dispatcher, {}, dispatcher.function), first)
+        time.sleep(0.02)
+        self.assertNotEqual(self.cache.call(dispatcher, {}, dispatcher.function), first)
+
+    def test_read_racing_a_write_is_not_cached(self):
+        reading, written = threading.Event(), threading.Event()
+
+        def slow_read(container_id):
+            result = self.inventory.get_container(container_id)
+            reading.set()
+            written.wait(1)
+            return result
+
+        dispatcher = FunctionDispatcher('test_get_container', slow_read, {'container_id': 'string'}, read_only=True)
+        reader = threading.Thread(target=self.cache.call,
+                                  args=(dispatcher, {'container_id': '5'}, lambda: slow_read('5')))
+        reader.start()
+        reading.wait(1)
+        self.cache.invalidate(INVALIDATES, {'container': '5', 'items': ['drill']})
+        written.set()
+        reader.join()
+
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_timed_out_write_blocks_caching_until_it_lands(self):
+        release, landed = threading.Event(), threading.Event()
+
+        def slow_create_items(container, items):
+            release.wait(2)
+            result = self.inventory.create_items(container, items)
+            landed.set()
+            return result
+
+        function_registry['test_create_items']['dispatcher'] = FunctionDispatcher(
+            'test_create_items', slow_create_items, {'container': 'string', 'items': ['string']}, timeout=0.05,
+            invalidates=INVALIDATES)
+
+        timed_out = self.mapper.handle_function_call(
+            {'action': 'test_create_items', 'parameters': {'container': '5', 'items': ['drill']}}, "session")
+        self.assertEqual(timed_out['status'], 'TIMEOUT')
+        self.assertEqual(self.call('test_get_container', container_id='5'), ["hammer"])  # not written yet
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+        release.set()
+        landed.wait(1)
+        time.sleep(0.05)  # for the write's thread to return and settle it
+        self.assertEqual(self.call('test_get_container', container_id='5'), ["hammer", "drill"])
+        self.assertEqual(self.call('test_get_container', container_id='5'), ["hammer", "drill"])
+        self.assertEqual(self.inventory.requests.count(("get_container", "5")), 2)
+
+    def test_invalidations_must_name_declared_parameters(self):
+        with self.assertRaises(TypeError):
+            FunctionDispatcher('bad', lambda container: None, {'container': 'string'},
+                               invalidates={'test_get_container': {'container_id': 'box'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
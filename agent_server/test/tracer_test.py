@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from agent_server.AssistantOrchestrator import AssistantOrchestrator
+from agent_server.integrations.JobScheduler import JobScheduler
+from agent_server.integrations.Tracer import FileSpanExporter, RingBufferExporter, Tracer, text_size
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.ring = RingBufferExporter(max_spans=100)
+        self.tracer = Tracer([self.ring])
+
+    def test_nested_spans_share_a_trace(self):
+        with self.tracer.span("turn", session_id="abc") as turn:
+            with self.tracer.span("step") as step:
+                step.set_attributes(text_size("response", "four bytes!!"))
+            with self.tracer.span("other"):
+                pass
+
+        spans = {span["name"]: span for span in self.ring.spans()}
+        self.assertEqual(list(spans), ["step", "other", "turn"])  # exported as they finish
+        self.assertIsNone(spans["turn"]["parent_id"])
+        self.assertEqual(spans["step"]["parent_id"], turn.span_id)
+        self.assertEqual({span["trace_id"] for span in spans.values()}, {turn.trace_id})
+        self.assertEqual(spans["step"]["attributes"],
+                         {"response_chars": 12, "response_bytes": 12, "response_tokens": 3})
+        self.assertGreaterEqual(spans["turn"]["duration_ms"], spans["step"]["duration_ms"])
+        self.assertIsNone(Tracer.current_span())
+
+    def test_failed_span_records_the_error(self):
+        with self.assertRaises(ValueError):
+            with self.tracer.span("step"):
+                raise ValueError("bad json")
+
+        span, = self.ring.spans()
+        self.assertEqual(span["status"], "error")
+        self.assertEqual(span["error"], "ValueError: bad json")
+
+    def test_separate_turns_are_separate_traces(self):
+        with self.tracer.span("turn"):
+            pass
+        with self.tracer.span("turn"):
+            pass
+
+        first, second = self.ring.spans()
+        self.assertNotEqual(first["trace_id"], second["trace_id"])
+        self.assertEqual(self.ring.spans(first["trace_id"]), [first])
+
+    def test_file_exporter_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traces", "spans.jsonl")
+            tracer = Tracer([FileSpanExporter(path)])
+            with tracer.span("turn"):
+                with tracer.span("step", params={"item_name": "screwdriver"}):
+                    pass
+
+            with open(path) as file:
+                names = [json.loads(line)["name"] for line in file]
+        self.assertEqual(names, ["step", "turn"])
+
+    def test_disabled_tracer_exports_nothing(self):
+        tracer = Tracer([self.ring], enabled=False)
+        with tracer.span("turn") as span:
+            span.set_attribute("ignored", True)
+        self.assertEqual(self.ring.spans(), [])
+
+    def test_scheduled_jobs_are_children_of_the_submitting_span(self):
+        scheduler = JobScheduler(workers=2, name="trace-test")
+        done = threading.Event()
+
+        def job():
+            with self.tracer.span("tts"):
+                pass
+            done.set()
+
+        try:
+            with self.tracer.span("turn") as turn:
+                scheduler.submit("session", job)
+            self.assertTrue(done.wait(5))
+        finally:
+            scheduler.shutdown()
+
+        tts, = [span for span in self.ring.spans(turn.trace_id) if span["name"] == "tts"]
+        self.assertEqual(tts["parent_id"], turn.span_id)
+
+
+class TestAssistantOrchestratorSpans(unittest.TestCase):
+    def test_turn_span_wraps_each_stage(self):
+        ring = RingBufferExporter()
+        chat_agent = MagicMock()
+        chat_agent.process_user_message.return_value = "Find the screwdriver"
+        reasoning_agent = MagicMock()
+        reasoning_agent.process_request.return_value = "It is in container 5"
+        orchestrator = AssistantOrchestrator(reasoning_agent, chat_agent)
+        orchestrator.tracer = Tracer([ring])
+
+        orchestrator.message_assistant(MagicMock(session_id="abc"), "Where is my screwdriver?")
+
+        spans = {span["name"]: span for span in ring.spans()}
+        turn = spans["assistant.turn"]
+        self.assertEqual(turn["attributes"]["session_id"], "abc")
+        self.assertEqual(turn["attributes"]["user_message_chars"], 24)
+        for name in ("chat_agent.process_user_message", "react.process_request", "chat_agent.generate_final_response"):
+            self.assertEqual(spans[name]["parent_id"], turn["span_id"])
+        self.assertEqual(spans["react.process_request"]["attributes"]["result_chars"], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
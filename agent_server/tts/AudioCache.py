@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_audio_cache = None
+_audio_cache_lock = threading.Lock()
+
+
+def get_audio_cache():
+    """Process-wide audio cache shared by every TTS instance."""
+    global _audio_cache
+    with _audio_cache_lock:
+        if _audio_cache is None:
+            _audio_cache = AudioCache(max_entries=int(os.getenv('TTS_CACHE_MAX_ENTRIES', '256')),
+                                      max_bytes=int(os.getenv('TTS_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+                                      cache_dir=os.getenv('TTS_CACHE_DIR') or None,
+                                      max_disk_bytes=int(os.getenv('TTS_CACHE_MAX_DISK_BYTES',
+                                                                   str(512 * 1024 * 1024))))
+        return _audio_cache
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class AudioCache:
+    """
+    Content-addressed cache of synthesized speech, keyed by (normalized text, voice, model, sample rate).
+
+    Entries are 16-bit PCM sample arrays held in an in-memory LRU bounded by entry count and bytes.
+    If `cache_dir` is set, entries are also written there as raw PCM so they survive restarts. The
+    directory is kept under `max_disk_bytes` by deleting the least recently used files; file mtimes
+    record use, so the order carries over a restart.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, cache_dir=None, max_disk_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._disk_entries = OrderedDict()  # key -> file size, least recently used first
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._index_disk()
+
+        self._entries = OrderedDict()  # key -> samples
+        self._bytes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str, voice: str, model: str, sample_rate: int) -> str:
+        identity = "\0".join((normalize_text(text), voice, model, str(sample_rate)))
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def get(self, text: str, voice: str, model: str, sample_rate: int):
+        """Return the cached samples for this phrase, or None."""
+        key = self.key(text, voice, model, sample_rate)
+        with self._lock:
+            samples = self._entries.get(key)
+            if samples is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return samples
+
+        samples = self._read_from_disk(key)
+        with self._lock:
+            if samples is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._store(key, samples)
+            return samples
+
+    def put(self, text: str, voice: str, model: str, sample_rate: int, samples):
+        samples = np.array(samples, dtype=np.int16)
+        samples.flags.writeable = False  # Entries are handed to many readers
+        if samples.nbytes > self.max_bytes:
+            return
+        key = self.key(text, voice, model, sample_rate)
+        with self._lock:
+            self._store(key, samples)
+        self._write_to_disk(key, samples)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _store(self, key, samples):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = samples
+        self._bytes += samples.nbytes
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pcm")
+
+    def _index_disk(self):
+        """Load the sizes of the files already in cache_dir, oldest first, and trim to the cap."""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pcm") and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(".pcm")], stat.st_size))
+        with self._disk_lock:
+            for _, key, size in sorted(files):
+                self._disk_entries[key] = size
+                self._disk_bytes += size
+            self._evict_from_disk()
+
+    def _read_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), 'rb') as file:
+                samples = np.frombuffer(file.read(), dtype=np.int16)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read cached audio {key}: {e}")
+            return None
+        with self._disk_lock:
+            if key in self._disk_entries:
+                self._disk_entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass  # Recency is best effort
+        return samples
+
+    def _write_to_disk(self, key, samples):
+        if not self.cache_dir or samples.nbytes > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(samples.tobytes())
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cached audio {key}: {e}")
+            return
+        with self._disk_lock:
+            self._disk_bytes += samples.nbytes - self._disk_entries.pop(key, 0)
+            self._disk_entries[key] = samples.nbytes
+            self._evict_from_disk()
+
+    def _evict_from_disk(self):
+        # Called with _disk_lock held
+        while self._disk_bytes > self.max_disk_bytes and self._disk_entries:
+            key, size = self._disk_entries.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not evict cached audio {key}: {e}")
@@ -1,56 +1,117 @@
 import os
 import time
 from io import BytesIO
+import logging
 import queue
 import threading
 
 import numpy as np
 from openai import OpenAI
 from pydub import AudioSegment
+from agent_server.integrations.JobScheduler import JobScheduler, QueueFullError
+from agent_server.integrations.Metrics import get_metrics
+from agent_server.integrations.Tracer import get_tracer, text_size
+from agent_server.tts.AudioCache import get_audio_cache
+from agent_server.tts.OrderedAudioSink import OrderedAudioSink
 from agent_server.tts.SpeechInterfaces import TTSInterface
 
+logger = logging.getLogger(__name__)
+
+# OpenAI's "pcm" response format: raw 24kHz, 16-bit signed little-endian, mono
+PCM_SAMPLE_RATE = 24000
+PCM_SAMPLE_WIDTH = 2
+
+_synthesis_scheduler = None
+_synthesis_scheduler_lock = threading.Lock()
+
+
+def get_synthesis_scheduler() -> JobScheduler:
+    """Process-wide pool that synthesizes sentences for every OpenAITTS instance."""
+    global _synthesis_scheduler
+    with _synthesis_scheduler_lock:
+        if _synthesis_scheduler is None:
+            _synthesis_scheduler = JobScheduler(workers=int(os.getenv('TTS_WORKERS', '4')),
+                                                max_queue_depth=int(os.getenv('TTS_MAX_QUEUE_DEPTH', '1000')),
+                                                name='tts-worker')
+        return _synthesis_scheduler
+
 
 class OpenAITTS(TTSInterface):
-    def __init__(self):
+    def __init__(self, audio_buffer=None, lookahead=None, stream_pcm=None, frame_ms=None, audio_cache=None):
         # Read API key from environment variables
         api_key = os.getenv('API_KEY')
         if not api_key:
             raise ValueError("OpenAI API key not found in environment variables.")
         self.client = OpenAI(api_key=api_key)
-
-        # Initialize text, sentence, and audio buffers
-        self.text_buffer = queue.Queue()
-        self.sentence_buffer = queue.Queue()
-        self.audio_buffer = queue.Queue()
-
-        # Start the text processing in separate threads
-        self.process_text_thread = threading.Thread(target=self.process_text_queue)
-        self.process_text_thread.daemon = True  # Daemonize thread so it exits when the main program exits
-        self.process_text_thread.start()
-
-        self.process_sentence_thread = threading.Thread(target=self.process_sentence_queue)
-        self.process_sentence_thread.daemon = True  # Daemonize thread so it exits when the main program exits
-        self.process_sentence_thread.start()
+        self.model = os.getenv('TTS_MODEL', 'tts-1')
+        self.voice = os.getenv('TTS_VOICE', 'alloy')
+
+        # Repeated phrases (greetings, confirmations) are served from the shared cache
+        self.audio_cache = audio_cache if audio_cache is not None else get_audio_cache()
+        self.tracer = get_tracer()
+        self.synthesis_latency = get_metrics().histogram("tts_synthesis_seconds",
+                                                         "Time to synthesize one sentence, by audio source", ("source",))
+
+        # Callers may supply their own audio buffer (anything with a thread-safe put)
+        self.audio_buffer = audio_buffer if audio_buffer is not None else queue.Queue()
+
+        # Fragments are accumulated into sentences on the caller's thread; sentences are synthesized
+        # on the shared scheduler under one key per instance, so sessions take turns fairly. Up to
+        # `lookahead` sentences after the one being played are synthesized concurrently within that
+        # key, and the sink puts audio back in order.
+        self.scheduler = get_synthesis_scheduler()
+        self.lookahead = int(os.getenv('TTS_LOOKAHEAD', '2')) if lookahead is None else lookahead
+        self.audio_sink = OrderedAudioSink(self.audio_buffer)
+        self._next_seq = 0
+        self._sentence = []
+        self._sentence_lock = threading.Lock()
+        self._stopped = False
+
+        # In PCM streaming mode audio is pushed in fixed-size frames as bytes arrive, instead of
+        # buffering and decoding a whole MP3 per sentence
+        self.stream_pcm = (os.getenv('TTS_STREAM_PCM', 'true').lower() == 'true') if stream_pcm is None \
+            else stream_pcm
+        frame_ms = int(os.getenv('TTS_FRAME_MS', '100')) if frame_ms is None else frame_ms
+        self.frame_bytes = PCM_SAMPLE_RATE * PCM_SAMPLE_WIDTH * frame_ms // 1000
 
     def get_audio_buffer(self):
         """Return the audio buffer so external code can access the audio data."""
         return self.audio_buffer
 
     def add_text_to_queue(self, text: str):
-        """Add text to the text buffer for processing."""
-        self.text_buffer.put(text)
+        """Accumulate a text fragment and schedule synthesis once a sentence is complete."""
+        with self._sentence_lock:
+            if self._stopped:
+                return
+            self._sentence.append(text)
+
+            # If a sentence-ending punctuation is detected, queue the sentence for synthesis
+            if not any(punct in text for punct in ".!?"):
+                return
+            full_sentence = ''.join(self._sentence)
+            self._sentence = []  # Reset for the next sentence
+
+            seq = self._next_seq
+            self._next_seq += 1
+            try:
+                self.scheduler.submit_limited(self, self.lookahead + 1, self.synthesize_sentence, seq, full_sentence)
+            except QueueFullError:
+                logger.warning(f"TTS queue is full, dropping sentence: {full_sentence}")
+                self.audio_sink.finish(seq)
 
     def play_audio_stream(self, text: str):
         """Convert text to audio using OpenAI's TTS and return audio samples."""
         start_time = time.time()
 
         # Create the TTS request and stream the response
-        with self.client.audio.speech.with_streaming_response.create(
-                model="tts-1",
-                voice="alloy",
-                input=text
-        ) as response:
-            audio_data = response.read()
+        with self.tracer.span("tts.play_audio_stream", model=self.model, voice=self.voice, **text_size("text", text)) as span:
+            with self.client.audio.speech.with_streaming_response.create(
+                    model=self.model,
+                    voice=self.voice,
+                    input=text
+            ) as response:
+                audio_data = response.read()
+            span.set_attribute("audio_bytes", len(audio_data))
 
         # Calculate the latency
         latency = time.time() - start_time
@@ -66,49 +127,76 @@ class OpenAITTS(TTSInterface):
 
         return samples, sample_rate
 
-    def process_text_queue(self):
-        """Continuously process the text buffer, form sentences, and add to the sentence buffer."""
-        sentence = []
-        while True:
-            try:
-                # Get text fragment from the text buffer
-                text = self.text_buffer.get(timeout=5)
-                if text is None:  # Sentinel value to stop processing
-                    break
-
-                # Accumulate fragments into a sentence
-                sentence.append(text)
-
-                # If a sentence-ending punctuation is detected, send the sentence to the sentence buffer
-                if any(punct in text for punct in ".!?"):
-                    full_sentence = ''.join(sentence)
-                    self.sentence_buffer.put(full_sentence)
-                    sentence = []  # Reset for the next sentence
-
-            except queue.Empty:
-                continue  # Continue checking the queue if it's empty
-
-    def process_sentence_queue(self):
-        """Continuously process the sentence buffer, convert to audio, and add to the audio buffer."""
-        while True:
+    def stream_pcm_frames(self, text: str):
+        """Convert text to audio using OpenAI's TTS, yielding (samples, sample_rate) frames as they arrive."""
+        start_time = time.time()
+        pending = b''
+        with self.client.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=self.voice,
+                input=text,
+                response_format="pcm"
+        ) as response:
+            for chunk in response.iter_bytes(self.frame_bytes):
+                if start_time is not None:
+                    print(f"Latency from request to first sound: {time.time() - start_time:.2f} seconds")
+                    start_time = None
+                pending += chunk
+                while len(pending) >= self.frame_bytes:
+                    frame, pending = pending[:self.frame_bytes], pending[self.frame_bytes:]
+                    yield np.frombuffer(frame, dtype=np.int16), PCM_SAMPLE_RATE
+
+        # Flush the tail, dropping a dangling half sample if the stream was cut short
+        pending = pending[:len(pending) - len(pending) % PCM_SAMPLE_WIDTH]
+        if pending:
+            yield np.frombuffer(pending, dtype=np.int16), PCM_SAMPLE_RATE
+
+    def synthesize_sentence(self, seq: int, sentence: str):
+        """Convert one sentence to audio and hand it to the sink in its place in the sequence."""
+        with self.tracer.span("tts.synthesize_sentence", seq=seq, **text_size("text", sentence)) as span:
+            started = time.perf_counter()
+            source = None
             try:
-                # Get a full sentence from the sentence buffer
-                sentence = self.sentence_buffer.get(timeout=5)
-                if sentence is None:  # Sentinel value to stop processing
-                    break
-
-                # Convert sentence to audio
-                samples, sample_rate = self.play_audio_stream(sentence)
-
-                # Put the audio data onto the audio buffer
-                self.audio_buffer.put((samples, sample_rate))
-
-            except queue.Empty:
-                continue  # Continue checking the queue if it's empty
+                if self._stopped:
+                    return
+                cached = self.audio_cache.get(sentence, self.voice, self.model, PCM_SAMPLE_RATE)
+                source = "cache" if cached is not None else "api"
+                span.set_attribute("cache_hit", cached is not None)
+                if cached is not None:
+                    span.set_attribute("audio_bytes", cached.nbytes)
+                    frame_samples = self.frame_bytes // PCM_SAMPLE_WIDTH
+                    for start in range(0, len(cached), frame_samples):
+                        self.audio_sink.emit(seq, (cached[start:start + frame_samples], PCM_SAMPLE_RATE))
+                    return
+
+                if not self.stream_pcm:
+                    samples, sample_rate = self.play_audio_stream(sentence)
+                    span.set_attribute("audio_bytes", samples.nbytes)
+                    self.audio_sink.emit(seq, (samples, sample_rate))
+                    if sample_rate == PCM_SAMPLE_RATE:
+                        self.audio_cache.put(sentence, self.voice, self.model, PCM_SAMPLE_RATE, samples)
+                    return
+
+                frames = []
+                for frame in self.stream_pcm_frames(sentence):
+                    if self._stopped:
+                        return  # Only complete sentences are cached
+                    self.audio_sink.emit(seq, frame)
+                    frames.append(frame[0])
+                span.set_attribute("audio_bytes", sum(frame.nbytes for frame in frames))
+                if frames:
+                    self.audio_cache.put(sentence, self.voice, self.model, PCM_SAMPLE_RATE, np.concatenate(frames))
+            finally:
+                self.audio_sink.finish(seq)
+                if source is not None:
+                    self.synthesis_latency.observe(time.perf_counter() - started, source=source)
 
     def stop(self):
-        """Stop the processing threads by sending sentinel values."""
-        self.text_buffer.put(None)
-        self.sentence_buffer.put(None)
-        self.process_text_thread.join()
-        self.process_sentence_thread.join()
+        """
+        Stop accepting text; sentences already queued for this instance are skipped and audio not yet
+        delivered is discarded. Once this returns nothing more is put on the audio buffer.
+        """
+        with self._sentence_lock:
+            self._stopped = True
+            self._sentence = []
+        self.audio_sink.close()
@@ -0,0 +1,99 @@
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class OrderedAudioSink:
+    """
+    Releases audio chunks onto a buffer in sentence order, whatever order sentences finish in.
+
+    Chunks for the sentence at the head of the line go straight through; chunks for sentences
+    synthesized ahead of time are held until every earlier sentence has finished.
+
+    Released chunks are put onto the buffer outside the state lock, by one thread at a time, so a
+    listener that stops reading only holds up the thread delivering; the others return at once.
+    At most `max_pending` chunks are held (waiting for their turn or for delivery); beyond that new
+    chunks are dropped.
+    """
+
+    def __init__(self, audio_buffer, max_pending=512):
+        self.audio_buffer = audio_buffer
+        self.max_pending = max_pending
+        self._next_seq = 0
+        self._pending = {}  # seq -> chunks held back until seq reaches the head
+        self._pending_count = 0
+        self._finished = set()
+        self._outbox = deque()  # released chunks, in order, waiting to be put on the buffer
+        self._closed = False
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._delivery_lock = threading.Lock()
+
+    def emit(self, seq: int, chunk):
+        with self._lock:
+            if self._closed:
+                return
+            if self._pending_count + len(self._outbox) >= self.max_pending:
+                self._dropped += 1
+                if self._dropped == 1:
+                    logger.warning(f"More than {self.max_pending} audio chunks held back, dropping")
+                return
+            if seq == self._next_seq:
+                self._outbox.append(chunk)
+            else:
+                self._pending.setdefault(seq, []).append(chunk)
+                self._pending_count += 1
+        self._deliver()
+
+    def finish(self, seq: int):
+        """Mark a sentence complete (successfully or not) so later sentences can be released."""
+        with self._lock:
+            if self._closed:
+                return
+            self._finished.add(seq)
+            while self._next_seq in self._finished:
+                self._finished.remove(self._next_seq)
+                self._next_seq += 1
+                chunks = self._pending.pop(self._next_seq, [])
+                self._pending_count -= len(chunks)
+                self._outbox.extend(chunks)
+        self._deliver()
+
+    def close(self):
+        """
+        Discard everything not yet delivered and ignore later emits. Returns once no put is in
+        progress, so anything the caller puts on the buffer afterwards (e.g. a None sentinel) is last.
+        """
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._pending_count = 0
+            self._finished.clear()
+            self._outbox.clear()
+        with self._delivery_lock:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return {"pending": self._pending_count, "outbox": len(self._outbox), "dropped": self._dropped}
+
+    def _deliver(self):
+        # Whoever holds the delivery lock drains the outbox for everyone; the others return at once.
+        # The drainer re-checks after releasing, so a chunk queued while it held the lock isn't stranded.
+        while True:
+            with self._lock:
+                if not self._outbox or self._closed:
+                    return
+            if not self._delivery_lock.acquire(blocking=False):
+                return
+            try:
+                while True:
+                    with self._lock:
+                        if not self._outbox or self._closed:
+                            break
+                        chunk = self._outbox.popleft()
+                    self.audio_buffer.put(chunk)
+            finally:
+                self._delivery_lock.release()
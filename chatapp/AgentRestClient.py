@@ -50,6 +50,8 @@ class AgentRestClient:
         for chunk in response.iter_lines():
             if chunk:
                 chunk_decoded = chunk.decode('utf-8')
+                if not chunk_decoded.startswith("data: "):
+                    continue  # e.g. the SSE "id:" line
                 try:
                     data = json.loads(chunk_decoded.split("data: ")[1])
                     message = data.get("message")
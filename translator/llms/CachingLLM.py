@@ -0,0 +1,74 @@
+import json
+
+from translator.llms.LLMInterface import LLMInterface
+from translator.llms.ResponseCache import get_response_cache
+
+
+def model_identity(llm) -> str:
+    """Identifies the model behind a client, so different models never share cache entries."""
+    model = getattr(llm, 'model', None) or getattr(llm, 'model_name', None) or getattr(llm, 'base_url', '')
+    return f"{type(llm).__name__}:{model}"
+
+
+def is_json(response: str) -> bool:
+    try:
+        json.loads(response)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+class CachingLLM(LLMInterface):
+    """
+    Serves generate_response from the response cache for repeated (model, system message, prompt)
+    triples, so a cached call never touches the network. Streaming passes straight through.
+
+    Call sites opt in by wrapping their client. `cache_if` keeps responses the caller can't use
+    (e.g. invalid JSON) out of the cache. Message history, when given, is part of the key.
+    """
+
+    def __init__(self, llm: LLMInterface, cache=None, ttl_seconds=None, cache_if=None):
+        self.llm = llm
+        self.cache = cache if cache is not None else get_response_cache()
+        self.ttl_seconds = ttl_seconds
+        self.cache_if = cache_if
+        self.model_id = model_identity(llm)
+
+    def generate_response(self, prompt, system_message, message_history=None):
+        key_prompt = self._key_prompt(prompt, message_history)
+        cached = self.cache.get(self.model_id, system_message, key_prompt)
+        if cached is not None:
+            return cached
+        response = self.llm.generate_response(prompt, system_message, *self._history_args(message_history))
+        self._store(key_prompt, system_message, response)
+        return response
+
+    async def agenerate_response(self, prompt, system_message, message_history=None):
+        key_prompt = self._key_prompt(prompt, message_history)
+        cached = self.cache.get(self.model_id, system_message, key_prompt)
+        if cached is not None:
+            return cached
+        response = await self.llm.agenerate_response(prompt, system_message, *self._history_args(message_history))
+        self._store(key_prompt, system_message, response)
+        return response
+
+    def stream_response(self, prompt, system_message, message_history=None):
+        return self.llm.stream_response(prompt, system_message, *self._history_args(message_history))
+
+    def astream_response(self, prompt, system_message, message_history=None):
+        return self.llm.astream_response(prompt, system_message, *self._history_args(message_history))
+
+    @staticmethod
+    def _history_args(message_history):
+        # Not every client accepts a message history, so only pass one along when there is one
+        return (message_history,) if message_history else ()
+
+    @staticmethod
+    def _key_prompt(prompt, message_history):
+        if not message_history:
+            return prompt
+        return json.dumps(message_history, sort_keys=True) + "\0" + prompt
+
+    def _store(self, key_prompt, system_message, response):
+        if isinstance(response, str) and (self.cache_if is None or self.cache_if(response)):
+            self.cache.put(self.model_id, system_message, key_prompt, response, self.ttl_seconds)
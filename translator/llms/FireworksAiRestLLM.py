@@ -1,9 +1,8 @@
 import json
 import sys
 
-import requests
-
 from translator.llms.EncryptedKeyStore import EncryptedKeyStore
+from translator.llms.HttpSessionPool import get_http_session_pool
 from translator.llms.LLMInterface import LLMInterface
 from translator.llms.OpenAiStyleLLM import OpenAIStyleLLM
 
@@ -21,6 +20,7 @@ class FireworksAiRestLLM(LLMInterface):
             "Authorization": f"Bearer {api_token}",
             "Content-Type": "application/json"
         }
+        self.http = get_http_session_pool()
 
     def generate_response(self, prompt, system_message, message_history=None):
         return self.api.generate_response(prompt, system_message, message_history)
@@ -40,7 +40,7 @@ class FireworksAiRestLLM(LLMInterface):
             "stream": True
         }
 
-        with requests.post(self.url, json=payload, headers=self.headers, stream=True) as response:
+        with self.http.post(self.url, json=payload, headers=self.headers, stream=True) as response:
             if response.status_code == 200:
                 for line in response.iter_lines():
                     if line:
@@ -60,6 +60,12 @@ class FireworksAiRestLLM(LLMInterface):
     def stream_response(self, prompt, system_message, message_history=None):
         return self.api.stream_response(prompt, system_message, message_history)
 
+    async def agenerate_response(self, prompt, system_message, message_history=None):
+        return await self.api.agenerate_response(prompt, system_message, message_history)
+
+    def astream_response(self, prompt, system_message, message_history=None):
+        return self.api.astream_response(prompt, system_message, message_history)
+
 def main():
     keystore = EncryptedKeyStore()
     api_token = keystore.get_api_key("FIREWORKS_API_KEY")
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_http_session_pool = None
+_http_session_pool_lock = threading.Lock()
+
+
+def get_http_session_pool():
+    """Process-wide connection pool shared by every REST LLM client."""
+    global _http_session_pool
+    with _http_session_pool_lock:
+        if _http_session_pool is None:
+            _http_session_pool = HttpSessionPool(
+                pool_connections=int(os.getenv('LLM_HTTP_POOL_CONNECTIONS', '10')),
+                pool_maxsize=int(os.getenv('LLM_HTTP_POOL_MAXSIZE', '20')),
+                keep_alive=os.getenv('LLM_HTTP_KEEP_ALIVE', 'true').lower() == 'true',
+                connect_timeout=float(os.getenv('LLM_HTTP_CONNECT_TIMEOUT', '10')),
+                read_timeout=float(os.getenv('LLM_HTTP_READ_TIMEOUT', '600')))
+        return _http_session_pool
+
+
+class _ReuseCountingPool:
+    """Counts whether each request got a live pooled connection (hit) or had to open a socket (miss)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        with self._stats_lock:
+            if conn.is_connected:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return conn
+
+
+class _CountingHTTPConnectionPool(_ReuseCountingPool, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_ReuseCountingPool, HTTPSConnectionPool):
+    pass
+
+
+class HttpSessionPool:
+    """
+    A requests.Session with keep-alive connection pools per host, so repeated LLM calls skip the
+    TCP connect and TLS handshake, plus an equivalently configured httpx.AsyncClient per event loop
+    for the async clients.
+
+    `pool_connections` is how many hosts keep a pool, `pool_maxsize` how many idle connections each
+    host keeps. Requests without an explicit timeout get (connect_timeout, read_timeout).
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=20, keep_alive=True, connect_timeout=10.0,
+                 read_timeout=600.0):
+        self.timeout = (connect_timeout, read_timeout)
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.adapter.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+        self._async_limits = httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                                          max_keepalive_connections=pool_maxsize)
+        self._async_timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._async_headers = {} if keep_alive else {'Connection': 'close'}
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+        self._async_clients_lock = threading.Lock()
+
+    def post(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def async_client(self) -> httpx.AsyncClient:
+        """The pooled async client for the running event loop; httpx connections can't cross loops."""
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(limits=self._async_limits, timeout=self._async_timeout,
+                                           headers=self._async_headers)
+                self._async_clients[loop] = client
+            return client
+
+    async def aclose(self):
+        """Close the running event loop's async client."""
+        with self._async_clients_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def stats(self):
+        """
+        Connection reuse per host: a miss is a request that had to open a new connection, a hit
+        is one served on a pooled keep-alive connection.
+        """
+        pools = self.adapter.poolmanager.pools
+        hosts = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{key.key_scheme}://{key.key_host}:{key.key_port}"
+            hosts[host] = {
+                "requests": pool.num_requests,
+                "hits": pool.hits,
+                "misses": pool.misses,
+                "connections_created": pool.num_connections,
+                "idle": pool.pool.qsize() if pool.pool is not None else 0,
+            }
+        return {
+            "requests": sum(host["requests"] for host in hosts.values()),
+            "hits": sum(host["hits"] for host in hosts.values()),
+            "misses": sum(host["misses"] for host in hosts.values()),
+            "hosts": hosts,
+        }
+
+    def close(self):
+        self.session.close()
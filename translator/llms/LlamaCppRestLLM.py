@@ -1,5 +1,5 @@
 import json
-import requests
+from translator.llms.HttpSessionPool import get_http_session_pool
 from translator.llms.LLMInterface import LLMInterface
 
 
@@ -7,8 +7,57 @@ class LlamaCppRestLLM(LLMInterface):
     def __init__(self, base_url, timeout=600):
         self.base_url = base_url
         self.timeout = timeout  # Default timeout of 600 seconds
+        self.http = get_http_session_pool()
 
     def generate_response(self, prompt, system_message):
+        print("PROMPT::\n", prompt)
+        response = self.http.post(self.base_url + "/chat/completions", json=self._payload(prompt, system_message),
+                                  timeout=self.timeout)
+        response.raise_for_status()
+        return self._extract_response(response.json())
+
+    def stream_response(self, prompt, system_message):
+        payload = self._payload(prompt, system_message, stream=True)
+        headers = {"Content-Type": "application/json"}
+        with self.http.post(
+            f"{self.base_url}/stream", headers=headers, json=payload, stream=True, timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if line:
+                    message = self._parse_stream_line(line.decode('utf-8'))
+                    if message == self.END_STREAM:
+                        break
+                    if message is not None:
+                        yield message
+
+    async def agenerate_response(self, prompt, system_message):
+        print("PROMPT::\n", prompt)
+        response = await self.http.async_client().post(
+            self.base_url + "/chat/completions", json=self._payload(prompt, system_message), timeout=self.timeout
+        )
+        response.raise_for_status()
+        return self._extract_response(response.json())
+
+    async def astream_response(self, prompt, system_message):
+        payload = self._payload(prompt, system_message, stream=True)
+        headers = {"Content-Type": "application/json"}
+        async with self.http.async_client().stream(
+            "POST", f"{self.base_url}/stream", headers=headers, json=payload, timeout=self.timeout
+        ) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if line:
+                    message = self._parse_stream_line(line)
+                    if message == self.END_STREAM:
+                        break
+                    if message is not None:
+                        yield message
+
+    @staticmethod
+    def _payload(prompt, system_message, stream=False):
         # Adjust payload format to include messages as an array
         payload = {
             "messages": [
@@ -16,38 +65,23 @@ class LlamaCppRestLLM(LLMInterface):
                 {"role": "user", "content": prompt}
             ]
         }
+        if stream:
+            payload["stream"] = True
+        return payload
 
-        print("PROMPT::\n", prompt)
-        response = requests.post(self.base_url + "/chat/completions", json=payload, timeout=self.timeout)
-        response.raise_for_status()
-        response_json = response.json()
+    @staticmethod
+    def _extract_response(response_json):
         print("RESPONSE::\n", response_json)
 
         # Adjust to retrieve the assistant's message
         return response_json.get('choices', [{}])[0].get('message', {}).get('content', "")
 
-    def stream_response(self, prompt, system_message):
-        # Use the adjusted payload format for streaming response
-        payload = {
-            "messages": [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            "stream": True
-        }
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(
-            f"{self.base_url}/stream", headers=headers, json=payload, stream=True, timeout=self.timeout
-        )
-        response.raise_for_status()
-
-        for line in response.iter_lines():
-            if line:
-                decoded_line = line.decode('utf-8')
-                if 'data: ' in decoded_line:
-                    data = decoded_line[len('data: '):]
-                    if data.strip() == "[DONE]":
-                        break
-                    if data:
-                        message = json.loads(data).get('choices', [{}])[0].get('message', {}).get('content', "")
-                        yield message
+    def _parse_stream_line(self, decoded_line):
+        """Message text of one SSE line, END_STREAM on [DONE], or None for lines without data."""
+        if 'data: ' in decoded_line:
+            data = decoded_line[len('data: '):]
+            if data.strip() == "[DONE]":
+                return self.END_STREAM
+            if data:
+                return json.loads(data).get('choices', [{}])[0].get('message', {}).get('content', "")
+        return None
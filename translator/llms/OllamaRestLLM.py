@@ -1,5 +1,5 @@
-import requests
 import json
+from translator.llms.HttpSessionPool import get_http_session_pool
 from translator.llms.LLMInterface import LLMInterface
 
 
@@ -7,19 +7,60 @@ class OllamaLLM(LLMInterface):
     def __init__(self, base_url, model_name):
         self.base_url = base_url
         self.model_name = model_name
+        self.http = get_http_session_pool()
 
     def generate_response(self, prompt, system_message):
-        payload = {
+        print("PROMPT::\n", prompt)
+        response = self.http.post(self.base_url + "/api/generate", json=self._payload(prompt, system_message, False))
+        response.raise_for_status()
+        return self._extract_response(response.json())
+
+    def stream_response(self, prompt, system_message):
+        data = self._payload(prompt, system_message, True)
+        headers = {"Content-Type": "application/json"}
+        with self.http.post(f"{self.base_url}/stream", headers=headers, json=data, stream=True) as response:
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if line:
+                    data = self._parse_stream_line(line.decode('utf-8'))
+                    if data == self.END_STREAM:
+                        break
+                    if data is not None:
+                        yield data
+
+    async def agenerate_response(self, prompt, system_message):
+        print("PROMPT::\n", prompt)
+        response = await self.http.async_client().post(self.base_url + "/api/generate",
+                                                       json=self._payload(prompt, system_message, False))
+        response.raise_for_status()
+        return self._extract_response(response.json())
+
+    async def astream_response(self, prompt, system_message):
+        data = self._payload(prompt, system_message, True)
+        headers = {"Content-Type": "application/json"}
+        async with self.http.async_client().stream("POST", f"{self.base_url}/stream", headers=headers,
+                                                   json=data) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if line:
+                    data = self._parse_stream_line(line)
+                    if data == self.END_STREAM:
+                        break
+                    if data is not None:
+                        yield data
+
+    def _payload(self, prompt, system_message, stream):
+        return {
             "model": self.model_name,
             "system": system_message,
             "prompt": prompt,
-            "stream": False
+            "stream": stream
         }
 
-        print("PROMPT::\n", prompt)
-        response = requests.post(self.base_url + "/api/generate", json=payload)
-        response.raise_for_status()
-        response_json = response.json()
+    @staticmethod
+    def _extract_response(response_json):
         print("RESPONSE::\n", response_json)
 
         # Adjusting to access the content based on Ollama response format
@@ -29,27 +70,15 @@ class OllamaLLM(LLMInterface):
             return string_res[7:-3].strip()
         return string_res
 
-    def stream_response(self, prompt, system_message):
-        data = {
-            "model": self.model_name,
-            "system": system_message,
-            "prompt": prompt,
-            "stream": True
-        }
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(f"{self.base_url}/stream", headers=headers, json=data, stream=True)
-        response.raise_for_status()
-
-        for line in response.iter_lines():
-            if line:
-                decoded_line = line.decode('utf-8')
-                if 'data: ' in decoded_line:
-                    data = decoded_line[len('data: '):]
-                    if data.strip() == "[DONE]":
-                        break
-                    if data:
-                        message = json.loads(data).get('response', {})
-                        yield message
+    def _parse_stream_line(self, decoded_line):
+        """Message text of one SSE line, END_STREAM on [DONE], or None for lines without data."""
+        if 'data: ' in decoded_line:
+            data = decoded_line[len('data: '):]
+            if data.strip() == "[DONE]":
+                return self.END_STREAM
+            if data:
+                return json.loads(data).get('response', {})
+        return None
 
 
 def main():
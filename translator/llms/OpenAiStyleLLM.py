@@ -1,5 +1,5 @@
 import json
-import requests
+from translator.llms.HttpSessionPool import get_http_session_pool
 from translator.llms.LLMInterface import LLMInterface
 
 
@@ -43,6 +43,7 @@ class OpenAIStyleLLM:
             "Authorization": f"Bearer {api_token}",
             "Content-Type": "application/json"
         }
+        self.http = get_http_session_pool()
 
     def generate_response(self, prompt, system_message, message_history=None):
         """
@@ -68,20 +69,58 @@ class OpenAIStyleLLM:
         try:
             for line in response.iter_lines():
                 if line:
-                    data = line.decode("utf-8")
-                    if data == "data: [DONE]":
-                        yield LLMInterface.END_STREAM
+                    content = self.parse_stream_line(line.decode("utf-8"))
+                    if content:
+                        yield content
+                    if content == LLMInterface.END_STREAM:
                         break
-                    else:
-                        # Parse JSON and yield only the content
-                        json_data = json.loads(data[6:])  # Strip off "data: "
-                        if "choices" in json_data and "delta" in json_data["choices"][0]:
-                            content = json_data["choices"][0]["delta"].get("content")
-                            if content:
-                                yield content
         finally:
             response.close()  # Ensure the response is properly closed
 
+    async def agenerate_response(self, prompt, system_message, message_history=None):
+        """
+        Generates a single response (non-streaming) without blocking the event loop.
+        """
+        messages = process_message_history(message_history, system_message, prompt)
+
+        payload = self.generate_payload(messages, stream=False)
+        response = await self.http.async_client().post(self.url, json=payload, headers=self.headers)
+        if response.status_code != 200:
+            raise Exception(f"Request failed: {response.status_code}, {response.text}")
+        return response.json()["choices"][0]["message"]["content"]
+
+    async def astream_response(self, prompt, system_message, message_history=None):
+        """
+        Streams the response in real time without blocking the event loop.
+        """
+        messages = process_message_history(message_history, system_message, prompt)
+
+        payload = self.generate_payload(messages, stream=True)
+        async with self.http.async_client().stream("POST", self.url, json=payload, headers=self.headers) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Request failed: {response.status_code}, {response.text}")
+            async for line in response.aiter_lines():
+                if line:
+                    content = self.parse_stream_line(line)
+                    if content:
+                        yield content
+                    if content == LLMInterface.END_STREAM:
+                        break
+
+    @staticmethod
+    def parse_stream_line(data):
+        """
+        Returns the content of one SSE line, END_STREAM on [DONE], or None for lines without content.
+        """
+        if data == "data: [DONE]":
+            return LLMInterface.END_STREAM
+        # Parse JSON and yield only the content
+        json_data = json.loads(data[6:])  # Strip off "data: "
+        if "choices" in json_data and "delta" in json_data["choices"][0]:
+            return json_data["choices"][0]["delta"].get("content")
+        return None
+
     def generate_payload(self, messages, stream=False):
         """
         Generates the payload for the API request.
@@ -101,7 +140,7 @@ class OpenAIStyleLLM:
         """
         Sends the API request with the given payload.
         """
-        response = requests.post(self.url, json=payload, headers=self.headers, stream=stream)
+        response = self.http.post(self.url, json=payload, headers=self.headers, stream=stream)
         if response.status_code == 200:
             return response
         else:
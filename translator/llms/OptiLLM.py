@@ -1,4 +1,4 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from translator.llms.LLMInterface import LLMInterface
 from translator.llms.MethodNotSupportedException import MethodNotSupportedException
@@ -9,16 +9,10 @@ class OptiLLM(LLMInterface):
         self.model = model
         self.url = "http://localhost:8000/v1/"
         self.client = OpenAI(api_key="api_key", base_url=self.url)
+        self.async_client = AsyncOpenAI(api_key="api_key", base_url=self.url)
 
     def generate_response(self, prompt, system_message):
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            extra_body={"optillm_approach": "moa"}
-        )
+        response = self.client.chat.completions.create(**self._request(prompt, system_message))
         # Extract the assistant's message content
         assistant_message = response.choices[0].message.content
         return assistant_message
@@ -29,6 +23,23 @@ class OptiLLM(LLMInterface):
             "Streaming responses are not supported for OptiLLM due to the multi-inference nature of this implementation."
         )
 
+    async def agenerate_response(self, prompt, system_message):
+        response = await self.async_client.chat.completions.create(**self._request(prompt, system_message))
+        return response.choices[0].message.content
+
+    def astream_response(self, prompt, system_message):
+        return self.stream_response(prompt, system_message)
+
+    def _request(self, prompt, system_message):
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt}
+            ],
+            "extra_body": {"optillm_approach": "moa"}
+        }
+
 def main():
     model = OptiLLM()
 
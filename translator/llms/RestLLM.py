@@ -1,43 +1,75 @@
-import requests
 import json
+from translator.llms.HttpSessionPool import get_http_session_pool
 from translator.llms.LLMInterface import LLMInterface
 
 class RestLLM(LLMInterface):
     def __init__(self, base_url):
         self.base_url = base_url
+        self.http = get_http_session_pool()
 
     def generate_response(self, prompt, system_message):
-        payload = {
-            'prompt': prompt,
-            'system_message': system_message
-        }
-
         print("PROMPT::\n")
         print(prompt)
-        response = requests.post(f"{self.base_url}/generate", json=payload)
+        response = self.http.post(f"{self.base_url}/generate", json=self._payload(prompt, system_message))
         response.raise_for_status()
-        response_json = response.json()
-        print("RESPONSE::\n")
-        print(response_json)
-        return response_json['response']
+        return self._extract_response(response.json())
 
     def stream_response(self, prompt, system_message):
-        data = {
-            "prompt": prompt,
-            "system_message": system_message,
-        }
+        data = self._payload(prompt, system_message)
         headers = {"Content-Type": "application/json"}
-        response = requests.post(f"{self.base_url}/stream", headers=headers, json=data, stream=True)
+        with self.http.post(f"{self.base_url}/stream", headers=headers, json=data, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    content_part = self._parse_stream_line(line.decode('utf-8'))
+                    if content_part == self.END_STREAM:
+                        break
+                    if content_part is not None:
+                        yield content_part
+
+    async def agenerate_response(self, prompt, system_message):
+        print("PROMPT::\n")
+        print(prompt)
+        response = await self.http.async_client().post(f"{self.base_url}/generate",
+                                                       json=self._payload(prompt, system_message))
         response.raise_for_status()
-        for line in response.iter_lines():
-            if line:
-                decoded_line = line.decode('utf-8')
-                if 'data: ' in decoded_line:
-                    data = decoded_line[len('data: '):]
-                    if data.strip() == "[DONE]":
+        return self._extract_response(response.json())
+
+    async def astream_response(self, prompt, system_message):
+        data = self._payload(prompt, system_message)
+        headers = {"Content-Type": "application/json"}
+        async with self.http.async_client().stream("POST", f"{self.base_url}/stream", headers=headers,
+                                                   json=data) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    content_part = self._parse_stream_line(line)
+                    if content_part == self.END_STREAM:
                         break
-                    if data:
-                        message = json.loads(data)['choices'][0]['delta']
-                        if 'content' in message:
-                            content_part = message['content']
-                            yield content_part
+                    if content_part is not None:
+                        yield content_part
+
+    @staticmethod
+    def _payload(prompt, system_message):
+        return {
+            'prompt': prompt,
+            'system_message': system_message
+        }
+
+    @staticmethod
+    def _extract_response(response_json):
+        print("RESPONSE::\n")
+        print(response_json)
+        return response_json['response']
+
+    def _parse_stream_line(self, decoded_line):
+        """Content of one SSE line, END_STREAM on [DONE], or None for lines without content."""
+        if 'data: ' in decoded_line:
+            data = decoded_line[len('data: '):]
+            if data.strip() == "[DONE]":
+                return self.END_STREAM
+            if data:
+                message = json.loads(data)['choices'][0]['delta']
+                if 'content' in message:
+                    return message['content']
+        return None
@@ -5,6 +5,7 @@ from datetime import datetime
 from flask import Flask, request, Response, jsonify
 import requests
 
+from translator.llms.CachingLLM import CachingLLM
 from translator.llms.EncryptedKeyStore import EncryptedKeyStore
 from translator.llms.LLMFactory import LLMFactory, ModelType
 
@@ -183,7 +184,8 @@ def rate_language_attempt(message: str, target_language: str) -> int:
 
     model = get_model(target_language)
 
-    rating_response = LLMFactory.get_singleton(model).generate_response(
+    # The same sentence is often rated more than once (retries, repeated phrases), so ratings are cached
+    rating_response = CachingLLM(LLMFactory.get_singleton(model), cache_if=is_rating).generate_response(
         prompt=prompt,
         system_message=system_message
     )
@@ -196,6 +198,9 @@ def rate_language_attempt(message: str, target_language: str) -> int:
 
     return max(1, min(rating, 10))
 
+def is_rating(response: str) -> bool:
+    return response.strip().isdigit()
+
 def get_model(target_language: str):
     normalized_language = target_language.strip().lower()  # Normalize the input
     normalized_llama_languages = {lang.strip().lower() for lang in LLAMA_LANGUAGES}
@@ -1,25 +1,42 @@
 import queue
 import pyaudio
 import wave
+import numpy as np
 from gtts import gTTS
 from pydub import AudioSegment
 
+from agent_server.tts.AudioCache import get_audio_cache
 from agent_server.tts.SpeechInterfaces import TTSInterface
 
+SAMPLE_RATE = 24000
+
 
 class GTTSHandler(TTSInterface):
-    def __init__(self, lang='en'):
+    def __init__(self, lang='en', audio_cache=None):
         self.lang = lang
+        self.audio_cache = audio_cache if audio_cache is not None else get_audio_cache()
 
     def text_to_speech(self, text: str):
-        tts = gTTS(text=text, lang=self.lang)
         filename_mp3 = "output.mp3"
         filename_wav = "output.wav"
+
+        # Repeated phrases skip both the network round trip and the MP3 decode
+        cached = self.audio_cache.get(text, self.lang, 'gtts', SAMPLE_RATE)
+        if cached is not None:
+            with wave.open(filename_wav, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(SAMPLE_RATE)
+                wf.writeframes(cached.tobytes())
+            return filename_wav
+
+        tts = gTTS(text=text, lang=self.lang)
         tts.save(filename_mp3)
 
         # Convert MP3 to WAV
-        audio = AudioSegment.from_mp3(filename_mp3)
+        audio = AudioSegment.from_mp3(filename_mp3).set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2)
         audio.export(filename_wav, format="wav")
+        self.audio_cache.put(text, self.lang, 'gtts', SAMPLE_RATE, np.array(audio.get_array_of_samples()))
 
         return filename_wav
 